@@ -3,6 +3,7 @@ Script to populate initial manufacturers
 Run with: python manage.py shell < add_manufacturers.py
 """
 from apps.cars.models import Manufacturer
+from services.catalog_cache_service import CatalogCacheService
 
 manufacturers_data = [
     {"name": "Maruti Suzuki", "country": "India"},
@@ -21,11 +22,22 @@ manufacturers_data = [
     {"name": "Jeep", "country": "USA"},
 ]
 
+# One query for the existing names, one insert for the missing ones
+existing = set(
+    Manufacturer.objects.filter(
+        name__in=[data["name"] for data in manufacturers_data]
+    ).values_list("name", flat=True)
+)
+missing = [Manufacturer(**data) for data in manufacturers_data if data["name"] not in existing]
+Manufacturer.objects.bulk_create(missing, ignore_conflicts=True)
+if missing:
+    # bulk_create sends no signals, so invalidate the cached manufacturer list here
+    CatalogCacheService.bump_version()
+
 for data in manufacturers_data:
-    manufacturer, created = Manufacturer.objects.get_or_create(**data)
-    if created:
-        print(f"✓ Created: {manufacturer.name}")
+    if data["name"] in existing:
+        print(f"- Already exists: {data['name']}")
     else:
-        print(f"- Already exists: {manufacturer.name}")
+        print(f"✓ Created: {data['name']}")
 
 print(f"\n✅ Total manufacturers: {Manufacturer.objects.count()}")
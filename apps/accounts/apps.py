@@ -8,3 +8,6 @@ class AccountsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.accounts'
     verbose_name = 'Accounts & Authentication'
+    
+    def ready(self):
+        from apps.accounts import checks, signals  # noqa: F401
@@ -0,0 +1,30 @@
+"""
+Accounts System Checks
+"""
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+# Backends whose entries only the writing process can see
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+@register(Tags.security, Tags.caches)
+def check_auth_cache(app_configs, **kwargs):
+    """
+    JWT logouts live only in the AUTH_CACHE_ALIAS deny-list; in a process-local
+    cache every other worker or instance accepts the token for its whole lifetime
+    """
+    if settings.DEBUG or settings.AUTH_TOKEN_MODE != 'jwt':
+        return []
+    
+    backend = settings.CACHES.get(settings.AUTH_CACHE_ALIAS, {}).get('BACKEND')
+    if backend in PROCESS_LOCAL_CACHES:
+        return [Error(
+            f'AUTH_TOKEN_MODE=jwt needs a shared cache for AUTH_CACHE_ALIAS ({settings.AUTH_CACHE_ALIAS!r} uses {backend})',
+            hint='Set CACHE_BACKEND (or point AUTH_CACHE_ALIAS) to Redis or Memcached, so logouts reach every worker.',
+            id='accounts.E001',
+        )]
+    return []
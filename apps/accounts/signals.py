@@ -0,0 +1,40 @@
+"""
+Account Signals
+Drop cached credentials when tokens, users or admin profiles change
+"""
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+from apps.accounts.models import AdminProfile
+from core.authentication import revoke_token, revoke_user
+
+# User fields that change what a credential grants
+CREDENTIAL_FIELDS = {'password', 'is_active', 'is_superuser', 'username', 'email'}
+
+
+@receiver(post_delete, sender=Token)
+def token_deleted(sender, instance, **kwargs):
+    """Stop accepting a deleted token from the cache"""
+    transaction.on_commit(lambda: revoke_token(instance.key))
+
+
+@receiver(post_save, sender=User)
+def user_changed(sender, instance, raw=False, created=False, update_fields=None, **kwargs):
+    """Re-check credentials after a user's password, status or identity changed"""
+    if raw or created:
+        return
+    # Saves of unrelated fields (e.g. last_login) keep existing credentials valid
+    if update_fields is not None and not CREDENTIAL_FIELDS.intersection(update_fields):
+        return
+    transaction.on_commit(lambda: revoke_user(instance.pk))
+
+
+@receiver(post_save, sender=AdminProfile)
+@receiver(post_delete, sender=AdminProfile)
+def admin_profile_changed(sender, instance, raw=False, **kwargs):
+    """Re-check credentials after an admin profile was granted, changed or removed"""
+    if raw:
+        return
+    transaction.on_commit(lambda: revoke_user(instance.user_id))
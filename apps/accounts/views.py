@@ -2,9 +2,11 @@
 Account Views
 """
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
+from core.permissions import IsAdmin
 from core.responses import success_response, error_response, created_response
+from core.throttling import AuthIPThrottle, AuthAccountThrottle, get_throttle_stats
 from common.constants import Messages
 from services.auth_service import AuthService
 from .serializers import AdminRegistrationSerializer, AdminLoginSerializer, AdminProfileSerializer
@@ -12,6 +14,7 @@ from .serializers import AdminRegistrationSerializer, AdminLoginSerializer, Admi
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([AuthIPThrottle, AuthAccountThrottle])
 def register(request):
     """Register a new admin user"""
     try:
@@ -44,6 +47,7 @@ def register(request):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([AuthIPThrottle, AuthAccountThrottle])
 def login(request):
     """Login admin user"""
     serializer = AdminLoginSerializer(data=request.data)
@@ -77,7 +81,7 @@ def login(request):
 def logout(request):
     """Logout admin user"""
     try:
-        AuthService.logout_admin(request.user)
+        AuthService.logout_admin(request.user, request.auth)
         return success_response(message=Messages.LOGOUT_SUCCESS)
     except Exception as e:
         return error_response(message=str(e))
@@ -96,3 +100,10 @@ def profile(request):
             message=Messages.NOT_FOUND,
             status_code=status.HTTP_404_NOT_FOUND
         )
+
+
+@api_view(['GET'])
+@permission_classes([IsAdmin])
+def throttle_stats(request):
+    """Get rejected login/register attempts per throttle (admin only)"""
+    return success_response(data=get_throttle_stats())
@@ -8,3 +8,6 @@ class CarsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.cars'
     verbose_name = 'Car Management'
+    
+    def ready(self):
+        from apps.cars import signals  # noqa: F401
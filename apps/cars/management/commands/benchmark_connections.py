@@ -0,0 +1,107 @@
+"""
+Database connection benchmark
+Run with: python manage.py benchmark_connections [--requests 200] [--database default]
+
+Replays the database side of a request (the connection checks Django runs when
+a request starts and finishes around one query) against the configured
+database with connections opened per request, kept persistent and taken from
+the psycopg pool, and reports the per-request latency and how many server
+connections each mode opened. Only SELECT 1 is run, so it is safe against a
+shared database; against a managed server the per-request mode also pays the
+network, TLS and authentication round trips.
+"""
+import copy
+import statistics
+import time
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.utils import ConnectionDoesNotExist, OperationalError, load_backend
+
+# Pools are cached per alias, so the benchmark's own never replaces the app's
+BENCHMARK_ALIAS = 'connection-benchmark'
+
+PERSISTENT_MAX_AGE = 600
+
+
+class Command(BaseCommand):
+    help = 'Compare per-request, persistent and pooled database connections'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help='Simulated requests per mode')
+        parser.add_argument('--database', default='default', help='Database alias to benchmark')
+
+    def handle(self, *args, **options):
+        try:
+            base = connections[options['database']].settings_dict
+        except ConnectionDoesNotExist as exc:
+            raise CommandError(exc)
+
+        self.stdout.write(f'{"mode":<12} {"p50 ms":>9} {"p95 ms":>9} {"connections":>12}')
+        results = {}
+        for name, settings_dict in self.build_modes(base):
+            try:
+                results[name] = self.measure(settings_dict, max(options['requests'], 2))
+            except ImproperlyConfigured as exc:
+                self.stdout.write(self.style.WARNING(f'{name:<12} skipped: {exc}'))
+                continue
+            except OperationalError as exc:
+                raise CommandError(f'Could not connect to the database: {exc}')
+            result = results[name]
+            self.stdout.write(f'{name:<12} {result["p50_ms"]:>9.3f} {result["p95_ms"]:>9.3f} '
+                              f'{result["connections"]:>12}')
+
+        if 'per request' in results:
+            baseline = results['per request']['p50_ms']
+            for name, result in results.items():
+                if name != 'per request':
+                    self.stdout.write(f'{name}: {baseline - result["p50_ms"]:.3f}ms saved per request (p50)')
+
+    def build_modes(self, base):
+        """Yield (name, settings dict) for every connection mode the backend supports"""
+        options = {key: value for key, value in base['OPTIONS'].items() if key != 'pool'}
+
+        def mode(**overrides):
+            settings_dict = copy.deepcopy(base)
+            settings_dict.update(OPTIONS=copy.deepcopy(options), **overrides)
+            return settings_dict
+
+        yield 'per request', mode(CONN_MAX_AGE=0, CONN_HEALTH_CHECKS=False)
+        yield 'persistent', mode(CONN_MAX_AGE=PERSISTENT_MAX_AGE, CONN_HEALTH_CHECKS=True)
+        if base['ENGINE'] == 'django.db.backends.postgresql':
+            pooled = mode(CONN_MAX_AGE=0, CONN_HEALTH_CHECKS=True)
+            pooled['OPTIONS']['pool'] = copy.deepcopy(base['OPTIONS'].get('pool')) or True
+            yield 'pool', pooled
+
+    def measure(self, settings_dict, requests):
+        """
+        Time `requests` simulated requests on a private connection
+        The first request is a warm-up; server connections are counted by their
+        DB-API connection objects, which the pool hands out again
+        """
+        wrapper = load_backend(settings_dict['ENGINE']).DatabaseWrapper(settings_dict, BENCHMARK_ALIAS)
+        opened = set()
+
+        def request():
+            started = time.perf_counter()
+            # What close_old_connections() does on request_started and request_finished
+            wrapper.close_if_unusable_or_obsolete()
+            with wrapper.cursor() as cursor:
+                cursor.execute('SELECT 1')
+                cursor.fetchone()
+            opened.add(wrapper.connection)
+            wrapper.close_if_unusable_or_obsolete()
+            return time.perf_counter() - started
+
+        try:
+            request()
+            timings = sorted(request() * 1000 for _ in range(requests))
+        finally:
+            wrapper.close()
+            if getattr(wrapper, 'pool', None):
+                wrapper.close_pool()
+        return {
+            'p50_ms': round(statistics.median(timings), 3),
+            'p95_ms': round(statistics.quantiles(timings, n=20, method='inclusive')[-1], 3),
+            'connections': len(opened),
+        }
@@ -0,0 +1,297 @@
+"""
+Endpoint latency and query-count benchmark suite
+Run with: python manage.py benchmark_endpoints [--cars 1000] [--leads 10000]
+                                              [--save baseline.json | --baseline baseline.json]
+
+Seeds a throwaway test database, requests every public and admin read route and
+the main write routes through the full middleware stack and reports p50/p95
+latency, SQL query count and peak allocated memory per route. Write routes run
+last and create fresh rows on every request. With --baseline the run fails when a route
+issues more queries than the baseline or its p95 latency or memory grows past
+--threshold times the baseline.
+"""
+import gc
+import itertools
+import json
+import random
+import statistics
+import time
+import tracemalloc
+from datetime import date, timedelta
+from pathlib import Path
+from django.core.files.base import ContentFile
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.utils import timezone
+from apps.cars.management import seeding
+from apps.cars.models import Car, CarImage, DealershipSettings, RecentlySold
+from services.auth_service import AuthService
+from services.catalog_cache_service import CatalogCacheService
+
+API = '/api/v1'
+
+# Latency growth below this many milliseconds is noise, whatever the ratio
+MIN_LATENCY_DELTA_MS = 2.0
+
+# Memory growth below this many KiB is noise, whatever the ratio
+MIN_MEMORY_DELTA_KB = 256
+
+BENCHMARK_MEDIA = 'cars/renditions/benchmark-card-000000000000.jpg'
+
+
+class Command(BaseCommand):
+    help = 'Benchmark latency, query count and memory of the API routes on a seeded test database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--cars', type=int, default=1000, help='Number of cars to seed')
+        parser.add_argument('--leads', type=int, default=10000, help='Number of bookings (and of enquiries) to seed')
+        parser.add_argument('--iterations', type=int, default=20, help='Timed requests per route')
+        parser.add_argument('--export-iterations', type=int, default=3, help='Timed requests per export route')
+        parser.add_argument('--routes', default='', help='Only run routes whose name contains this text')
+        parser.add_argument('--save', metavar='PATH', help='Write the results as a JSON baseline')
+        parser.add_argument('--baseline', metavar='PATH', help='Compare against a saved baseline and fail on regressions')
+        parser.add_argument('--threshold', type=float, default=1.5,
+                            help='Allowed p95 latency and memory growth factor over the baseline')
+
+    def handle(self, *args, **options):
+        baseline = self.load_baseline(options['baseline']) if options['baseline'] else None
+
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        storage = CarImage._meta.get_field('image').storage
+        media_name = None
+        try:
+            started = time.perf_counter()
+            token = self.seed(options['cars'], options['leads'])
+            media_name = storage.save(BENCHMARK_MEDIA, ContentFile(random.Random(0).randbytes(256 * 1024)))
+            self.stdout.write(f'Seeded {options["cars"]} cars and {options["leads"]} leads '
+                              f'in {time.perf_counter() - started:.1f}s')
+            clients = {'anonymous': Client(), 'admin': Client(HTTP_AUTHORIZATION=f'Token {token}')}
+            results = self.run_routes(clients, media_name, options)
+        finally:
+            if media_name:
+                storage.delete(media_name)
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        report = {
+            'meta': {
+                'cars': options['cars'],
+                'leads': options['leads'],
+                'iterations': options['iterations'],
+                'vendor': connection.vendor,
+                'created': timezone.now().isoformat(),
+            },
+            'routes': results,
+        }
+        if options['save']:
+            Path(options['save']).write_text(json.dumps(report, indent=2) + '\n')
+            self.stdout.write(f'Baseline written to {options["save"]}')
+
+        failures = [name for name, result in results.items() if not 200 <= result['status'] < 400]
+        if baseline is not None:
+            failures += self.compare(report, baseline, options['threshold'])
+        if failures:
+            raise CommandError(f'{len(failures)} route(s) failed or regressed: {", ".join(failures)}')
+        self.stdout.write(self.style.SUCCESS('All routes within budget'))
+
+    def load_baseline(self, path):
+        """Read a baseline written by --save"""
+        try:
+            return json.loads(Path(path).read_text())
+        except (OSError, ValueError) as exc:
+            raise CommandError(f'Could not read baseline {path}: {exc}')
+
+    def seed(self, total_cars, total_leads):
+        """Seed the catalog, leads and an admin with a fixed random seed; returns the admin's token"""
+        rng = random.Random(42)
+        cars = seeding.seed_cars(total_cars, rng)
+        seeding.seed_leads(cars, total_leads, rng)
+        RecentlySold.objects.bulk_create([
+            RecentlySold(
+                car_name=model_name, price='$10,000', sold_date=timezone.now().date(),
+                image='https://example.com/sold.jpg'
+            )
+            for _, model_name in rng.sample(cars, min(12, len(cars)))
+        ])
+        # The settings row exists in production; creating it lazily would bump its version mid-run
+        DealershipSettings.load()
+        seeding.analyze()
+
+        admin = AuthService.register_admin('benchmark@example.com', 'benchmark-password', 'Benchmark')
+        return admin['token']
+
+    def build_routes(self, clients, media_name):
+        """
+        Yield (name, path, options) for every benchmarked route
+        `anonymous` routes are requested without the admin token; `cold` ones bump the
+        catalog version first so they measure the uncached build. Write routes set
+        `method` and a `payload` function called with the request's sequence number,
+        so every request creates its own rows
+        """
+        car_id = Car.objects.filter(is_active=True).values_list('pk', flat=True).first()
+        manufacturer_id = Car.objects.values_list('manufacturer_id', flat=True).first()
+        public = {'anonymous': True, 'cold': True}
+
+        yield 'cars list', f'{API}/cars/', public
+        yield 'cars list (cached)', f'{API}/cars/', {'anonymous': True}
+        yield 'cars list page 2', f'{API}/cars/?page=2', public
+        yield 'cars list filtered', (
+            f'{API}/cars/?manufacturer={manufacturer_id}&body_type=SUV&fuel_type=Diesel'
+            f'&transmission=Automatic&min_price=10000&max_price=60000'
+        ), public
+        yield 'cars list search', f'{API}/cars/?q=model', public
+        first_page = clients['anonymous'].get(f'{API}/cars/?pagination=cursor').json()
+        if first_page.get('next'):
+            yield 'cars list cursor', first_page['next'].replace('http://testserver', ''), public
+        yield 'cars list (admin)', f'{API}/cars/', {}
+        yield 'car detail', f'{API}/cars/{car_id}/', public
+        yield 'car related', f'{API}/cars/{car_id}/related/', public
+        yield 'featured cars', f'{API}/cars/featured/', public
+        yield 'facets', f'{API}/cars/facets/', public
+        yield 'manufacturers', f'{API}/cars/manufacturers/', public
+        yield 'dealership settings', f'{API}/cars/settings/', {'anonymous': True}
+        yield 'recently sold', f'{API}/cars/recently-sold/', {'anonymous': True}
+        yield 'cache stats', f'{API}/cars/cache-stats/', {}
+        yield 'profile', f'{API}/accounts/profile/', {}
+        yield 'bookings list', f'{API}/orders/bookings/', {}
+        yield 'bookings list cursor', f'{API}/orders/bookings/?pagination=cursor', {}
+        yield 'enquiries list', f'{API}/orders/enquiries/', {}
+        yield 'bookings export csv', f'{API}/orders/bookings/export/?format=csv', {'export': True}
+        yield 'enquiries export ndjson', f'{API}/orders/enquiries/export/?format=ndjson', {'export': True}
+        yield 'media file', f'/media/{media_name}', {'anonymous': True}
+
+        # Writes last, so the rows they add do not change the read routes' results
+        yield 'login', f'{API}/accounts/login/', {'anonymous': True, 'method': 'post', 'payload': lambda n: {
+            'email': 'benchmark@example.com', 'password': 'benchmark-password',
+        }}
+        yield 'register', f'{API}/accounts/register/', {'anonymous': True, 'method': 'post', 'payload': lambda n: {
+            'email': f'benchmark-{n}@example.com', 'password': 'benchmark-password', 'display_name': 'Benchmark',
+        }}
+        lead = {'customer_name': 'Benchmark Customer', 'email': 'lead@example.com', 'phone': '5551234567'}
+        yield 'booking create', f'{API}/orders/bookings/', {'anonymous': True, 'method': 'post', 'payload': lambda n: {
+            **lead, 'car_id': car_id, 'car_name': 'Benchmark', 'package_type': 'basic',
+            'date': (date.today() + timedelta(days=7)).isoformat(), 'time': '10:00',
+        }}
+        yield 'enquiry create', f'{API}/orders/enquiries/', {'anonymous': True, 'method': 'post', 'payload': lambda n: {
+            **lead, 'car': car_id, 'message': f'Enquiry {n}',
+        }}
+        car = {
+            'manufacturer_id': manufacturer_id, 'body_type': Car.BODY_TYPE_CHOICES[0][0],
+            'model_name': 'Benchmark', 'model_year': 2020, 'registration_year': 2020,
+            'ownership': Car.OWNER_CHOICES[0][0], 'kilometers_driven': 30000,
+            'fuel_type': Car.FUEL_CHOICES[0][0], 'transmission': Car.TRANSMISSION_CHOICES[0][0],
+            'engine_cc': 1500, 'mileage': '18.00', 'color': 'White',
+            'condition': Car.CONDITION_CHOICES[0][0], 'feature_names': ['Sunroof', 'Bluetooth'],
+        }
+        # Before the creates, whose new cars would change the related cars it recomputes
+        yield 'car update', f'{API}/cars/{car_id}/', {'method': 'patch', 'payload': lambda n: {
+            'price': 20000 + n, 'feature_names': ['Sunroof', f'Feature {n}'],
+        }}
+        yield 'car create', f'{API}/cars/', {'method': 'post', 'payload': lambda n: {**car, 'price': 20000 + n}}
+
+    def run_routes(self, clients, media_name, options):
+        """Benchmark every selected route and print one line per route"""
+        self.stdout.write(f'{"route":<28} {"status":>6} {"p50 ms":>9} {"p95 ms":>9} {"queries":>8} {"peak KiB":>9}')
+        results = {}
+        # Every login and register request would otherwise be throttled after a few iterations
+        with override_settings(AUTH_THROTTLE_RATES={}):
+            for name, path, route_options in self.build_routes(clients, media_name):
+                if options['routes'] not in name:
+                    continue
+                iterations = options['export_iterations'] if route_options.get('export') else options['iterations']
+                client = clients['anonymous' if route_options.get('anonymous') else 'admin']
+                result = self.measure(client, path, route_options, max(iterations, 2))
+                results[name] = result
+
+                line = (f'{name:<28} {result["status"]:>6} {result["p50_ms"]:>9.2f} {result["p95_ms"]:>9.2f} '
+                        f'{result["queries"]:>8} {result["peak_kb"]:>9}')
+                self.stdout.write(line if 200 <= result['status'] < 400 else self.style.ERROR(line))
+        return results
+
+    def measure(self, client, path, route_options, iterations):
+        """
+        Time one route
+        A first request warms lazily filled data (related cars, rendered pages) and
+        counts queries and peak memory under tracemalloc; the timed requests run
+        without tracing since it slows allocation-heavy code down unevenly
+        """
+        queries = []
+        sequence = itertools.count()
+        method = route_options.get('method', 'get')
+
+        def counter(execute, sql, params, many, context):
+            # connection.queries is reset when each request starts, so count here instead
+            queries.append(sql)
+            return execute(sql, params, many, context)
+
+        def request():
+            if route_options.get('cold'):
+                CatalogCacheService.bump_version()
+            if method == 'get':
+                started = time.perf_counter()
+                response = client.get(path)
+            else:
+                payload = route_options['payload'](next(sequence))
+                started = time.perf_counter()
+                response = getattr(client, method)(path, payload, content_type='application/json')
+            # Streaming bodies are produced while they are consumed
+            if response.streaming:
+                for _ in response.streaming_content:
+                    pass
+            else:
+                response.content
+            elapsed = time.perf_counter() - started
+            response.close()
+            return response, elapsed
+
+        request()
+        tracemalloc.start()
+        try:
+            with connection.execute_wrapper(counter):
+                response, _ = request()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        # Leave the previous route's garbage out of this route's timings
+        gc.collect()
+        timings = sorted(request()[1] * 1000 for _ in range(iterations))
+        return {
+            'status': response.status_code,
+            'p50_ms': round(statistics.median(timings), 3),
+            'p95_ms': round(statistics.quantiles(timings, n=20, method='inclusive')[-1], 3),
+            'queries': len(queries),
+            'peak_kb': peak // 1024,
+        }
+
+    def compare(self, report, baseline, threshold):
+        """Print the changes against the baseline and return the names of regressed routes"""
+        for key in ('cars', 'leads', 'vendor'):
+            if baseline.get('meta', {}).get(key) != report['meta'][key]:
+                self.stdout.write(self.style.WARNING(
+                    f'Baseline {key} is {baseline.get("meta", {}).get(key)!r}, this run used {report["meta"][key]!r}'
+                ))
+
+        regressed = []
+        for name, result in report['routes'].items():
+            before = baseline.get('routes', {}).get(name)
+            if before is None:
+                self.stdout.write(f'new   {name}: not in the baseline')
+                continue
+
+            problems = []
+            if result['queries'] > before['queries']:
+                problems.append(f'queries {before["queries"]} -> {result["queries"]}')
+            if (result['p95_ms'] > before['p95_ms'] * threshold
+                    and result['p95_ms'] - before['p95_ms'] > MIN_LATENCY_DELTA_MS):
+                problems.append(f'p95 {before["p95_ms"]:.2f}ms -> {result["p95_ms"]:.2f}ms')
+            if (result['peak_kb'] > before['peak_kb'] * threshold
+                    and result['peak_kb'] - before['peak_kb'] > MIN_MEMORY_DELTA_KB):
+                problems.append(f'peak {before["peak_kb"]}KiB -> {result["peak_kb"]}KiB')
+
+            if problems:
+                regressed.append(name)
+                self.stdout.write(self.style.ERROR(f'FAIL  {name}: {", ".join(problems)}'))
+        return regressed
+
@@ -0,0 +1,104 @@
+"""
+Query count regression check for the paginated list routes
+Run with: python manage.py check_query_counts [--cars 200] [--page-size 50]
+
+Seeds a throwaway test database and requests every paginated list route with a
+one-item page and a full page, and fails when the full page issues more
+queries than the one-item page: each row must be served by the page's fixed
+set of queries rather than queries of its own.
+"""
+import random
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from apps.cars.management import seeding
+from apps.cars.models import DealershipSettings
+from services.auth_service import AuthService
+from services.catalog_cache_service import CatalogCacheService
+
+API = '/api/v1'
+
+
+class Command(BaseCommand):
+    help = 'Check that list routes issue the same number of queries for 1-item and full pages'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--cars', type=int, default=200, help='Number of cars (and of leads) to seed')
+        parser.add_argument('--page-size', type=int, default=50, help='Size of the full page')
+
+    def handle(self, *args, **options):
+        if options['page_size'] < 2:
+            raise CommandError('--page-size must be at least 2')
+
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            token = self.seed(max(options['cars'], options['page_size'] * 2))
+            clients = {'anonymous': Client(), 'admin': Client(HTTP_AUTHORIZATION=f'Token {token}')}
+            failures = self.check_routes(clients, options['page_size'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        if failures:
+            raise CommandError(f'{failures} route(s) issue more queries for larger pages')
+        self.stdout.write(self.style.SUCCESS('All list routes issue a constant number of queries'))
+
+    def seed(self, total):
+        """Seed cars, leads and an admin with a fixed random seed; returns the admin's token"""
+        rng = random.Random(42)
+        cars = seeding.seed_cars(total, rng)
+        seeding.seed_leads(cars, total, rng)
+        # The settings row exists in production; creating it lazily would add queries to one request
+        DealershipSettings.load()
+
+        admin = AuthService.register_admin('query-counts@example.com', 'query-counts-password', 'Query Counts')
+        return admin['token']
+
+    def build_routes(self):
+        """
+        Yield (name, path, client name) for every checked route
+        Paths take the page size as their last query parameter
+        """
+        yield 'cars list', f'{API}/cars/?page_size=', 'anonymous'
+        yield 'cars list cursor', f'{API}/cars/?pagination=cursor&page_size=', 'anonymous'
+        yield 'cars list search', f'{API}/cars/?q=model&page_size=', 'anonymous'
+        yield 'cars list (admin)', f'{API}/cars/?page_size=', 'admin'
+        yield 'bookings list', f'{API}/orders/bookings/?page_size=', 'admin'
+        yield 'bookings list cursor', f'{API}/orders/bookings/?pagination=cursor&page_size=', 'admin'
+        yield 'enquiries list', f'{API}/orders/enquiries/?page_size=', 'admin'
+        yield 'enquiries list cursor', f'{API}/orders/enquiries/?pagination=cursor&page_size=', 'admin'
+
+    def check_routes(self, clients, page_size):
+        """Count the queries of a 1-item and a full page of every route and report the differences"""
+        self.stdout.write(f'{"route":<28} {"1 item":>7} {f"{page_size} items":>10}')
+        failures = 0
+        for name, path, client_name in self.build_routes():
+            client = clients[client_name]
+            # Warms per-process state (auth cache, content types) so both counts start equal
+            self.count_queries(client, f'{path}1')
+            small, status = self.count_queries(client, f'{path}1')
+            large, status = self.count_queries(client, f'{path}{page_size}')
+
+            line = f'{name:<28} {small:>7} {large:>10}'
+            if status != 200 or large != small:
+                failures += 1
+                problem = f'status {status}' if status != 200 else 'query count grows with the page'
+                self.stdout.write(self.style.ERROR(f'{line}  FAIL: {problem}'))
+            else:
+                self.stdout.write(line)
+        return failures
+
+    def count_queries(self, client, path):
+        """Request a path with the catalog cache cold; returns (queries, status)"""
+        queries = []
+
+        def counter(execute, sql, params, many, context):
+            # connection.queries is reset when each request starts, so count here instead
+            queries.append(sql)
+            return execute(sql, params, many, context)
+
+        CatalogCacheService.bump_version()
+        with connection.execute_wrapper(counter):
+            response = client.get(path)
+            response.content
+        return len(queries), response.status_code
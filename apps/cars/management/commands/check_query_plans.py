@@ -0,0 +1,165 @@
+"""
+Query plan regression suite for the car list filters
+Run with: python manage.py check_query_plans [--cars 5000]
+
+Seeds a throwaway test database, runs EXPLAIN on every combination of the
+public car filters (plus the other hot catalog and admin list queries) and
+fails when a plan falls back to a sequential scan or a sort step.
+
+Pages with no filter or one equality filter must come out of an index in
+order. With several filters or a price range the planner narrows the rows
+through the most selective index and sorts what is left, so those pages may
+sort but not scan. Search pages sort the matched cars by relevance or recency,
+so they may sort. Facet counts read every listing, so they may scan and sort
+their few groups, but not group by sorting the listings.
+"""
+import itertools
+import random
+import re
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Q
+from apps.cars.management import seeding
+from apps.cars.models import Car, CarImage, CarListing
+from apps.orders.models import Booking, Enquiry
+from services.car_service import CarService
+from services.facet_service import FacetService
+from services.search_service import SearchService
+
+PAGE_SIZE = 20
+
+# Matches one seeded model name, like a typed search
+SEARCH_TEXT = 'model 123'
+
+# Plan fragments that mean a full table read, an explicit sort or a grouping by
+# sort, per vendor; FTS5 virtual table scans are index lookups
+PLAN_PROBLEMS = {
+    'sqlite': [
+        (re.compile(r'\bSCAN (?!CONSTANT ROW)\S+(?=\s|$)(?! VIRTUAL TABLE)(?!.*\bUSING\b)'), 'sequential scan'),
+        (re.compile(r'USE TEMP B-TREE'), 'sort step'),
+        (re.compile(r'USE TEMP B-TREE FOR (GROUP BY|DISTINCT)'), 'grouping sort'),
+    ],
+    'postgresql': [
+        (re.compile(r'\bSeq Scan\b'), 'sequential scan'),
+        (re.compile(r'\b(Incremental )?Sort\b'), 'sort step'),
+        (re.compile(r'GroupAggregate.*\n(\s+Group Key:.*\n)?\s+->\s+(Incremental )?Sort\b'), 'grouping sort'),
+    ],
+}
+
+# Problems tolerated per kind of query (see the module docstring)
+NARROWED_TOLERATED = {'sort step'}
+SEARCH_TOLERATED = {'sort step'}
+FACET_TOLERATED = {'sequential scan', 'sort step'}
+
+
+class Command(BaseCommand):
+    help = 'EXPLAIN the car filter combinations on a seeded test database and fail on seq scans or sorts'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--cars', type=int, default=5000,
+                            help='Number of cars to seed; PostgreSQL scans tables of a few hundred rows')
+        parser.add_argument('--verbose-plans', action='store_true', help='Print every plan, not just failures')
+
+    def handle(self, *args, **options):
+        vendor = connection.vendor
+        if vendor not in PLAN_PROBLEMS:
+            raise CommandError(f'Query plan checks are not supported on {vendor}')
+
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            self.seed(options['cars'])
+            failures = self.check_plans(vendor, options['verbose_plans'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        if failures:
+            raise CommandError(f'{failures} query plan(s) fell back to a sequential scan or sort')
+        self.stdout.write(self.style.SUCCESS('All query plans are index-backed'))
+
+    def seed(self, total_cars):
+        """Seed cars, images, listings and leads with a fixed random seed"""
+        rng = random.Random(42)
+        cars = seeding.seed_cars(total_cars, rng)
+        seeding.seed_leads(cars, total_cars, rng)
+        seeding.analyze()
+
+    def build_queries(self):
+        """Yield (name, queryset, tolerated problems) for every query whose plan is checked"""
+        manufacturer_id = Car.objects.values_list('manufacturer_id', flat=True).first()
+        filter_values = {
+            'manufacturer': {'manufacturer': str(manufacturer_id)},
+            'body_type': {'body_type': 'SUV'},
+            'fuel_type': {'fuel_type': 'Diesel'},
+            'transmission': {'transmission': 'Automatic'},
+            'condition': {'condition': 'Good'},
+            'ownership': {'ownership': '1st Owner'},
+            'price': {'min_price': '10000', 'max_price': '20000'},
+        }
+        cursor_row = CarListing.objects.filter(is_active=True).order_by('-created_at', '-car')[PAGE_SIZE]
+
+        for size in range(len(filter_values) + 1):
+            for combination in itertools.combinations(filter_values, size):
+                params = {}
+                for name in combination:
+                    params.update(filter_values[name])
+                label = '+'.join(combination) or 'no filters'
+                queryset = CarService.filter_cars(CarListing.objects.all(), params)
+                ordered = len(combination) <= 1 and 'price' not in combination
+                tolerated = set() if ordered else NARROWED_TOLERATED
+
+                # Page number mode (default ordering) and keyset mode (seek past a row)
+                yield f'cars list [{label}]', queryset[:PAGE_SIZE], tolerated
+                yield f'cars list cursor [{label}]', queryset.order_by('-created_at', '-pk').filter(
+                    Q(created_at__lt=cursor_row.created_at)
+                    | Q(created_at=cursor_row.created_at, pk__lt=cursor_row.pk)
+                )[:PAGE_SIZE], tolerated
+
+        # Search alone and next to each single filter
+        for label, params in [('no filters', {})] + list(filter_values.items()):
+            queryset = CarService.filter_cars(CarListing.objects.all(), {**params, 'q': SEARCH_TEXT})
+            yield f'cars search [{label}]', SearchService.rank(queryset, SEARCH_TEXT)[:PAGE_SIZE], SEARCH_TOLERATED
+            yield f'cars search cursor [{label}]', queryset.order_by('-created_at', '-pk')[:PAGE_SIZE], SEARCH_TOLERATED
+
+        # Facets over the whole catalog; with a filter the planner may instead narrow
+        # through the filter's index and group the few rows it finds by sorting
+        queryset = FacetService.filtered_listings({})
+        for name, (field, _) in FacetService.VALUE_FACETS.items():
+            yield f'facet {name}', FacetService.value_counts_query(queryset, field), FACET_TOLERATED
+        yield 'facet manufacturer', FacetService.manufacturer_counts_query(queryset), FACET_TOLERATED
+
+        yield 'cars list [admin]', CarService.filter_cars(CarListing.objects.all(), {}, is_admin=True)[:PAGE_SIZE], set()
+        yield 'featured cars', CarService.get_featured_cars(), set()
+
+        car = Car.objects.filter(is_active=True).first()
+        yield 'car detail images', CarImage.objects.filter(car=car).order_by('-is_primary', 'id'), set()
+
+        for name, model in (('bookings', Booking), ('enquiries', Enquiry)):
+            row = model.objects.order_by('-created_at', '-id')[PAGE_SIZE]
+            yield f'{name} list', model.objects.all()[:PAGE_SIZE], set()
+            yield f'{name} list cursor', model.objects.order_by('-created_at', '-id').filter(
+                Q(created_at__lt=row.created_at) | Q(created_at=row.created_at, id__lt=row.id)
+            )[:PAGE_SIZE], set()
+
+    def check_plans(self, vendor, verbose_plans):
+        """EXPLAIN every query and report the ones with problems"""
+        failures = 0
+        for name, queryset, tolerated in self.build_queries():
+            plan = queryset.explain()
+            problems = sorted(
+                problem
+                for pattern, problem in PLAN_PROBLEMS[vendor]
+                if problem not in tolerated and pattern.search(plan)
+            )
+
+            if problems:
+                failures += 1
+                self.stdout.write(self.style.ERROR(f'FAIL  {name}: {", ".join(problems)}'))
+            else:
+                self.stdout.write(f'ok    {name}')
+
+            if problems or verbose_plans:
+                for line in plan.splitlines():
+                    self.stdout.write(f'        {line}')
+
+        return failures
@@ -0,0 +1,23 @@
+"""
+Generate resized renditions for car images that do not have them yet
+Run with: python manage.py generate_image_renditions [--all]
+"""
+from django.core.management.base import BaseCommand
+from apps.cars.models import CarImage
+from services.image_service import ImageService
+
+
+class Command(BaseCommand):
+    help = 'Generate thumbnail, card and full-size renditions for car images'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Regenerate renditions for every image')
+    
+    def handle(self, *args, **options):
+        if options['all']:
+            image_ids = list(CarImage.objects.values_list('pk', flat=True))
+        else:
+            image_ids = ImageService.pending_images()
+        
+        ImageService.process_images(image_ids)
+        self.stdout.write(self.style.SUCCESS(f'Generated renditions for {len(image_ids)} images'))
@@ -0,0 +1,51 @@
+"""
+Bulk import cars with their features and images
+Run with: python manage.py import_cars inventory.csv [--images photos.zip] [--create-manufacturers]
+
+CSV files have one column per car field plus `manufacturer` (name), `features`
+and `images` (both separated by `|`). JSON Lines files hold one object per line
+with the same keys, where `features` and `images` are lists.
+"""
+import json
+import zipfile
+from django.core.management.base import BaseCommand, CommandError
+from services.import_service import ImportService
+
+
+class Command(BaseCommand):
+    help = 'Stream a CSV or JSON Lines inventory file into the car tables'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV or JSON Lines file')
+        parser.add_argument('--format', choices=ImportService.FORMATS, help='Defaults to the file extension')
+        parser.add_argument('--images', help='Zip archive holding the image files named in the rows')
+        parser.add_argument('--create-manufacturers', action='store_true', help='Create manufacturers that do not exist yet')
+        parser.add_argument('--chunk-size', type=int, default=ImportService.CHUNK_SIZE, help='Rows per transaction')
+        parser.add_argument('--dry-run', action='store_true', help='Validate every row without writing anything')
+    
+    def handle(self, *args, **options):
+        file_format = options['format'] or ImportService.detect_format(options['path'])
+        if file_format is None:
+            raise CommandError('Could not tell the file format from its extension; pass --format')
+        
+        try:
+            with open(options['path'], 'rb') as stream:
+                report = ImportService.import_cars(
+                    stream,
+                    file_format,
+                    images_zip=options['images'],
+                    create_manufacturers=options['create_manufacturers'],
+                    dry_run=options['dry_run'],
+                    chunk_size=options['chunk_size']
+                )
+        except (OSError, ValueError, zipfile.BadZipFile) as e:
+            raise CommandError(str(e))
+        
+        for error in report['errors']:
+            self.stderr.write(f"line {error['line']}: {json.dumps(error['errors'])}")
+        
+        verb = 'Validated' if report['dry_run'] else 'Imported'
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {report['imported']} of {report['rows']} rows "
+            f"({report['features']} features, {report['images']} images, {report['failed']} failed)"
+        ))
@@ -0,0 +1,14 @@
+"""
+Rebuild the car listing read model from scratch
+Run with: python manage.py rebuild_car_listings
+"""
+from django.core.management.base import BaseCommand
+from services.listing_service import ListingService
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the flattened car listing table from cars, manufacturers and images'
+    
+    def handle(self, *args, **options):
+        total = ListingService.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {total} car listings'))
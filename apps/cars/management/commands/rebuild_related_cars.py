@@ -0,0 +1,14 @@
+"""
+Rebuild the related-cars table from scratch
+Run with: python manage.py rebuild_related_cars
+"""
+from django.core.management.base import BaseCommand
+from services.related_car_service import RelatedCarService
+
+
+class Command(BaseCommand):
+    help = 'Recompute the precomputed related cars of every active car'
+    
+    def handle(self, *args, **options):
+        total = RelatedCarService.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt related cars for {total} active cars'))
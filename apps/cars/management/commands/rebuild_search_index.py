@@ -0,0 +1,16 @@
+"""
+Rebuild the car full-text search index from scratch
+Run with: python manage.py rebuild_search_index
+"""
+from django.core.management.base import BaseCommand, CommandError
+from services.search_service import SearchService
+
+
+class Command(BaseCommand):
+    help = 'Re-index every car in the full-text search table'
+    
+    def handle(self, *args, **options):
+        if not SearchService.is_supported():
+            raise CommandError('Full-text search needs PostgreSQL or SQLite')
+        total = SearchService.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Re-indexed {total} cars for search'))
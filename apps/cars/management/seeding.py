@@ -0,0 +1,100 @@
+"""
+Seed Data
+Deterministic bulk seeding of cars, images, listings and leads for the query
+plan and benchmark commands; rows are generated in chunks so large datasets
+never sit in memory at once
+"""
+from datetime import date, time, timedelta
+from django.db import connection
+from django.utils import timezone
+from apps.cars.models import Manufacturer, Car, CarImage
+from apps.orders.models import Booking, Enquiry
+from services.listing_service import ListingService
+from services.search_service import SearchService
+
+CHUNK_SIZE = 5000
+
+# Distinct model names; like a real catalog, each is shared by many cars, so the
+# search planner sees realistic word frequencies
+MODEL_NAMES = 500
+
+
+def seed_cars(total_cars, rng, images_per_car=3):
+    """Seed active and inactive cars with images, listings and search rows; returns [(pk, model_name)]"""
+    manufacturers = list(Manufacturer.objects.all())
+    if not manufacturers:
+        manufacturers = Manufacturer.objects.bulk_create(
+            [Manufacturer(name=f'Manufacturer {index}') for index in range(12)]
+        )
+
+    now = timezone.now()
+    seeded = []
+    for offset in range(0, total_cars, CHUNK_SIZE):
+        cars = Car.objects.bulk_create([
+            Car(
+                manufacturer=rng.choice(manufacturers),
+                body_type=rng.choice(Car.BODY_TYPE_CHOICES)[0],
+                model_name=f'Model {index % MODEL_NAMES}',
+                model_year=rng.randint(2012, 2025),
+                registration_year=rng.randint(2012, 2025),
+                ownership=rng.choice(Car.OWNER_CHOICES)[0],
+                kilometers_driven=rng.randint(1000, 200000),
+                fuel_type=rng.choice(Car.FUEL_CHOICES)[0],
+                transmission=rng.choice(Car.TRANSMISSION_CHOICES)[0],
+                engine_cc=rng.randint(800, 3000),
+                mileage=rng.randint(8, 30),
+                color='White',
+                price=rng.randint(3000, 90000),
+                condition=rng.choice(Car.CONDITION_CHOICES)[0],
+                is_active=rng.random() > 0.05,
+            )
+            for index in range(offset, min(offset + CHUNK_SIZE, total_cars))
+        ])
+        # Spread creation times so ordering by created_at is meaningful
+        for index, car in enumerate(cars, start=offset):
+            car.created_at = now - timedelta(minutes=index)
+        Car.objects.bulk_update(cars, ['created_at'], batch_size=1000)
+
+        CarImage.objects.bulk_create(
+            [
+                CarImage(car=car, image=f'cars/seed-{car.pk}-{position}.jpg', is_primary=(position == 0))
+                for car in cars
+                for position in range(images_per_car)
+            ],
+            batch_size=1000
+        )
+        seeded.extend((car.pk, car.model_name) for car in cars)
+
+    ListingService.rebuild()
+    SearchService.rebuild()
+    return seeded
+
+
+def seed_leads(cars, total_leads, rng):
+    """Seed `total_leads` bookings and as many enquiries for random seeded cars"""
+    for offset in range(0, total_leads, CHUNK_SIZE):
+        leads = [rng.choice(cars) for _ in range(min(CHUNK_SIZE, total_leads - offset))]
+        Booking.objects.bulk_create([
+            Booking(
+                car_id=car_id, car_name=model_name, package_type='basic',
+                customer_name='Seed Customer', email='seed@example.com', phone='5551234567',
+                date=date.today(), time=time(10, 0)
+            )
+            for car_id, model_name in leads
+        ])
+        Enquiry.objects.bulk_create([
+            Enquiry(car_id=car_id, customer_name='Seed Customer', email='seed@example.com', phone='5551234567')
+            for car_id, _ in leads
+        ])
+
+
+def analyze():
+    """
+    Refresh planner statistics after seeding
+    Postgres also vacuums, as autovacuum would on a live database: until then the
+    bulk-inserted search rows sit in the GIN pending list and the planner scans
+    the table instead. VACUUM cannot run in a transaction, so tests only analyze
+    """
+    vacuum = connection.vendor == 'postgresql' and not connection.in_atomic_block
+    with connection.cursor() as cursor:
+        cursor.execute('VACUUM ANALYZE' if vacuum else 'ANALYZE')
@@ -0,0 +1,73 @@
+# Generated by Django 5.2.10 on 2026-10-18 10:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def populate_listings(apps, schema_editor):
+    Car = apps.get_model('cars', 'Car')
+    CarImage = apps.get_model('cars', 'CarImage')
+    CarListing = apps.get_model('cars', 'CarListing')
+    primary_image = CarImage.objects.filter(
+        car=models.OuterRef('pk')
+    ).order_by('-is_primary', 'id').values('image')[:1]
+    cars = Car.objects.select_related('manufacturer').annotate(
+        primary_image_name=models.Subquery(primary_image)
+    )
+    CarListing.objects.bulk_create(
+        (
+            CarListing(
+                car_id=car.pk,
+                manufacturer_id=car.manufacturer_id,
+                manufacturer_name=car.manufacturer.name,
+                model_name=car.model_name,
+                model_year=car.model_year,
+                price=car.price,
+                body_type=car.body_type,
+                fuel_type=car.fuel_type,
+                transmission=car.transmission,
+                kilometers_driven=car.kilometers_driven,
+                primary_image=car.primary_image_name or '',
+                is_active=car.is_active,
+                created_at=car.created_at,
+            )
+            for car in cars.iterator()
+        ),
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cars', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CarListing',
+            fields=[
+                ('car', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='listing', serialize=False, to='cars.car')),
+                ('manufacturer_name', models.CharField(max_length=100)),
+                ('model_name', models.CharField(max_length=50)),
+                ('model_year', models.PositiveIntegerField()),
+                ('price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('body_type', models.CharField(max_length=20)),
+                ('fuel_type', models.CharField(max_length=20)),
+                ('transmission', models.CharField(max_length=20)),
+                ('kilometers_driven', models.PositiveIntegerField()),
+                ('primary_image', models.CharField(blank=True, max_length=255)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField()),
+                ('manufacturer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='listings', to='cars.manufacturer')),
+            ],
+            options={
+                'verbose_name': 'Car Listing',
+                'verbose_name_plural': 'Car Listings',
+                'db_table': 'car_listings',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['is_active', '-created_at'], name='car_listings_active_created')],
+            },
+        ),
+        migrations.RunPython(populate_listings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.10 on 2026-10-18 10:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cars', '0002_car_listing'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RelatedCar',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('car', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_entries', to='cars.car')),
+                ('related', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_to_entries', to='cars.car')),
+            ],
+            options={
+                'verbose_name': 'Related Car',
+                'verbose_name_plural': 'Related Cars',
+                'db_table': 'related_cars',
+                'ordering': ['car', 'rank'],
+                'constraints': [models.UniqueConstraint(fields=('car', 'rank'), name='related_cars_car_rank')],
+            },
+        ),
+    ]
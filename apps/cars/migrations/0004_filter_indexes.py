@@ -0,0 +1,49 @@
+# Generated by Django 5.2.10 on 2026-10-18 10:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cars', '0003_related_car'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='carlisting',
+            name='car_listings_active_created',
+        ),
+        migrations.AddIndex(
+            model_name='car',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-created_at', '-id'], name='cars_active_recent'),
+        ),
+        migrations.AddIndex(
+            model_name='carimage',
+            index=models.Index(fields=['car', '-is_primary', 'id'], name='car_images_car_primary'),
+        ),
+        migrations.AddIndex(
+            model_name='carlisting',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-created_at', '-car'], name='car_listings_active_recent'),
+        ),
+        migrations.AddIndex(
+            model_name='carlisting',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['manufacturer', '-created_at', '-car'], name='car_listings_active_mfr'),
+        ),
+        migrations.AddIndex(
+            model_name='carlisting',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['body_type', '-created_at', '-car'], name='car_listings_active_body'),
+        ),
+        migrations.AddIndex(
+            model_name='carlisting',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['fuel_type', '-created_at', '-car'], name='car_listings_active_fuel'),
+        ),
+        migrations.AddIndex(
+            model_name='carlisting',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['transmission', '-created_at', '-car'], name='car_listings_active_trans'),
+        ),
+        migrations.AddIndex(
+            model_name='carlisting',
+            index=models.Index(fields=['-created_at', '-car'], name='car_listings_recent'),
+        ),
+    ]
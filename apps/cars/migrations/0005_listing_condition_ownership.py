@@ -0,0 +1,36 @@
+# Generated by Django 5.2.10 on 2026-10-18 10:33
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def copy_condition_ownership(apps, schema_editor):
+    """Fill the new listing columns from their cars"""
+    Car = apps.get_model('cars', 'Car')
+    CarListing = apps.get_model('cars', 'CarListing')
+    cars = Car.objects.filter(pk=OuterRef('car_id'))
+    CarListing.objects.update(
+        condition=Subquery(cars.values('condition')[:1]),
+        ownership=Subquery(cars.values('ownership')[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cars', '0004_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='carlisting',
+            name='condition',
+            field=models.CharField(blank=True, max_length=20),
+        ),
+        migrations.AddField(
+            model_name='carlisting',
+            name='ownership',
+            field=models.CharField(blank=True, max_length=20),
+        ),
+        migrations.RunPython(copy_condition_ownership, migrations.RunPython.noop),
+    ]
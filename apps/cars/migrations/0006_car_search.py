@@ -0,0 +1,61 @@
+from django.db import migrations
+
+# The search table is vendor specific, so it is managed here rather than by a model
+CREATE_SQL = {
+    'sqlite': [
+        """
+        CREATE VIRTUAL TABLE car_search USING fts5(
+            model_name, manufacturer, variant, features, description,
+            tokenize = 'unicode61 remove_diacritics 2'
+        )
+        """,
+        """
+        INSERT INTO car_search (rowid, model_name, manufacturer, variant, features, description)
+        SELECT c.id, c.model_name, m.name, c.variant,
+               COALESCE((SELECT group_concat(f.name, ' ') FROM car_features f WHERE f.car_id = c.id), ''),
+               c.description
+        FROM cars c JOIN manufacturers m ON m.id = c.manufacturer_id
+        """,
+    ],
+    'postgresql': [
+        """
+        CREATE TABLE car_search (
+            car_id bigint PRIMARY KEY,
+            document tsvector NOT NULL
+        )
+        """,
+        'CREATE INDEX car_search_document_gin ON car_search USING GIN (document)',
+        """
+        INSERT INTO car_search (car_id, document)
+        SELECT c.id,
+               setweight(to_tsvector('english', c.model_name || ' ' || m.name), 'A')
+               || setweight(to_tsvector('english', c.variant), 'B')
+               || setweight(to_tsvector('english', COALESCE(
+                      (SELECT string_agg(f.name, ' ') FROM car_features f WHERE f.car_id = c.id), '')), 'C')
+               || setweight(to_tsvector('english', c.description), 'D')
+        FROM cars c JOIN manufacturers m ON m.id = c.manufacturer_id
+        """,
+    ],
+}
+
+
+def create_search_table(apps, schema_editor):
+    """Create and fill the search table on vendors that support it"""
+    for statement in CREATE_SQL.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+
+def drop_search_table(apps, schema_editor):
+    if schema_editor.connection.vendor in CREATE_SQL:
+        schema_editor.execute('DROP TABLE car_search')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cars', '0005_listing_condition_ownership'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_table, drop_search_table),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.10 on 2026-10-18 10:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cars', '0006_car_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='car',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='recentlysold',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.10 on 2026-10-18 10:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cars', '0007_row_versions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='carimage',
+            name='height',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='carimage',
+            name='renditions',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='carimage',
+            name='size_bytes',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='carimage',
+            name='width',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='carlisting',
+            name='primary_image_webp',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+    ]
@@ -0,0 +1,85 @@
+# Generated by Django 5.2.10 on 2026-10-18 11:45
+
+import heapq
+
+from django.db import migrations
+
+# A frozen copy of RelatedCarService's scoring as of this migration, so later
+# changes to the service do not change (or break) what this backfill does;
+# `manage.py rebuild_related_cars` recomputes the table with the current rules
+STORED_LIMIT = 12
+MANUFACTURER_WEIGHT = 4.0
+BODY_TYPE_WEIGHT = 3.0
+PRICE_WEIGHT = 2.0
+FUEL_WEIGHT = 1.0
+YEAR_WEIGHT = 1.0
+PRICE_BAND = 0.2
+YEAR_WINDOW = 3
+
+
+def score(car, candidate):
+    total = 0.0
+    if candidate['manufacturer_id'] == car['manufacturer_id']:
+        total += MANUFACTURER_WEIGHT
+    if candidate['body_type'] == car['body_type']:
+        total += BODY_TYPE_WEIGHT
+    if candidate['fuel_type'] == car['fuel_type']:
+        total += FUEL_WEIGHT
+
+    if car['price'] > 0:
+        price_gap = abs(candidate['price'] - car['price']) / car['price']
+        if price_gap <= PRICE_BAND:
+            total += PRICE_WEIGHT * (1 - price_gap / PRICE_BAND)
+
+    year_gap = abs(candidate['model_year'] - car['model_year'])
+    if year_gap < YEAR_WINDOW:
+        total += YEAR_WEIGHT * (1 - year_gap / YEAR_WINDOW)
+
+    return total
+
+
+def backfill_related_cars(apps, schema_editor):
+    """
+    Score the active cars that have no related entries yet
+    Detail reads used to fill them on first view; they no longer write
+    """
+    Car = apps.get_model('cars', 'Car')
+    RelatedCar = apps.get_model('cars', 'RelatedCar')
+    profiles = [
+        {**row, 'price': float(row['price'])}
+        for row in Car.objects.filter(is_active=True).values(
+            'pk', 'manufacturer_id', 'body_type', 'price', 'fuel_type', 'model_year', 'created_at'
+        )
+    ]
+    scored = set(RelatedCar.objects.values_list('car_id', flat=True).distinct())
+
+    entries = []
+    for car in profiles:
+        if car['pk'] in scored:
+            continue
+        candidates = (
+            (score(car, candidate), candidate)
+            for candidate in profiles
+            if candidate['pk'] != car['pk']
+        )
+        best = heapq.nlargest(
+            STORED_LIMIT,
+            (item for item in candidates if item[0] > 0),
+            key=lambda item: (item[0], item[1]['created_at'], item[1]['pk'])
+        )
+        entries.extend(
+            RelatedCar(car_id=car['pk'], related_id=candidate['pk'], score=value, rank=position)
+            for position, (value, candidate) in enumerate(best, start=1)
+        )
+    RelatedCar.objects.bulk_create(entries, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cars', '0008_image_renditions'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_related_cars, migrations.RunPython.noop),
+    ]
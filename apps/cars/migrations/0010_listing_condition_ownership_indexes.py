@@ -0,0 +1,21 @@
+# Generated by Django 5.2.10 on 2026-10-18 11:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cars', '0009_backfill_related_cars'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='carlisting',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['condition', '-created_at', '-car'], name='car_listings_active_cond'),
+        ),
+        migrations.AddIndex(
+            model_name='carlisting',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['ownership', '-created_at', '-car'], name='car_listings_active_owner'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.10 on 2026-10-18 12:09
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cars', '0010_listing_condition_ownership_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='carimage',
+            name='car',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='images', to='cars.car'),
+        ),
+        migrations.AddIndex(
+            model_name='carlisting',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['price'], name='car_listings_active_price'),
+        ),
+    ]
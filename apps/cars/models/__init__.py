@@ -3,7 +3,9 @@ from .manufacturer import Manufacturer
 from .car import Car
 from .car_image import CarImage
 from .car_feature import CarFeature
+from .car_listing import CarListing
+from .related_car import RelatedCar
 from .settings import DealershipSettings
 from .recently_sold import RecentlySold
 
-__all__ = ['Manufacturer', 'Car', 'CarImage', 'CarFeature', 'DealershipSettings', 'RecentlySold']
+__all__ = ['Manufacturer', 'Car', 'CarImage', 'CarFeature', 'CarListing', 'RelatedCar', 'DealershipSettings', 'RecentlySold']
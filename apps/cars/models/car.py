@@ -94,12 +94,25 @@ class Car(models.Model):
 
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Row version for conditional GETs; also bumped when images, features or related cars change
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         db_table = 'cars'
         verbose_name = 'Car'
         verbose_name_plural = 'Cars'
         ordering = ['-created_at']
+        # The list filters run on the flattened car_listings table, which holds
+        # their indexes (see CarListing); cars is only read by primary key and
+        # for the featured cars
+        indexes = [
+            # Featured cars: latest active cars first
+            models.Index(
+                fields=['-created_at', '-id'],
+                condition=models.Q(is_active=True),
+                name='cars_active_recent'
+            ),
+        ]
 
     def __str__(self):
         return f"{self.manufacturer.name} {self.model_name} ({self.model_year})"
@@ -8,15 +8,53 @@ from apps.cars.models.car import Car
 class CarImage(models.Model):
     """
     Model for storing car images as files
+    Resized derivatives are generated in the background (see ImageService)
     """
-    car = models.ForeignKey(Car, on_delete=models.CASCADE, related_name='images')
+
+    # Rendition name -> longest edge in pixels
+    RENDITION_SIZES = {
+        'thumb': 320,
+        'card': 800,
+        'full': 1920,
+    }
+    RENDITION_FORMATS = ['webp', 'jpeg']
+
+    # Indexed by car_images_car_primary, which starts with the car
+    car = models.ForeignKey(Car, on_delete=models.CASCADE, related_name='images', db_index=False)
     image = models.ImageField(upload_to='cars/')
     is_primary = models.BooleanField(default=False)
 
+    # Original upload metadata, filled in with the renditions
+    width = models.PositiveIntegerField(null=True, blank=True)
+    height = models.PositiveIntegerField(null=True, blank=True)
+    size_bytes = models.PositiveIntegerField(null=True, blank=True)
+
+    # {'source': <original name>, <rendition>: {<format>: {'name', 'width', 'height', 'size'}}}
+    renditions = models.JSONField(default=dict, blank=True)
+
     class Meta:
         db_table = 'car_images'
         verbose_name = 'Car Image'
         verbose_name_plural = 'Car Images'
+        indexes = [
+            # Primary image lookup: primary first, then upload order
+            models.Index(fields=['car', '-is_primary', 'id'], name='car_images_car_primary'),
+        ]
 
     def __str__(self):
         return f"Image - {self.car}"
+
+    @property
+    def renditions_ready(self):
+        """Whether the renditions were generated from the current file"""
+        return bool(self.renditions) and self.renditions.get('source') == self.image.name
+
+    @staticmethod
+    def pick_rendition(renditions, size, image_format='jpeg'):
+        """Return the stored file name of one rendition, or None while it is pending"""
+        entry = (renditions or {}).get(size, {}).get(image_format)
+        return entry['name'] if entry else None
+
+    def rendition_name(self, size, image_format='jpeg'):
+        """File name of a rendition, falling back to the original upload"""
+        return CarImage.pick_rendition(self.renditions, size, image_format) or self.image.name
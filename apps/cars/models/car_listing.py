@@ -0,0 +1,97 @@
+"""
+Car Listing Model
+"""
+from django.db import models
+from apps.cars.models.car import Car
+from apps.cars.models.manufacturer import Manufacturer
+
+
+class CarListing(models.Model):
+    """
+    Flattened read model for car listing cards
+    Rebuilt from Car, CarImage and Manufacturer whenever they are written
+    """
+    car = models.OneToOneField(
+        Car,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='listing'
+    )
+    manufacturer = models.ForeignKey(
+        Manufacturer,
+        on_delete=models.CASCADE,
+        related_name='listings'
+    )
+    manufacturer_name = models.CharField(max_length=100)
+    model_name = models.CharField(max_length=50)
+    model_year = models.PositiveIntegerField()
+    price = models.DecimalField(max_digits=10, decimal_places=2)
+    body_type = models.CharField(max_length=20)
+    fuel_type = models.CharField(max_length=20)
+    transmission = models.CharField(max_length=20)
+    kilometers_driven = models.PositiveIntegerField()
+    condition = models.CharField(max_length=20, blank=True)
+    ownership = models.CharField(max_length=20, blank=True)
+    # Card-size rendition of the primary image (the original until renditions are ready)
+    primary_image = models.CharField(max_length=255, blank=True)
+    primary_image_webp = models.CharField(max_length=255, blank=True)
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField()
+    
+    class Meta:
+        db_table = 'car_listings'
+        verbose_name = 'Car Listing'
+        verbose_name_plural = 'Car Listings'
+        ordering = ['-created_at']
+        # Built around the list filters in CarService.filter_cars; public requests always
+        # filter on is_active, so those indexes are partial. Each one ends with the
+        # (created_at, car) sort key so pages come out of the index without a sort step.
+        indexes = [
+            models.Index(
+                fields=['-created_at', '-car'],
+                condition=models.Q(is_active=True),
+                name='car_listings_active_recent'
+            ),
+            models.Index(
+                fields=['manufacturer', '-created_at', '-car'],
+                condition=models.Q(is_active=True),
+                name='car_listings_active_mfr'
+            ),
+            models.Index(
+                fields=['body_type', '-created_at', '-car'],
+                condition=models.Q(is_active=True),
+                name='car_listings_active_body'
+            ),
+            models.Index(
+                fields=['fuel_type', '-created_at', '-car'],
+                condition=models.Q(is_active=True),
+                name='car_listings_active_fuel'
+            ),
+            models.Index(
+                fields=['transmission', '-created_at', '-car'],
+                condition=models.Q(is_active=True),
+                name='car_listings_active_trans'
+            ),
+            models.Index(
+                fields=['condition', '-created_at', '-car'],
+                condition=models.Q(is_active=True),
+                name='car_listings_active_cond'
+            ),
+            models.Index(
+                fields=['ownership', '-created_at', '-car'],
+                condition=models.Q(is_active=True),
+                name='car_listings_active_owner'
+            ),
+            # Price ranges cannot come out in created_at order, so this one narrows
+            # the rows and the page is sorted
+            models.Index(
+                fields=['price'],
+                condition=models.Q(is_active=True),
+                name='car_listings_active_price'
+            ),
+            # Admin listings, which include inactive cars
+            models.Index(fields=['-created_at', '-car'], name='car_listings_recent'),
+        ]
+    
+    def __str__(self):
+        return f"{self.manufacturer_name} {self.model_name} ({self.model_year})"
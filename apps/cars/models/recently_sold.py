@@ -13,6 +13,7 @@ class RecentlySold(models.Model):
     sold_date = models.DateField()
     image = models.URLField(max_length=500)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         db_table = 'recently_sold'
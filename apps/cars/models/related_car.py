@@ -0,0 +1,27 @@
+"""
+Related Car Model
+"""
+from django.db import models
+from apps.cars.models.car import Car
+
+
+class RelatedCar(models.Model):
+    """
+    Precomputed related-cars entry: `related` is the `rank`-th best match for `car`
+    """
+    car = models.ForeignKey(Car, on_delete=models.CASCADE, related_name='related_entries')
+    related = models.ForeignKey(Car, on_delete=models.CASCADE, related_name='related_to_entries')
+    score = models.FloatField()
+    rank = models.PositiveSmallIntegerField()
+    
+    class Meta:
+        db_table = 'related_cars'
+        verbose_name = 'Related Car'
+        verbose_name_plural = 'Related Cars'
+        ordering = ['car', 'rank']
+        constraints = [
+            models.UniqueConstraint(fields=['car', 'rank'], name='related_cars_car_rank'),
+        ]
+    
+    def __str__(self):
+        return f"{self.car_id} -> {self.related_id} (#{self.rank})"
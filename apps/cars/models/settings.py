@@ -32,17 +32,23 @@ class DealershipSettings(models.Model):
         """Prevent deletion of settings"""
         raise ValidationError('Cannot delete dealership settings')
     
+    # Values of the singleton when it is first created
+    DEFAULTS = {
+        'address': '123 Luxury Lane, Beverly Hills, CA 90210',
+        'phone': '+1 (555) 123-4567',
+        'email': 'info@elitecars.com'
+    }
+    
     @classmethod
     def load(cls):
         """Load the singleton instance"""
-        obj, created = cls.objects.get_or_create(
-            pk=1,
-            defaults={
-                'address': '123 Luxury Lane, Beverly Hills, CA 90210',
-                'phone': '+1 (555) 123-4567',
-                'email': 'info@elitecars.com'
-            }
-        )
+        obj, created = cls.objects.get_or_create(pk=1, defaults=cls.DEFAULTS)
+        return obj
+    
+    @classmethod
+    async def aload(cls):
+        """Async counterpart of load()"""
+        obj, created = await cls.objects.aget_or_create(pk=1, defaults=cls.DEFAULTS)
         return obj
     
     def __str__(self):
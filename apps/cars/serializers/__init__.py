@@ -3,9 +3,11 @@ from .car_serializer import (
     ManufacturerSerializer,
     CarSerializer,
     CarListSerializer,
+    CarListingSerializer,
     CarImageSerializer,
     CarFeatureSerializer
 )
+from .import_serializer import CarImportRowSerializer
 from .settings_serializer import DealershipSettingsSerializer
 from .recently_sold_serializer import RecentlySoldSerializer
 
@@ -13,8 +15,10 @@ __all__ = [
     'ManufacturerSerializer',
     'CarSerializer',
     'CarListSerializer',
+    'CarListingSerializer',
     'CarImageSerializer',
     'CarFeatureSerializer',
+    'CarImportRowSerializer',
     'DealershipSettingsSerializer',
     'RecentlySoldSerializer'
 ]
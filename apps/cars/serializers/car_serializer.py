@@ -1,8 +1,21 @@
 """
 Car Serializer
 """
+from django.db import transaction
 from rest_framework import serializers
-from apps.cars.models import Manufacturer, Car, CarImage, CarFeature
+from apps.cars.models import Manufacturer, Car, CarImage, CarFeature, CarListing
+from common.utils import set_prefetched
+from core.instrumentation import TimedSerializerMixin
+
+
+def build_image_url(name, request=None):
+    """Build the (absolute when a request is available) URL of a stored car image file"""
+    if not name:
+        return None
+    image_url = CarImage._meta.get_field('image').storage.url(name)
+    if request is not None:
+        return request.build_absolute_uri(image_url)
+    return image_url
 
 
 class ManufacturerSerializer(serializers.ModelSerializer):
@@ -17,21 +30,46 @@ class ManufacturerSerializer(serializers.ModelSerializer):
 class CarImageSerializer(serializers.ModelSerializer):
     """
     Serializer for CarImage model
+    `image` is the original upload; `image_url` and `thumbnail_url` point at the
+    full-size and thumbnail renditions once they are generated
     """
     image_url = serializers.SerializerMethodField()
+    thumbnail_url = serializers.SerializerMethodField()
+    renditions = serializers.SerializerMethodField()
     
     class Meta:
         model = CarImage
-        fields = ['id', 'image', 'image_url', 'is_primary']
+        fields = ['id', 'image', 'image_url', 'thumbnail_url', 'is_primary', 'width', 'height', 'size_bytes', 'renditions']
+        read_only_fields = ['width', 'height', 'size_bytes']
     
     def get_image_url(self, obj):
-        """Get full URL for image"""
-        request = self.context.get('request')
-        if obj.image and hasattr(obj.image, 'url'):
-            if request is not None:
-                return request.build_absolute_uri(obj.image.url)
-            return obj.image.url
+        """Get full URL for the full-size image"""
+        if obj.image:
+            return build_image_url(obj.rendition_name('full'), self.context.get('request'))
+        return None
+    
+    def get_thumbnail_url(self, obj):
+        """Get full URL for the gallery thumbnail"""
+        if obj.image:
+            return build_image_url(obj.rendition_name('thumb'), self.context.get('request'))
         return None
+    
+    def get_renditions(self, obj):
+        """Every generated rendition with its URL and dimensions"""
+        request = self.context.get('request')
+        return {
+            size: {
+                image_format: {
+                    'url': build_image_url(entry['name'], request),
+                    'width': entry['width'],
+                    'height': entry['height'],
+                    'size': entry['size'],
+                }
+                for image_format, entry in formats.items()
+            }
+            for size, formats in obj.renditions.items()
+            if size in CarImage.RENDITION_SIZES
+        }
 
 
 class CarFeatureSerializer(serializers.ModelSerializer):
@@ -43,7 +81,7 @@ class CarFeatureSerializer(serializers.ModelSerializer):
         fields = ['id', 'name']
 
 
-class CarSerializer(serializers.ModelSerializer):
+class CarSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for Car model
     """
@@ -102,11 +140,10 @@ class CarSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         """Create car with features"""
         feature_names = validated_data.pop('feature_names', [])
-        car = Car.objects.create(**validated_data)
         
-        # Create features
-        for feature_name in feature_names:
-            CarFeature.objects.create(car=car, name=feature_name)
+        with transaction.atomic():
+            car = Car.objects.create(**validated_data)
+            self.set_features(car, feature_names, is_new=True)
         
         return car
     
@@ -114,26 +151,55 @@ class CarSerializer(serializers.ModelSerializer):
         """Update car and features"""
         feature_names = validated_data.pop('feature_names', None)
         
-        # Update car fields
-        for attr, value in validated_data.items():
-            setattr(instance, attr, value)
-        instance.save()
-        
-        # Update features if provided
-        if feature_names is not None:
-            instance.features.all().delete()
-            for feature_name in feature_names:
-                CarFeature.objects.create(car=instance, name=feature_name)
+        with transaction.atomic():
+            # Update car fields
+            for attr, value in validated_data.items():
+                setattr(instance, attr, value)
+            instance.save()
+            
+            # Update features if provided
+            if feature_names is not None:
+                self.set_features(instance, feature_names)
         
         return instance
+    
+    def set_features(self, car, feature_names, is_new=False):
+        """
+        Bring the car's features in line with `feature_names`
+        Diffs against the stored names, so only removed features are deleted and
+        only new ones inserted (one bulk insert); unchanged rows are left alone.
+        The resulting features are cached on the car for the response.
+        """
+        wanted = list(dict.fromkeys(feature_names))
+        wanted_names = set(wanted)
+        
+        # Served from the prefetch cache when the view prefetched features
+        existing = [] if is_new else list(car.features.all())
+        kept, removed_ids, current = [], [], set()
+        for feature in existing:
+            # Drop removed names and any duplicate rows of kept ones
+            if feature.name in wanted_names and feature.name not in current:
+                kept.append(feature)
+                current.add(feature.name)
+            else:
+                removed_ids.append(feature.pk)
+        added = [CarFeature(car=car, name=name) for name in wanted if name not in current]
+        
+        if removed_ids:
+            CarFeature.objects.filter(pk__in=removed_ids).delete()
+        if added:
+            added = CarFeature.objects.bulk_create(added)
+        
+        set_prefetched(car, 'features', kept + added)
 
 
-class CarListSerializer(serializers.ModelSerializer):
+class CarListSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Lightweight serializer for car listings
     """
     manufacturer_name = serializers.CharField(source='manufacturer.name', read_only=True)
     primary_image = serializers.SerializerMethodField()
+    primary_image_webp = serializers.SerializerMethodField()
     
     class Meta:
         model = Car
@@ -148,19 +214,66 @@ class CarListSerializer(serializers.ModelSerializer):
             'transmission',
             'kilometers_driven',
             'is_active',
-            'primary_image'
+            'primary_image',
+            'primary_image_webp'
         ]
     
-    def get_primary_image(self, obj):
-        """Get primary image URL"""
-        primary_image = obj.images.filter(is_primary=True).first()
-        if not primary_image:
-            primary_image = obj.images.first()
+    def get_card_image(self, obj):
+        """
+        Return (name, renditions) of the primary image
+        Uses the `with_primary_image` annotations when present, otherwise
+        picks from `obj.images.all()` so a prefetch is reused
+        """
+        if hasattr(obj, 'primary_image_name'):
+            return obj.primary_image_name, getattr(obj, 'primary_image_renditions', None)
         
-        if primary_image:
-            request = self.context.get('request')
-            if request is not None:
-                return request.build_absolute_uri(primary_image.image.url)
-            return primary_image.image.url
-        return None
+        images = sorted(obj.images.all(), key=lambda image: (not image.is_primary, image.pk))
+        if not images:
+            return None, None
+        return images[0].image.name, images[0].renditions
+    
+    def get_primary_image(self, obj):
+        """Get the card-size primary image URL (JPEG, or the original while renditions are pending)"""
+        image_name, renditions = self.get_card_image(obj)
+        image_name = CarImage.pick_rendition(renditions, 'card') or image_name
+        return build_image_url(image_name, self.context.get('request'))
+    
+    def get_primary_image_webp(self, obj):
+        """Get the card-size primary image URL in WebP"""
+        image_name, renditions = self.get_card_image(obj)
+        return build_image_url(CarImage.pick_rendition(renditions, 'card', 'webp'), self.context.get('request'))
 
+
+class CarListingSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    """
+    Serializer for listing cards read from the flattened listing table
+    Produces the same shape as CarListSerializer
+    """
+    id = serializers.IntegerField(source='car_id', read_only=True)
+    primary_image = serializers.SerializerMethodField()
+    primary_image_webp = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = CarListing
+        fields = [
+            'id',
+            'manufacturer_name',
+            'model_name',
+            'model_year',
+            'price',
+            'body_type',
+            'fuel_type',
+            'transmission',
+            'kilometers_driven',
+            'is_active',
+            'primary_image',
+            'primary_image_webp'
+        ]
+    
+    def get_primary_image(self, obj):
+        """Get the card-size primary image URL"""
+        return build_image_url(obj.primary_image, self.context.get('request'))
+    
+    def get_primary_image_webp(self, obj):
+        """Get the card-size primary image URL in WebP"""
+        return build_image_url(obj.primary_image_webp, self.context.get('request'))
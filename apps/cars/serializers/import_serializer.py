@@ -0,0 +1,55 @@
+"""
+Car Import Serializer
+"""
+from rest_framework import serializers
+from apps.cars.models import Car
+
+
+class CarImportRowSerializer(serializers.ModelSerializer):
+    """
+    Validates one row of a bulk inventory import
+    The manufacturer is given by name and resolved in batches by the import service;
+    `images` are file names inside the accompanying zip archive
+    """
+    manufacturer = serializers.CharField(max_length=100)
+    features = serializers.ListField(
+        child=serializers.CharField(max_length=50),
+        required=False,
+        default=list
+    )
+    images = serializers.ListField(
+        child=serializers.CharField(max_length=255),
+        required=False,
+        default=list
+    )
+    
+    class Meta:
+        model = Car
+        fields = [
+            'manufacturer',
+            'body_type',
+            'model_name',
+            'variant',
+            'model_year',
+            'registration_year',
+            'ownership',
+            'kilometers_driven',
+            'fuel_type',
+            'transmission',
+            'engine_cc',
+            'mileage',
+            'color',
+            'price',
+            'is_negotiable',
+            'insurance_valid_till',
+            'rc_available',
+            'puc_available',
+            'loan_clearance',
+            'condition',
+            'accident_history',
+            'service_history',
+            'description',
+            'is_active',
+            'features',
+            'images'
+        ]
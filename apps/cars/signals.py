@@ -0,0 +1,93 @@
+"""
+Car Signals
+Route writes on the car tables to the sync service
+"""
+from django.db import transaction
+from django.db.models.signals import post_init, post_save, post_delete, pre_delete
+from django.dispatch import receiver
+from apps.cars.models import Manufacturer, Car, CarImage, CarFeature, RelatedCar, DealershipSettings
+from services.image_service import ImageService
+from services.related_car_service import RelatedCarService
+from services.settings_service import SettingsService
+from services.sync_service import SyncService
+
+
+@receiver(post_init, sender=Car)
+def car_loaded(sender, instance, **kwargs):
+    """Remember the scoring fields, so saves that leave them alone skip the related-cars refresh"""
+    instance._scoring_state = RelatedCarService.scoring_state(instance)
+
+
+@receiver(post_save, sender=Car)
+def car_saved(sender, instance, raw=False, created=False, **kwargs):
+    """Refresh derived data for a saved car"""
+    if raw:
+        return
+    state = RelatedCarService.scoring_state(instance)
+    rescore = created or state != instance._scoring_state
+    instance._scoring_state = state
+    SyncService.schedule_cars([instance.pk], rescore=rescore)
+
+
+@receiver(post_delete, sender=Car)
+def car_deleted(sender, instance, **kwargs):
+    """Refresh derived data for a deleted car"""
+    SyncService.schedule_cars([instance.pk], rescore=True)
+
+
+@receiver(pre_delete, sender=Car)
+def car_deleting(sender, instance, **kwargs):
+    """Refresh the cars listing this one as related; their entries cascade away with it"""
+    SyncService.schedule_cars(
+        RelatedCar.objects.filter(related=instance).values_list('car_id', flat=True),
+        rescore=True
+    )
+
+
+@receiver(post_save, sender=CarImage)
+@receiver(post_delete, sender=CarImage)
+def car_image_changed(sender, instance, raw=False, **kwargs):
+    """Refresh derived data for the car owning the image"""
+    if raw:
+        return
+    SyncService.schedule_cars([instance.car_id])
+
+
+@receiver(post_save, sender=CarImage)
+def car_image_saved(sender, instance, raw=False, **kwargs):
+    """Queue resized renditions for a new or replaced image file"""
+    if raw or instance.renditions_ready:
+        return
+    ImageService.schedule([instance.pk])
+
+
+@receiver(post_save, sender=CarFeature)
+@receiver(post_delete, sender=CarFeature)
+def car_feature_changed(sender, instance, raw=False, **kwargs):
+    """Refresh derived data for the car owning the feature"""
+    if raw:
+        return
+    SyncService.schedule_cars([instance.car_id])
+
+
+@receiver(post_save, sender=Manufacturer)
+def manufacturer_changed(sender, instance, raw=False, created=False, **kwargs):
+    """Refresh derived data for every car of a renamed manufacturer"""
+    if raw:
+        return
+    car_ids = [] if created else instance.cars.values_list('pk', flat=True)
+    SyncService.schedule_cars(car_ids)
+
+
+@receiver(post_delete, sender=Manufacturer)
+def manufacturer_deleted(sender, instance, **kwargs):
+    """Mark the catalog as changed; the cascaded cars queue themselves"""
+    SyncService.schedule_cars([])
+
+
+@receiver(post_save, sender=DealershipSettings)
+def dealership_settings_saved(sender, instance, raw=False, **kwargs):
+    """Invalidate the cached settings in every worker once the write commits"""
+    if raw:
+        return
+    transaction.on_commit(SettingsService.bump_version)
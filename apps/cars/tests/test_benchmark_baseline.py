@@ -0,0 +1,43 @@
+"""
+Benchmark baseline tests
+Requests every benchmarked route on the baseline's catalog size and fails when
+a route issues more queries than benchmarks/baseline.json records. Latency and
+memory depend on the machine, so only `benchmark_endpoints --baseline` checks them.
+"""
+import json
+import random
+from io import StringIO
+from pathlib import Path
+import pytest
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import connection
+from django.test import Client
+from apps.cars.management.commands.benchmark_endpoints import BENCHMARK_MEDIA, Command
+from apps.cars.models import CarImage
+
+BASELINE = json.loads((Path(settings.BASE_DIR) / 'benchmarks' / 'baseline.json').read_text())
+
+
+@pytest.mark.skipif(connection.vendor != BASELINE['meta']['vendor'], reason='baseline recorded on another database')
+def test_routes_issue_no_more_queries_than_the_baseline(transactional_db):
+    # Outside a transaction, so commit hooks run as they do for the command
+    command = Command(stdout=StringIO())
+    token = command.seed(BASELINE['meta']['cars'], BASELINE['meta']['leads'])
+    clients = {'anonymous': Client(), 'admin': Client(HTTP_AUTHORIZATION=f'Token {token}')}
+    storage = CarImage._meta.get_field('image').storage
+    media_name = storage.save(BENCHMARK_MEDIA, ContentFile(random.Random(0).randbytes(256 * 1024)))
+    try:
+        results = command.run_routes(clients, media_name, {'routes': '', 'iterations': 2, 'export_iterations': 2})
+    finally:
+        storage.delete(media_name)
+    
+    assert sorted(results) == sorted(BASELINE['routes'])
+    failed = {name: result['status'] for name, result in results.items() if not 200 <= result['status'] < 400}
+    assert not failed
+    regressed = {
+        name: (BASELINE['routes'][name]['queries'], result['queries'])
+        for name, result in results.items()
+        if result['queries'] > BASELINE['routes'][name]['queries']
+    }
+    assert not regressed, f'queries (baseline, now): {regressed}'
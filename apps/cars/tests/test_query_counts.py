@@ -0,0 +1,62 @@
+"""
+Query count tests for the cars list
+A full page must be served by the same fixed set of queries as a one-item page
+"""
+import random
+import pytest
+from django.db import connection
+from apps.cars.management import seeding
+from apps.cars.models import DealershipSettings
+from services.auth_service import AuthService
+from services.catalog_cache_service import CatalogCacheService
+
+API = '/api/v1'
+
+
+@pytest.fixture
+def catalog(db):
+    """150 seeded cars; the settings row exists up front as it does in production"""
+    seeding.seed_cars(150, random.Random(42))
+    DealershipSettings.load()
+
+
+def count_queries(client, path):
+    """Request a path with the catalog cache cold; returns (queries, response)"""
+    queries = []
+    
+    def counter(execute, sql, params, many, context):
+        # connection.queries is reset when each request starts, so count here instead
+        queries.append(sql)
+        return execute(sql, params, many, context)
+    
+    CatalogCacheService.bump_version()
+    with connection.execute_wrapper(counter):
+        response = client.get(path)
+    return len(queries), response
+
+
+@pytest.mark.parametrize('path', [
+    f'{API}/cars/?page_size=',
+    f'{API}/cars/?pagination=cursor&page_size=',
+    f'{API}/cars/?q=model&page_size=',
+])
+def test_cars_list_query_count_is_independent_of_page_size(client, catalog, path):
+    count_queries(client, f'{path}1')
+    small, small_response = count_queries(client, f'{path}1')
+    large, large_response = count_queries(client, f'{path}100')
+    
+    assert small_response.status_code == large_response.status_code == 200
+    assert len(large_response.json()['results']) == 100
+    assert large == small
+
+
+def test_admin_cars_list_query_count_is_independent_of_page_size(client, catalog):
+    token = AuthService.register_admin('query-counts@example.com', 'query-counts-password', 'Query Counts')['token']
+    client.defaults['HTTP_AUTHORIZATION'] = f'Token {token}'
+    
+    count_queries(client, f'{API}/cars/?page_size=1')
+    small, _ = count_queries(client, f'{API}/cars/?page_size=1')
+    large, response = count_queries(client, f'{API}/cars/?page_size=100')
+    
+    assert len(response.json()['results']) == 100
+    assert large == small
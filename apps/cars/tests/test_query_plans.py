@@ -0,0 +1,19 @@
+"""
+Query plan tests for the car list filters
+Runs the check_query_plans suite on the test database; see that command for
+which plans may scan or sort
+"""
+from io import StringIO
+import pytest
+from django.db import connection
+from apps.cars.management.commands.check_query_plans import PLAN_PROBLEMS, Command
+
+
+@pytest.mark.skipif(connection.vendor not in PLAN_PROBLEMS, reason='no plan checks for this database')
+def test_car_queries_are_index_backed(transactional_db):
+    # Outside a transaction the seeding can VACUUM, as PostgreSQL needs after bulk inserts
+    out = StringIO()
+    command = Command(stdout=out)
+    command.seed(5000)
+    
+    assert command.check_plans(connection.vendor, verbose_plans=False) == 0, out.getvalue()
@@ -1,10 +1,12 @@
 """
 Cars URL Configuration
 """
-from django.urls import path, include
+from django.urls import path, re_path, include
 from rest_framework.routers import DefaultRouter
 from .views import ManufacturerViewSet, CarViewSet, dealership_settings_detail, dealership_settings_update
-from .views import recently_sold_list, recently_sold_create, add_car_to_recently_sold
+from .views import recently_sold_list, recently_sold_create, add_car_to_recently_sold, catalog_cache_stats
+from .views import import_cars
+from .views import async_views
 
 router = DefaultRouter()
 router.register(r'manufacturers', ManufacturerViewSet, basename='manufacturer')
@@ -12,16 +14,30 @@ router.register(r'', CarViewSet, basename='car')
 
 app_name = 'cars'
 
+# DRF views behind the async read paths (writes, admins and cache misses go there)
+drf_views = {pattern.name: pattern.callback for pattern in router.urls}
+
 urlpatterns = [
     # Recently sold endpoints
-    path('recently-sold/', recently_sold_list, name='recently-sold-list'),
+    path('recently-sold/', async_views.async_read_view(recently_sold_list, async_views.recently_sold), name='recently-sold-list'),
     path('recently-sold/create/', recently_sold_create, name='recently-sold-create'),
     path('recently-sold/add-car/', add_car_to_recently_sold, name='add-car-to-recently-sold'),
     
     # Settings endpoints
-    path('settings/', dealership_settings_detail, name='settings-detail'),
+    path('settings/', async_views.async_read_view(dealership_settings_detail, async_views.dealership_settings), name='settings-detail'),
     path('settings/update/', dealership_settings_update, name='settings-update'),
     
+    # Catalog cache endpoints
+    path('cache-stats/', catalog_cache_stats, name='catalog-cache-stats'),
+    
+    # Bulk import endpoint
+    path('import/', import_cars, name='car-import'),
+    
+    # Async read paths for the hot car endpoints; anything else falls through to the viewsets
+    path('', async_views.async_read_view(drf_views['car-list'], async_views.car_list), name='car-list'),
+    path('featured/', async_views.async_read_view(drf_views['car-featured'], async_views.featured_cars), name='car-featured'),
+    re_path(r'^(?P<pk>[0-9]+)/$', async_views.async_read_view(drf_views['car-detail'], async_views.car_detail), name='car-detail'),
+    
     # Car and Manufacturer endpoints (via router) - MUST BE LAST
     path('', include(router.urls)),
 ]
@@ -2,6 +2,8 @@
 from .car_views import ManufacturerViewSet, CarViewSet
 from .settings_views import dealership_settings_detail, dealership_settings_update
 from .recently_sold_views import recently_sold_list, recently_sold_create, add_car_to_recently_sold
+from .cache_views import catalog_cache_stats
+from .import_views import import_cars
 
 __all__ = [
     'ManufacturerViewSet',
@@ -10,5 +12,7 @@ __all__ = [
     'dealership_settings_update',
     'recently_sold_list',
     'recently_sold_create',
-    'add_car_to_recently_sold'
+    'add_car_to_recently_sold',
+    'catalog_cache_stats',
+    'import_cars'
 ]
@@ -0,0 +1,144 @@
+"""
+Async Read Views
+Event-loop versions of the hot public read endpoints, for the ASGI server.
+Anonymous reads are answered from validators and the versioned catalog cache
+with async cache and ORM calls; cache misses, authenticated requests, the
+browsable API and writes run the regular DRF views in the request thread
+"""
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from core.conditional import has_credentials, is_not_modified, make_etag, set_validators, vary_on_credentials
+from core.renderers import JSONRenderer
+from core.responses import success_response
+from common.constants import CacheControl
+from apps.cars.models import Car
+from apps.cars.serializers import DealershipSettingsSerializer, RecentlySoldSerializer
+from services.car_service import CarService
+from services.catalog_cache_service import CatalogCacheService
+from services.settings_service import SettingsService
+
+
+def is_anonymous_json_read(request):
+    """
+    GET/HEAD without credentials that asks for JSON
+    Anything else needs authentication or the browsable API, so it goes to DRF
+    """
+    return (
+        request.method in ('GET', 'HEAD')
+        and not has_credentials(request)
+        and 'text/html' not in request.headers.get('Accept', '')
+    )
+
+
+def json_response(data, etag=None, last_modified=None, cache_control=None):
+    """Render a payload the way DRF's JSON renderer does and attach the validators"""
+    response = HttpResponse(JSONRenderer().render(data), content_type='application/json')
+    response['Vary'] = 'Accept'
+    return vary_on_credentials(set_validators(response, etag, last_modified, cache_control))
+
+
+def not_modified_response(etag, last_modified, cache_control):
+    response = HttpResponse(status=304)
+    response['Vary'] = 'Accept'
+    return vary_on_credentials(set_validators(response, etag, last_modified, cache_control))
+
+
+def async_read_view(drf_view, read):
+    """
+    Build an async view that answers anonymous JSON reads with `read` and hands
+    every other request to the DRF view, run in the request thread
+    `read` is called as read(request, fallback, **url_kwargs), where `fallback`
+    runs the DRF view for the same request
+    """
+    fallback = sync_to_async(drf_view)
+    
+    @csrf_exempt
+    async def view(request, **kwargs):
+        if is_anonymous_json_read(request):
+            return await read(request, fallback, **kwargs)
+        return await fallback(request, **kwargs)
+    
+    view.__name__, view.__doc__ = read.__name__, read.__doc__
+    return view
+
+
+async def cached_catalog_aresponse(request, scope, build, *key_parts, validators=None,
+                                   cache_control=CacheControl.CATALOG):
+    """
+    Async counterpart of cached_catalog_response for anonymous JSON reads
+    Serves 304s and cache hits on the event loop; misses await `build` (the DRF
+    view, which fills the cache)
+    """
+    version = await CatalogCacheService.aget_version()
+    key = CatalogCacheService.build_key(scope, request.GET, *key_parts, version=version)
+    if validators is not None:
+        etag, last_modified = await validators()
+    else:
+        etag, last_modified = make_etag(key), CatalogCacheService.get_last_modified(version)
+    
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(etag, last_modified, cache_control)
+    
+    data = await CatalogCacheService.aget(key)
+    if data is None:
+        return await build()
+    return json_response(data, etag, last_modified, cache_control)
+
+
+async def car_list(request, fallback):
+    """List cars (cached)"""
+    return await cached_catalog_aresponse(request, 'cars:list', lambda: fallback(request))
+
+
+async def car_detail(request, fallback, pk):
+    """Get car details with related cars (cached)"""
+    async def validators():
+        # Same validators as CarViewSet._detail_validators, from the car's row version
+        updated_at = await Car.objects.filter(pk=pk, is_active=True).values_list('updated_at', flat=True).afirst()
+        if updated_at is None:
+            return None, None
+        return make_etag('cars:detail', pk, updated_at.isoformat()), updated_at
+    
+    return await cached_catalog_aresponse(
+        request, 'cars:detail',
+        lambda: fallback(request, pk=pk),
+        pk,
+        validators=validators,
+        cache_control=CacheControl.CAR_DETAIL
+    )
+
+
+async def featured_cars(request, fallback):
+    """Get featured/latest cars (cached)"""
+    return await cached_catalog_aresponse(request, 'cars:featured', lambda: fallback(request))
+
+
+async def dealership_settings(request, fallback):
+    """Get dealership settings"""
+    settings_obj = await SettingsService.aget_settings()
+    etag = make_etag('settings', settings_obj.updated_at.isoformat())
+    if is_not_modified(request, etag, settings_obj.updated_at):
+        return not_modified_response(etag, settings_obj.updated_at, CacheControl.SETTINGS)
+    
+    data = success_response(data=DealershipSettingsSerializer(settings_obj).data).data
+    return json_response(data, etag, settings_obj.updated_at, CacheControl.SETTINGS)
+
+
+async def recently_sold(request, fallback):
+    """Get recently sold cars"""
+    try:
+        limit = int(request.GET.get('limit', 10))
+    except ValueError:
+        # The DRF view reports the error
+        return await fallback(request)
+    
+    version = await CarService.aget_recently_sold_version()
+    last_modified = version['last_modified']
+    etag = make_etag('recently-sold', limit, version['count'], last_modified and last_modified.isoformat())
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(etag, last_modified, CacheControl.RECENTLY_SOLD)
+    
+    sold = await CarService.aget_recently_sold(limit=limit)
+    data = success_response(data=RecentlySoldSerializer(sold, many=True).data).data
+    return json_response(data, etag, last_modified, CacheControl.RECENTLY_SOLD)
@@ -0,0 +1,14 @@
+"""
+Catalog Cache Views
+"""
+from rest_framework.decorators import api_view, permission_classes
+from core.permissions import IsAdmin
+from core.responses import success_response
+from services.catalog_cache_service import CatalogCacheService
+
+
+@api_view(['GET'])
+@permission_classes([IsAdmin])
+def catalog_cache_stats(request):
+    """Get catalog cache hit/miss counters (admin only)"""
+    return success_response(data=CatalogCacheService.get_stats())
@@ -1,19 +1,59 @@
 """
 Car Views
 """
+from django.db import transaction
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.permissions import AllowAny
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
+from rest_framework.response import Response
 from core.permissions import IsAdminOrReadOnly
 from core.responses import success_response, error_response
-from common.constants import Messages
-from apps.cars.models import Manufacturer, Car, CarImage
-from apps.cars.serializers import ManufacturerSerializer, CarSerializer, CarListSerializer
+from core.conditional import conditional_response, make_etag, private_response
+from common.constants import Messages, CacheControl
+from common.utils import set_prefetched
+from apps.cars.models import Manufacturer, Car, CarImage, CarListing
+from apps.cars.serializers import ManufacturerSerializer, CarSerializer, CarListSerializer, CarListingSerializer
+from apps.monitoring.metrics import record_image_uploads
 from services.car_service import CarService
+from services.catalog_cache_service import CatalogCacheService
+from services.facet_service import FacetService
+from services.image_service import ImageService
+from services.search_service import SearchService
+from services.sync_service import SyncService
 import json
 
 
+def cached_catalog_response(request, scope, build, *key_parts, validators=None, cache_control=CacheControl.CATALOG):
+    """
+    Serve a catalog response from the versioned cache for anonymous visitors
+    Repeat visits revalidate with ETag / Last-Modified and get a 304 without a cache read.
+    By default the validators follow the catalog version; `validators` can supply
+    (etag, last_modified) from row versions instead.
+    Authenticated admins always get a fresh, private response
+    """
+    if request.user and request.user.is_authenticated:
+        return private_response(build())
+    
+    key = CatalogCacheService.build_key(scope, request.query_params, *key_parts)
+    if validators is not None:
+        etag, last_modified = validators()
+    else:
+        etag, last_modified = make_etag(key), CatalogCacheService.get_last_modified()
+    
+    def build_cached():
+        data = CatalogCacheService.get(key)
+        if data is not None:
+            return Response(data)
+        
+        response = build()
+        if response.status_code == status.HTTP_200_OK:
+            CatalogCacheService.set(key, response.data)
+        return response
+    
+    return conditional_response(request, build_cached, etag, last_modified, cache_control)
+
+
 class ManufacturerViewSet(viewsets.ModelViewSet):
     """
     ViewSet for Manufacturer model
@@ -21,6 +61,13 @@ class ManufacturerViewSet(viewsets.ModelViewSet):
     queryset = Manufacturer.objects.all()
     serializer_class = ManufacturerSerializer
     permission_classes = [IsAdminOrReadOnly]
+    
+    def list(self, request, *args, **kwargs):
+        """List manufacturers (cached)"""
+        return cached_catalog_response(
+            request, 'manufacturers:list',
+            lambda: super(ManufacturerViewSet, self).list(request, *args, **kwargs)
+        )
 
 
 class CarViewSet(viewsets.ModelViewSet):
@@ -36,7 +83,7 @@ class CarViewSet(viewsets.ModelViewSet):
     def get_serializer_class(self):
         """Use lightweight serializer for list view"""
         if self.action == 'list':
-            return CarListSerializer
+            return CarListingSerializer
         return CarSerializer
     
     def get_queryset(self):
@@ -47,60 +94,82 @@ class CarViewSet(viewsets.ModelViewSet):
         user = self.request.user
         is_admin = user and user.is_authenticated
         
-        queryset = Car.objects.select_related('manufacturer').prefetch_related('images', 'features')
-        
-        # Filter by active status
-        is_active = self.request.query_params.get('is_active', None)
-        if is_active is not None:
-            active_bool = is_active.lower() == 'true'
-            queryset = queryset.filter(is_active=active_bool)
-        elif not is_admin:
-            # For non-admin users, only show active cars by default
-            queryset = queryset.filter(is_active=True)
-        
-        # Filter by manufacturer
-        manufacturer_id = self.request.query_params.get('manufacturer', None)
-        if manufacturer_id:
-            queryset = queryset.filter(manufacturer_id=manufacturer_id)
-        
-        # Filter by body type
-        body_type = self.request.query_params.get('body_type', None)
-        if body_type:
-            queryset = queryset.filter(body_type=body_type)
-        
-        # Filter by fuel type
-        fuel_type = self.request.query_params.get('fuel_type', None)
-        if fuel_type:
-            queryset = queryset.filter(fuel_type=fuel_type)
-        
-        # Filter by transmission
-        transmission = self.request.query_params.get('transmission', None)
-        if transmission:
-            queryset = queryset.filter(transmission=transmission)
+        if self.action == 'list':
+            # Cards come from the flattened listing table in a single-table scan
+            queryset = CarListing.objects.all()
+        elif self.action == 'related':
+            queryset = Car.objects.all()
+        else:
+            queryset = Car.objects.select_related('manufacturer').prefetch_related('images', 'features')
         
-        # Filter by price range
-        min_price = self.request.query_params.get('min_price', None)
-        max_price = self.request.query_params.get('max_price', None)
-        if min_price:
-            queryset = queryset.filter(price__gte=min_price)
-        if max_price:
-            queryset = queryset.filter(price__lte=max_price)
+        queryset = CarService.filter_cars(queryset, self.request.query_params, is_admin)
         
+        search = self.request.query_params.get('q')
+        if search and self.action == 'list':
+            # Best matches first in page number mode; cursor mode keeps its recency order
+            queryset = SearchService.rank(queryset, search)
         return queryset
     
+    def list(self, request, *args, **kwargs):
+        """List cars (cached)"""
+        return cached_catalog_response(
+            request, 'cars:list',
+            lambda: super(CarViewSet, self).list(request, *args, **kwargs)
+        )
+    
     @action(detail=False, methods=['get'], permission_classes=[AllowAny])
     def featured(self, request):
-        """Get featured/latest cars"""
+        """Get featured/latest cars (cached)"""
+        return cached_catalog_response(request, 'cars:featured', lambda: self._featured(request))
+    
+    def _featured(self, request):
+        """Build the featured cars response"""
         try:
             # Return latest 6 active cars
-            cars = Car.objects.filter(is_active=True).order_by('-created_at')[:6]
+            cars = CarService.get_featured_cars(limit=6)
             serializer = CarListSerializer(cars, many=True, context={'request': request})
             return success_response(data=serializer.data)
         except Exception as e:
             return error_response(message=str(e))
     
+    @action(detail=False, methods=['get'], permission_classes=[AllowAny])
+    def facets(self, request):
+        """Get filter sidebar counts and histograms for the applied filters (cached)"""
+        return cached_catalog_response(request, 'cars:facets', lambda: self._facets(request))
+    
+    def _facets(self, request):
+        """Build the facets response"""
+        user = request.user
+        is_admin = user and user.is_authenticated
+        data = FacetService.get_facets(request.query_params, is_admin)
+        return success_response(data=data)
+    
     def retrieve(self, request, *args, **kwargs):
-        """Get car details with related cars"""
+        """Get car details with related cars (cached)"""
+        pk = kwargs.get(self.lookup_field, '')
+        return cached_catalog_response(
+            request, 'cars:detail',
+            lambda: self._retrieve(request),
+            pk,
+            validators=lambda: self._detail_validators(pk),
+            cache_control=CacheControl.CAR_DETAIL
+        )
+    
+    def _detail_validators(self, pk):
+        """
+        Validators for a car detail page from the car's row version
+        The sync service bumps it whenever the images, features or related cars change
+        """
+        try:
+            updated_at = Car.objects.filter(pk=pk, is_active=True).values_list('updated_at', flat=True).first()
+        except (TypeError, ValueError):
+            updated_at = None
+        if updated_at is None:
+            return None, None
+        return make_etag('cars:detail', pk, updated_at.isoformat()), updated_at
+    
+    def _retrieve(self, request):
+        """Build the car detail response"""
         instance = self.get_object()
         serializer = self.get_serializer(instance)
         
@@ -114,15 +183,71 @@ class CarViewSet(viewsets.ModelViewSet):
         
         return success_response(data=response_data)
     
-    def _handle_images(self, car, images):
-        """Helper to handle uploaded images"""
-        if images:
-            for index, image in enumerate(images):
-                CarImage.objects.create(
-                    car=car,
-                    image=image,
-                    is_primary=(index == 0)
-                )
+    @action(detail=True, methods=['get'], permission_classes=[AllowAny])
+    def related(self, request, pk=None):
+        """Get related cars (cached)"""
+        return cached_catalog_response(
+            request, 'cars:related',
+            lambda: self._related(request),
+            pk, request.query_params.get('limit', '')
+        )
+    
+    def _related(self, request):
+        """Build the related cars response"""
+        try:
+            limit = int(request.query_params.get('limit', 6))
+        except ValueError:
+            return error_response(message="limit must be an integer")
+        
+        instance = self.get_object()
+        related_cars = CarService.get_related_cars(instance, limit=limit)
+        serializer = CarListSerializer(related_cars, many=True, context={'request': request})
+        return success_response(data=serializer.data)
+    
+    def _save_car(self, serializer, uploads):
+        """
+        Save the car, its features and its uploaded images as one atomic unit
+        Image files are written before the commit and removed again on rollback;
+        the saved car carries its images and features for the response
+        """
+        storage = CarImage._meta.get_field('image').storage
+        is_new = serializer.instance is None
+        saved_files = []
+        try:
+            with transaction.atomic():
+                car = serializer.save()
+                images = self._handle_images(car, uploads, saved_files)
+                if is_new:
+                    set_prefetched(car, 'images', images)
+                elif images:
+                    # Existing images come from the prefetch done by get_object
+                    set_prefetched(car, 'images', list(car.images.all()) + images)
+                
+                if images:
+                    # bulk_create sends no signals
+                    ImageService.schedule([image.pk for image in images])
+                    SyncService.schedule_cars([car.pk])
+        except Exception:
+            for name in saved_files:
+                storage.delete(name)
+            raise
+        return car
+    
+    def _handle_images(self, car, uploads, saved_files):
+        """Store uploaded image files and insert their rows in one batch"""
+        if not uploads:
+            return []
+        
+        field = CarImage._meta.get_field('image')
+        images = []
+        for index, upload in enumerate(uploads):
+            name = field.storage.save(field.generate_filename(None, upload.name), upload)
+            saved_files.append(name)
+            images.append(CarImage(car=car, image=name, is_primary=(index == 0)))
+        images = CarImage.objects.bulk_create(images)
+        sizes = [upload.size for upload in uploads]
+        transaction.on_commit(lambda: record_image_uploads(sizes, 'api'))
+        return images
 
     def create(self, request, *args, **kwargs):
         """Create a new car"""
@@ -140,14 +265,10 @@ class CarViewSet(viewsets.ModelViewSet):
 
         serializer = self.get_serializer(data=data)
         if serializer.is_valid():
-            car = serializer.save()
-            
-            # Handle uploaded images
-            images = request.FILES.getlist('uploaded_images')
-            self._handle_images(car, images)
+            self._save_car(serializer, request.FILES.getlist('uploaded_images'))
             
             return success_response(
-                data=CarSerializer(car, context={'request': request}).data,
+                data=serializer.data,
                 message=Messages.CAR_CREATED,
                 status_code=status.HTTP_201_CREATED
             )
@@ -175,15 +296,10 @@ class CarViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(instance, data=data, partial=partial)
         
         if serializer.is_valid():
-            car = serializer.save()
-            
-            # Handle uploaded images if provided
-            images = request.FILES.getlist('uploaded_images')
-            if images:
-                self._handle_images(car, images)
+            self._save_car(serializer, request.FILES.getlist('uploaded_images'))
             
             return success_response(
-                data=CarSerializer(car, context={'request': request}).data,
+                data=serializer.data,
                 message=Messages.CAR_UPDATED
             )
         return error_response(
@@ -0,0 +1,53 @@
+"""
+Car Import Views
+"""
+import zipfile
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes, parser_classes
+from rest_framework.parsers import MultiPartParser, FormParser
+from core.permissions import IsAdmin
+from core.responses import success_response, error_response
+from common.constants import Messages
+from services.import_service import ImportService
+
+
+@api_view(['POST'])
+@permission_classes([IsAdmin])
+@parser_classes([MultiPartParser, FormParser])
+def import_cars(request):
+    """
+    Bulk import cars from a CSV or JSON Lines upload (admin only)
+    Multipart fields: `file`, optional `images` (zip), `format`,
+    `create_manufacturers` and `dry_run`
+    """
+    upload = request.FILES.get('file')
+    if upload is None:
+        return error_response(
+            message="file is required",
+            status_code=status.HTTP_400_BAD_REQUEST
+        )
+    
+    file_format = request.data.get('format') or ImportService.detect_format(upload.name)
+    if file_format not in ImportService.FORMATS:
+        return error_response(
+            message="format must be csv or jsonl",
+            status_code=status.HTTP_400_BAD_REQUEST
+        )
+    
+    try:
+        report = ImportService.import_cars(
+            upload.file,
+            file_format,
+            images_zip=request.FILES.get('images'),
+            create_manufacturers=str(request.data.get('create_manufacturers', '')).lower() == 'true',
+            dry_run=str(request.data.get('dry_run', '')).lower() == 'true'
+        )
+    except zipfile.BadZipFile as e:
+        # Raised when the archive is opened, before any chunk is written
+        return error_response(
+            message=str(e),
+            status_code=status.HTTP_400_BAD_REQUEST
+        )
+    
+    message = Messages.SUCCESS if not report['failed'] else f"{report['failed']} rows could not be imported"
+    return success_response(data=report, message=message)
@@ -6,7 +6,8 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from core.permissions import IsAdmin
 from core.responses import success_response, error_response, created_response
-from common.constants import Messages
+from core.conditional import conditional_response, make_etag
+from common.constants import Messages, CacheControl
 from services.car_service import CarService
 from apps.cars.serializers import RecentlySoldSerializer
 
@@ -17,9 +18,17 @@ def recently_sold_list(request):
     """Get recently sold cars"""
     try:
         limit = int(request.query_params.get('limit', 10))
-        recently_sold = CarService.get_recently_sold(limit=limit)
-        serializer = RecentlySoldSerializer(recently_sold, many=True)
-        return success_response(data=serializer.data)
+        version = CarService.get_recently_sold_version()
+        last_modified = version['last_modified']
+        return conditional_response(
+            request,
+            lambda: success_response(
+                data=RecentlySoldSerializer(CarService.get_recently_sold(limit=limit), many=True).data
+            ),
+            etag=make_etag('recently-sold', limit, version['count'], last_modified and last_modified.isoformat()),
+            last_modified=last_modified,
+            cache_control=CacheControl.RECENTLY_SOLD
+        )
     except Exception as e:
         return error_response(message=str(e))
 
@@ -6,7 +6,8 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from core.permissions import IsAdmin
 from core.responses import success_response, error_response
-from common.constants import Messages
+from core.conditional import conditional_response, make_etag
+from common.constants import Messages, CacheControl
 from services.settings_service import SettingsService
 from apps.cars.serializers import DealershipSettingsSerializer
 
@@ -17,8 +18,13 @@ def dealership_settings_detail(request):
     """Get dealership settings"""
     try:
         settings = SettingsService.get_settings()
-        serializer = DealershipSettingsSerializer(settings)
-        return success_response(data=serializer.data)
+        return conditional_response(
+            request,
+            lambda: success_response(data=DealershipSettingsSerializer(settings).data),
+            etag=make_etag('settings', settings.updated_at.isoformat()),
+            last_modified=settings.updated_at,
+            cache_control=CacheControl.SETTINGS
+        )
     except Exception as e:
         return error_response(
             message=Messages.NOT_FOUND,
@@ -31,7 +37,7 @@ def dealership_settings_detail(request):
 def dealership_settings_update(request):
     """Update dealership settings (admin only)"""
     try:
-        settings = SettingsService.get_settings()
+        settings = SettingsService.get_settings(cached=False)
         serializer = DealershipSettingsSerializer(
             settings,
             data=request.data,
@@ -0,0 +1,39 @@
+"""
+Monitoring Admin Configuration
+"""
+from django.contrib import admin
+from .models import SlowQuery
+
+
+@admin.register(SlowQuery)
+class SlowQueryAdmin(admin.ModelAdmin):
+    list_display = ['created_at', 'duration_ms', 'route', 'short_sql', 'vendor', 'analyzed']
+    list_filter = ['vendor', 'analyzed', 'route', 'created_at']
+    search_fields = ['sql', 'route', 'path', 'origin', 'fingerprint']
+    date_hierarchy = 'created_at'
+    
+    fieldsets = (
+        ('Query', {
+            'fields': ('sql', 'params', 'fingerprint', 'duration_ms')
+        }),
+        ('Source', {
+            'fields': ('database', 'vendor', 'route', 'path', 'origin')
+        }),
+        ('Plan', {
+            'fields': ('plan', 'analyzed')
+        }),
+        ('Timestamps', {
+            'fields': ('created_at',)
+        }),
+    )
+    
+    @admin.display(description='SQL')
+    def short_sql(self, obj):
+        return obj.sql[:120]
+    
+    # Rows are written by the slow query log only
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
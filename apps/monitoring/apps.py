@@ -0,0 +1,17 @@
+"""
+Monitoring App Configuration
+"""
+from django.apps import AppConfig
+
+
+class MonitoringConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.monitoring'
+    verbose_name = 'Monitoring'
+    
+    def ready(self):
+        from django.db.backends.signals import connection_created
+        from apps.monitoring import checks, signals  # noqa: F401
+        from apps.monitoring.slow_queries import install_slow_query_log
+        
+        connection_created.connect(install_slow_query_log, dispatch_uid='monitoring.slow_queries')
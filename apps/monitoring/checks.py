@@ -0,0 +1,21 @@
+"""
+Monitoring System Checks
+"""
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+
+@register(Tags.security)
+def check_metrics_token(app_configs, **kwargs):
+    """
+    Outside DEBUG /metrics answers 404 until METRICS_TOKEN is set, so a
+    deployment without it silently loses its scrapes
+    """
+    if settings.DEBUG or settings.METRICS_TOKEN:
+        return []
+    
+    return [Warning(
+        'METRICS_TOKEN is not set, so /metrics is disabled',
+        hint='Set METRICS_TOKEN and scrape with "Authorization: Bearer <METRICS_TOKEN>".',
+        id='monitoring.W001',
+    )]
@@ -0,0 +1,90 @@
+"""
+Prometheus Metrics
+Metric definitions shared by the signal receivers and the /metrics view
+With PROMETHEUS_MULTIPROC_DIR set (gunicorn.conf.py sets it) every worker writes
+its samples to files in that directory and /metrics adds them up across workers
+"""
+import os
+import threading
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Histogram, multiprocess
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+# Label for requests that matched no URL pattern, so 404 probes add no new series
+UNMATCHED_ROUTE = '<unmatched>'
+
+METHODS = {'GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'}
+
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds', 'Request latency by route',
+    ['route', 'method']
+)
+RESPONSES = Counter(
+    'http_responses', 'Responses by route and status code',
+    ['route', 'method', 'status']
+)
+DB_QUERIES = Histogram(
+    'http_request_db_queries', 'SQL queries per request',
+    ['route'], buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, float('inf'))
+)
+DB_DURATION = Histogram(
+    'http_request_db_duration_seconds', 'SQL time per request',
+    ['route'], buckets=(.001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, float('inf'))
+)
+IMAGE_UPLOADS = Counter('image_uploads', 'Uploaded car images', ['source'])
+IMAGE_UPLOAD_BYTES = Counter('image_upload_bytes', 'Bytes of uploaded car images', ['source'])
+BOOKINGS_CREATED = Counter('bookings_created', 'Bookings created')
+ENQUIRIES_CREATED = Counter('enquiries_created', 'Enquiries created')
+SLOW_QUERIES = Counter('slow_queries', 'Queries over SLOW_QUERY_MS', ['route'])
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def record_request(route, method, status, data):
+    """Observe one measured request"""
+    route = route or UNMATCHED_ROUTE
+    method = method if method in METHODS else 'other'
+    REQUEST_LATENCY.labels(route, method).observe(data['total_ms'] / 1000)
+    RESPONSES.labels(route, method, str(status)).inc()
+    DB_QUERIES.labels(route).observe(data['queries'])
+    DB_DURATION.labels(route).observe(data['db_ms'] / 1000)
+
+
+def record_image_uploads(sizes, source):
+    """Count uploaded image files and their bytes; `source` is "api" or "import\""""
+    sizes = list(sizes)
+    if sizes:
+        IMAGE_UPLOADS.labels(source).inc(len(sizes))
+        IMAGE_UPLOAD_BYTES.labels(source).inc(sum(sizes))
+
+
+class CatalogCacheCollector:
+    """
+    Catalog cache hits and misses, read at scrape time
+    The counters live in the catalog cache itself, so they are already shared
+    between workers when that cache is
+    """
+    
+    def collect(self):
+        from services.catalog_cache_service import CatalogCacheService
+        
+        stats = CatalogCacheService.get_stats()
+        yield CounterMetricFamily('catalog_cache_hits', 'Catalog cache hits', value=stats['hits'])
+        yield CounterMetricFamily('catalog_cache_misses', 'Catalog cache misses', value=stats['misses'])
+        if stats['hit_ratio'] is not None:
+            yield GaugeMetricFamily('catalog_cache_hit_ratio', 'Catalog cache hit ratio', value=stats['hit_ratio'])
+
+
+def get_registry():
+    """Registry served by /metrics, built on first use"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+                registry = CollectorRegistry()
+                multiprocess.MultiProcessCollector(registry)
+            else:
+                registry = REGISTRY
+            registry.register(CatalogCacheCollector())
+            _registry = registry
+    return _registry
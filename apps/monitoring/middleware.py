@@ -0,0 +1,60 @@
+"""
+Monitoring Middleware
+"""
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import MiddlewareNotUsed
+
+PROFILE_HEADER = 'HTTP_X_PROFILE_TOKEN'
+PROFILE_PARAM = '_profile'
+MODES = ('cprofile', 'sample')
+TOKEN_SALT = 'monitoring.profile'
+
+
+class ProfilingMiddleware:
+    """
+    Run a single request under a profiler on demand
+    Switched on per request by a signed X-Profile-Token header or by
+    ?_profile=cprofile|sample from an admin. Other requests only pay for a
+    header and query string lookup; the profiler is imported on first use.
+    """
+    sync_capable = True
+    async_capable = True
+    
+    def __init__(self, get_response):
+        if not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed
+        
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+    
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not is_profile_requested(request):
+            return self.get_response(request)
+        
+        from apps.monitoring import profiling
+        return profiling.handle(request, self.get_response)
+    
+    async def __acall__(self, request):
+        if not is_profile_requested(request):
+            return await self.get_response(request)
+        
+        from apps.monitoring import profiling
+        # The whole request runs in one sync thread, so the profiler sees the
+        # view, serializer and database work that sync_to_async sends there
+        return await sync_to_async(profiling.handle)(request, self.get_response)
+
+
+def is_profile_requested(request):
+    """Cheap check for the profiling switch"""
+    return PROFILE_HEADER in request.META or f'{PROFILE_PARAM}=' in request.META.get('QUERY_STRING', '')
+
+
+def issue_profile_token(user, mode):
+    """Signed X-Profile-Token value letting `user` profile requests for PROFILE_TOKEN_MAX_AGE seconds"""
+    return signing.dumps({'user': user.pk, 'mode': mode}, salt=TOKEN_SALT)
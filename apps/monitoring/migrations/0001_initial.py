@@ -0,0 +1,38 @@
+# Generated by Django 5.2.10 on 2026-10-18 11:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlowQuery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sql', models.TextField()),
+                ('params', models.TextField(blank=True)),
+                ('fingerprint', models.CharField(db_index=True, max_length=40)),
+                ('duration_ms', models.FloatField()),
+                ('database', models.CharField(max_length=50)),
+                ('vendor', models.CharField(max_length=50)),
+                ('route', models.CharField(blank=True, db_index=True, max_length=200)),
+                ('path', models.CharField(blank=True, max_length=500)),
+                ('origin', models.CharField(blank=True, max_length=500)),
+                ('plan', models.TextField(blank=True)),
+                ('analyzed', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                'verbose_name': 'Slow Query',
+                'verbose_name_plural': 'Slow Queries',
+                'db_table': 'slow_queries',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,37 @@
+"""
+Slow Query Model
+"""
+from django.db import models
+
+
+class SlowQuery(models.Model):
+    """
+    A database query that ran longer than SLOW_QUERY_MS, with its plan
+    Parameters and plans are stored with customer details masked
+    """
+    sql = models.TextField()
+    params = models.TextField(blank=True)
+    fingerprint = models.CharField(max_length=40, db_index=True)
+    duration_ms = models.FloatField()
+    
+    # Where it ran
+    database = models.CharField(max_length=50)
+    vendor = models.CharField(max_length=50)
+    route = models.CharField(max_length=200, blank=True, db_index=True)
+    path = models.CharField(max_length=500, blank=True)
+    origin = models.CharField(max_length=500, blank=True)
+    
+    # EXPLAIN (or EXPLAIN ANALYZE) output
+    plan = models.TextField(blank=True)
+    analyzed = models.BooleanField(default=False)
+    
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    
+    class Meta:
+        db_table = 'slow_queries'
+        verbose_name = 'Slow Query'
+        verbose_name_plural = 'Slow Queries'
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"{self.duration_ms:.0f}ms {self.sql[:80]}"
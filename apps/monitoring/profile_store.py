@@ -0,0 +1,68 @@
+"""
+Profile Store
+Request profiles on disk: one JSON report per profiled request, plus the raw
+pstats dump for cProfile runs; only the newest PROFILE_KEEP are kept
+"""
+import json
+import re
+import secrets
+import time
+from pathlib import Path
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+PROFILE_ID = re.compile(r'^[0-9]+-[0-9a-f]{8}$')
+
+# Report fields shown in the profile list
+SUMMARY_FIELDS = ['id', 'created', 'mode', 'method', 'path', 'status', 'duration_ms', 'sql_count', 'user']
+
+
+def get_directory():
+    """Profile directory, created on first use"""
+    directory = Path(settings.PROFILE_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory
+
+
+def new_profile_id():
+    """Time-ordered unique profile id"""
+    return f'{int(time.time() * 1000)}-{secrets.token_hex(4)}'
+
+
+def raw_path(profile_id):
+    """Path of the pstats dump of a profile"""
+    return get_directory() / f'{profile_id}.prof'
+
+
+def save_profile(report):
+    """Write a report and drop the oldest profiles over PROFILE_KEEP"""
+    directory = get_directory()
+    (directory / f'{report["id"]}.json').write_text(json.dumps(report, cls=DjangoJSONEncoder))
+    
+    reports = sorted(directory.glob('*.json'), key=lambda path: path.stem, reverse=True)
+    for path in reports[settings.PROFILE_KEEP:]:
+        # Other workers may be rotating at the same time
+        path.unlink(missing_ok=True)
+        path.with_suffix('.prof').unlink(missing_ok=True)
+
+
+def list_profiles():
+    """Summaries of the stored profiles, newest first"""
+    summaries = []
+    for path in sorted(get_directory().glob('*.json'), key=lambda path: path.stem, reverse=True):
+        try:
+            report = json.loads(path.read_text())
+        except (OSError, ValueError):
+            continue
+        summaries.append({field: report.get(field) for field in SUMMARY_FIELDS})
+    return summaries
+
+
+def load_profile(profile_id):
+    """Full report of a profile, or None"""
+    if not PROFILE_ID.match(profile_id or ''):
+        return None
+    try:
+        return json.loads((get_directory() / f'{profile_id}.json').read_text())
+    except (OSError, ValueError):
+        return None
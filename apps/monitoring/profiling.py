@@ -0,0 +1,241 @@
+"""
+Request Profiling
+Deterministic (cProfile) and sampling profilers for single requests, with the
+SQL they ran; imported by ProfilingMiddleware only when a profile is requested
+"""
+import cProfile
+import io
+import logging
+import pstats
+import sys
+import sysconfig
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.conf import settings
+from django.core import signing
+from django.db import connections
+from django.utils import timezone
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from apps.monitoring import profile_store
+from apps.monitoring.middleware import MODES, PROFILE_HEADER, PROFILE_PARAM, TOKEN_SALT
+from core.permissions import IsAdmin
+
+logger = logging.getLogger(__name__)
+
+# Frames listed as hottest and kept in the call tree
+HOTTEST_LIMIT = 30
+TREE_MIN_SHARE = 0.01
+TREE_MAX_DEPTH = 60
+
+
+def authorize(request):
+    """
+    Return (mode, user id) when the request may be profiled, else None
+    A valid signed token needs no credentials on the request itself, so
+    anonymous (cached) paths can be profiled exactly as visitors get them;
+    the query flag is honoured for admins only
+    """
+    token = request.META.get(PROFILE_HEADER)
+    if token:
+        try:
+            payload = signing.loads(token, salt=TOKEN_SALT, max_age=settings.PROFILE_TOKEN_MAX_AGE)
+        except signing.BadSignature:
+            return None
+        return (payload['mode'], payload['user']) if payload.get('mode') in MODES else None
+    
+    mode = request.GET.get(PROFILE_PARAM)
+    if mode not in MODES:
+        return None
+    
+    drf_request = Request(request, authenticators=[auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES])
+    try:
+        if not IsAdmin().has_permission(drf_request, None):
+            return None
+    except APIException:
+        return None
+    return mode, drf_request.user.pk
+
+
+def handle(request, get_response):
+    """Serve the request, under a profiler when it is authorized to be profiled"""
+    if iscoroutinefunction(get_response):
+        get_response = async_to_sync(get_response)
+    
+    authorized = authorize(request)
+    if authorized is None:
+        return get_response(request)
+    mode, user_id = authorized
+    
+    report = {
+        'id': profile_store.new_profile_id(),
+        'created': timezone.now(),
+        'mode': mode,
+        'method': request.method,
+        'path': request.path,
+        'query': request.META.get('QUERY_STRING', ''),
+        'user': user_id,
+    }
+    queries = []
+    
+    def record_query(execute, sql, params, many, context):
+        # Statements only: parameters can hold customer details
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            queries.append({'sql': sql, 'duration_ms': round((time.perf_counter() - started) * 1000, 3)})
+    
+    profiler = CProfiler() if mode == 'cprofile' else StackSampler(settings.PROFILE_SAMPLE_INTERVAL_MS / 1000)
+    started = time.perf_counter()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(record_query))
+        profiler.start()
+        try:
+            response = get_response(request)
+        finally:
+            profiler.stop()
+    
+    report.update({
+        'status': response.status_code,
+        'duration_ms': round((time.perf_counter() - started) * 1000, 3),
+        'sql_count': len(queries),
+        'sql_ms': round(sum(query['duration_ms'] for query in queries), 3),
+        'sql': queries,
+    })
+    report.update(profiler.report())
+    try:
+        profiler.save_raw(profile_store.raw_path(report['id']))
+        profile_store.save_profile(report)
+    except OSError:
+        logger.exception('Could not store request profile %s', report['id'])
+        return response
+    
+    response['X-Profile-Id'] = report['id']
+    return response
+
+
+def frame_label(filename, line, name):
+    """Readable frame name with the project, site-packages or stdlib prefix removed"""
+    for prefix in (str(settings.BASE_DIR) + '/', 'site-packages/', sysconfig.get_paths()['stdlib'] + '/'):
+        if prefix in filename:
+            filename = filename.split(prefix, 1)[1]
+            break
+    return f'{filename}:{line}({name})'
+
+
+class CProfiler:
+    """Deterministic profile of every call made by the request thread"""
+    
+    def __init__(self):
+        self.profiler = cProfile.Profile()
+    
+    def start(self):
+        self.profiler.enable()
+    
+    def stop(self):
+        self.profiler.disable()
+    
+    def report(self):
+        """Hottest frames by own time and the pstats callee tree"""
+        stats = pstats.Stats(self.profiler)
+        entries = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)
+        hottest = [
+            {
+                'frame': frame_label(*function),
+                'self_ms': round(own_time * 1000, 3),
+                'total_ms': round(total_time * 1000, 3),
+                'calls': calls,
+            }
+            for function, (_, calls, own_time, total_time, _) in entries[:HOTTEST_LIMIT]
+        ]
+        
+        stream = io.StringIO()
+        pstats.Stats(self.profiler, stream=stream).strip_dirs().sort_stats('cumulative').print_callees(HOTTEST_LIMIT)
+        return {'hottest': hottest, 'call_tree': stream.getvalue()}
+    
+    def save_raw(self, path):
+        """Dump the stats for snakeviz, pstats and friends"""
+        self.profiler.dump_stats(str(path))
+
+
+class StackSampler:
+    """
+    Sampling profile of the request thread
+    Takes a stack snapshot every `interval` seconds from a helper thread, so
+    the request runs at close to full speed; stacks start below handle()
+    """
+    
+    def __init__(self, interval):
+        self.interval = interval
+        self.root = handle.__code__
+        self.thread_id = threading.get_ident()
+        self.stacks = Counter()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, name='request-sampler', daemon=True)
+    
+    def start(self):
+        self.thread.start()
+    
+    def stop(self):
+        self.stopped.set()
+        self.thread.join()
+    
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None and frame.f_code is not self.root:
+                code = frame.f_code
+                stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+                frame = frame.f_back
+            if stack:
+                self.stacks[tuple(reversed(stack))] += 1
+    
+    def report(self):
+        """Hottest frames by samples at the top of the stack, and the sampled call tree"""
+        total = sum(self.stacks.values())
+        own, inclusive = Counter(), Counter()
+        tree = {}
+        for stack, count in self.stacks.items():
+            own[stack[-1]] += count
+            for function in set(stack):
+                inclusive[function] += count
+            node = tree
+            for function in stack:
+                entry = node.setdefault(function, [0, {}])
+                entry[0] += count
+                node = entry[1]
+        
+        sample_ms = self.interval * 1000
+        hottest = [
+            {
+                'frame': frame_label(*function),
+                'self_ms': round(count * sample_ms, 3),
+                'total_ms': round(inclusive[function] * sample_ms, 3),
+                'samples': count,
+            }
+            for function, count in own.most_common(HOTTEST_LIMIT)
+        ]
+        
+        lines = [f'{total} samples every {sample_ms:g}ms']
+        self.render_tree(tree, total, 0, lines)
+        return {'hottest': hottest, 'call_tree': '\n'.join(lines)}
+    
+    def render_tree(self, node, total, depth, lines):
+        """Indented tree of the frames holding at least TREE_MIN_SHARE of the samples"""
+        if depth >= TREE_MAX_DEPTH:
+            return
+        for function, (count, children) in sorted(node.items(), key=lambda item: item[1][0], reverse=True):
+            if count < total * TREE_MIN_SHARE:
+                continue
+            lines.append(f'{count / total:6.1%}  {"  " * depth}{frame_label(*function)}')
+            self.render_tree(children, total, depth + 1, lines)
+    
+    def save_raw(self, path):
+        """Sampled profiles have no pstats dump"""
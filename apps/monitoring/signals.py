@@ -0,0 +1,30 @@
+"""
+Monitoring Signals
+Feed request measurements and lead creation into the Prometheus metrics
+"""
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from apps.monitoring.metrics import BOOKINGS_CREATED, ENQUIRIES_CREATED, record_request
+from apps.orders.models import Booking, Enquiry
+from core.instrumentation import request_measured
+
+
+@receiver(request_measured)
+def request_observed(sender, request, response, data, **kwargs):
+    """Observe latency, status and SQL of a finished request"""
+    record_request(data['route'], data['method'], data['status'], data)
+
+
+@receiver(post_save, sender=Booking)
+def booking_saved(sender, instance, created, **kwargs):
+    """Count new bookings once they are committed"""
+    if created:
+        transaction.on_commit(BOOKINGS_CREATED.inc)
+
+
+@receiver(post_save, sender=Enquiry)
+def enquiry_saved(sender, instance, created, **kwargs):
+    """Count new enquiries once they are committed"""
+    if created:
+        transaction.on_commit(ENQUIRIES_CREATED.inc)
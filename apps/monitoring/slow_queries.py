@@ -0,0 +1,224 @@
+"""
+Slow Query Log
+A database execute wrapper that records queries over SLOW_QUERY_MS with their
+EXPLAIN output, sampled and rate-limited per process
+"""
+import hashlib
+import json
+import logging
+import random
+import re
+import threading
+import time
+import traceback
+from collections import OrderedDict
+from django.conf import settings
+from django.db import transaction
+from core.instrumentation import current_metrics
+
+logger = logging.getLogger(__name__)
+
+# Tables holding customer details or credentials: every string parameter is masked
+SENSITIVE_TABLES = re.compile(r'"?\b(bookings|enquiries|auth_user|authtoken_token|admin_profiles)\b"?', re.IGNORECASE)
+EMAIL = re.compile(r'[^@\s\'"]+@[^@\s\'"]+\.[^@\s\'"]+')
+# Elsewhere only phone-shaped values are masked: international numbers starting
+# with + and grouped 3-3-4 numbers, so dates, times, prices and ids stay readable
+PHONE = re.compile(
+    r'(?<![\w.:/-])(?:\+\d[\d\s().-]{6,}\d|\(?\d{3}\)?[\s.-]\d{3}[\s.-]\d{4})(?![\w.:/-])'
+)
+STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+
+# Literals and IN lists collapsed when grouping queries by shape
+NUMBER = re.compile(r'\b\d+\b')
+PLACEHOLDER_LIST = re.compile(r'\((?:\s*%s\s*,)+\s*%s\s*\)')
+
+# Statements worth explaining; EXPLAIN ANALYZE re-runs them, so only reads get it
+EXPLAINABLE = ('SELECT', 'UPDATE', 'DELETE', 'INSERT', 'WITH')
+
+# Transaction control waits on locks rather than doing work of its own
+IGNORED = ('BEGIN', 'COMMIT', 'ROLLBACK', 'SAVEPOINT', 'RELEASE')
+
+# Fingerprints seen recently in this process (recorded at most once per window)
+RECENT_LIMIT = 1000
+
+_state = threading.local()
+_lock = threading.Lock()
+_recent = OrderedDict()
+_window = [0.0, 0]
+
+
+def record_slow_query(execute, sql, params, many, context):
+    """Database execute wrapper timing every query and logging the slow ones"""
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration_ms = (time.perf_counter() - started) * 1000
+        if duration_ms >= settings.SLOW_QUERY_MS and not getattr(_state, 'recording', False):
+            _state.recording = True
+            try:
+                capture(context['connection'], sql, params, many, duration_ms)
+            except Exception:
+                # The slow query log must never break the query it observes
+                logger.exception('Could not record a slow query')
+            finally:
+                _state.recording = False
+
+
+def install_slow_query_log(connection, **kwargs):
+    """Add the slow query wrapper to a database connection (once)"""
+    if settings.SLOW_QUERY_LOG_ENABLED and record_slow_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_slow_query)
+
+
+def fingerprint(sql):
+    """Hash of the statement shape, so the same query with other values groups together"""
+    shape = PLACEHOLDER_LIST.sub('(%s)', NUMBER.sub('0', sql))
+    return hashlib.sha1(' '.join(shape.split()).encode()).hexdigest()
+
+
+def statement_type(sql):
+    """First keyword of a statement, upper-cased"""
+    return sql.lstrip().split(None, 1)[0].upper() if sql.strip() else ''
+
+
+def should_capture(key):
+    """Apply the sample rate, the per-minute cap and the per-fingerprint window"""
+    if random.random() >= settings.SLOW_QUERY_SAMPLE_RATE:
+        return False
+    
+    now = time.monotonic()
+    with _lock:
+        if now - _window[0] >= 60:
+            _window[0], _window[1] = now, 0
+        if _window[1] >= settings.SLOW_QUERY_MAX_PER_MINUTE:
+            return False
+        
+        seen = _recent.get(key)
+        if seen is not None and now - seen < settings.SLOW_QUERY_REPEAT_INTERVAL:
+            return False
+        _recent[key] = now
+        _recent.move_to_end(key)
+        while len(_recent) > RECENT_LIMIT:
+            _recent.popitem(last=False)
+        _window[1] += 1
+    return True
+
+
+def mask_value(value, sensitive):
+    """Mask a parameter value: any string on sensitive tables, emails and phone numbers elsewhere"""
+    if isinstance(value, (list, tuple)):
+        return [mask_value(item, sensitive) for item in value]
+    if isinstance(value, dict):
+        return {key: mask_value(item, sensitive) for key, item in value.items()}
+    if isinstance(value, bytes):
+        return '<bytes>'
+    if not isinstance(value, str):
+        return value
+    if sensitive:
+        return '***'
+    return PHONE.sub('***', EMAIL.sub('***@***', value))
+
+
+def mask_text(text, sensitive):
+    """Mask literals in plan output the same way as parameters"""
+    if sensitive:
+        text = STRING_LITERAL.sub("'***'", text)
+    return PHONE.sub('***', EMAIL.sub('***@***', text))
+
+
+def explain(connection, sql, params):
+    """
+    EXPLAIN the statement on its own connection; returns (plan, analyzed)
+    Runs inside a savepoint when in a transaction, so a failing EXPLAIN
+    cannot abort the caller's transaction
+    """
+    statement = statement_type(sql)
+    if statement not in EXPLAINABLE or not connection.features.supports_explaining_query_execution:
+        return '', False
+    
+    analyze = settings.SLOW_QUERY_EXPLAIN_ANALYZE and statement == 'SELECT' and connection.vendor == 'postgresql'
+    options = {'analyze': True, 'buffers': True} if analyze else {}
+    prefix = connection.ops.explain_query_prefix(**options)
+    
+    def run():
+        with connection.cursor() as cursor:
+            cursor.execute(f'{prefix} {sql}', params)
+            return cursor.fetchall()
+    
+    if connection.in_atomic_block:
+        with transaction.atomic(using=connection.alias):
+            rows = run()
+    else:
+        rows = run()
+    
+    if connection.vendor == 'sqlite':
+        # (id, parent, notused, detail)
+        lines = [row[-1] for row in rows]
+    else:
+        lines = [' '.join(str(column) for column in row) for row in rows]
+    return '\n'.join(lines), analyze
+
+
+def find_origin():
+    """Innermost project frame outside Django and this module that issued the query"""
+    base_dir = str(settings.BASE_DIR)
+    for frame in reversed(traceback.extract_stack()):
+        if frame.filename.startswith(base_dir) and '/site-packages/' not in frame.filename \
+                and not frame.filename.endswith('slow_queries.py'):
+            return f'{frame.filename[len(base_dir) + 1:]}:{frame.lineno} in {frame.name}'
+    return ''
+
+
+def capture(connection, sql, params, many, duration_ms):
+    """Record one slow query if sampling and rate limits allow"""
+    if statement_type(sql) in IGNORED:
+        return
+    
+    key = fingerprint(sql)
+    if not should_capture(key):
+        return
+    
+    from apps.monitoring.metrics import SLOW_QUERIES
+    from apps.monitoring.models import SlowQuery
+    
+    metrics = current_metrics()
+    request = metrics.request if metrics is not None else None
+    match = getattr(request, 'resolver_match', None)
+    route = match.view_name if match else ''
+    sensitive = bool(SENSITIVE_TABLES.search(sql))
+    
+    plan, analyzed = '', False
+    if not many:
+        try:
+            plan, analyzed = explain(connection, sql, params)
+        except Exception as exc:
+            plan = f'EXPLAIN failed: {exc}'
+    
+    # executemany parameter sets may be a one-shot iterator, so they are not read
+    masked = '<executemany>' if many else mask_value(params or [], sensitive)
+    slow_query = SlowQuery(
+        sql=sql,
+        params=json.dumps(masked, default=str)[:10000],
+        fingerprint=key,
+        duration_ms=round(duration_ms, 3),
+        database=connection.alias,
+        vendor=connection.vendor,
+        route=route[:200],
+        path=request.path[:500] if request is not None else '',
+        origin=find_origin()[:500],
+        plan=mask_text(plan, sensitive),
+        analyzed=analyzed,
+    )
+    SLOW_QUERIES.labels(route or 'none').inc()
+    logger.warning('slow query %.1fms route=%s fingerprint=%s', duration_ms, route or '-', key)
+    
+    def save():
+        _state.recording = True
+        try:
+            slow_query.save(using=connection.alias)
+        finally:
+            _state.recording = False
+    
+    # Written once the caller's transaction commits (immediately in autocommit)
+    transaction.on_commit(save, using=connection.alias, robust=True)
@@ -0,0 +1,15 @@
+"""
+Monitoring URL Configuration
+"""
+from django.urls import path
+from . import views
+
+app_name = 'monitoring'
+
+urlpatterns = [
+    # Request profiles
+    path('profile-token/', views.profile_token, name='profile-token'),
+    path('profiles/', views.profile_list, name='profile-list'),
+    path('profiles/<str:profile_id>/', views.profile_detail, name='profile-detail'),
+    path('profiles/<str:profile_id>/download/', views.profile_download, name='profile-download'),
+]
@@ -0,0 +1,85 @@
+"""
+Monitoring Views
+"""
+import hmac
+from django.conf import settings
+from django.http import FileResponse, HttpResponse
+from django.views.decorators.http import require_GET
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from core.permissions import IsAdmin
+from core.responses import success_response, error_response
+from common.constants import CacheControl, Messages
+from apps.monitoring import profile_store
+from apps.monitoring.metrics import get_registry
+from apps.monitoring.middleware import MODES, issue_profile_token
+
+
+@require_GET
+def metrics(request):
+    """
+    Prometheus metrics in the text exposition format
+    Requires "Authorization: Bearer <METRICS_TOKEN>"; without a token the
+    endpoint is only open in DEBUG
+    """
+    token = settings.METRICS_TOKEN
+    if not token and not settings.DEBUG:
+        return HttpResponse(status=404)
+    if token:
+        supplied = request.headers.get('Authorization', '')
+        if not hmac.compare_digest(supplied.encode(), f'Bearer {token}'.encode()):
+            return HttpResponse(status=401, headers={'WWW-Authenticate': 'Bearer'})
+    
+    return HttpResponse(
+        generate_latest(get_registry()),
+        content_type=CONTENT_TYPE_LATEST,
+        headers={'Cache-Control': CacheControl.NO_STORE}
+    )
+
+
+@api_view(['POST'])
+@permission_classes([IsAdmin])
+def profile_token(request):
+    """Issue a signed X-Profile-Token header value (admin only)"""
+    mode = request.data.get('mode', 'cprofile')
+    if mode not in MODES:
+        return error_response(message=f'mode must be one of: {", ".join(MODES)}')
+    
+    return success_response(data={
+        'header': 'X-Profile-Token',
+        'token': issue_profile_token(request.user, mode),
+        'mode': mode,
+        'expires_in': settings.PROFILE_TOKEN_MAX_AGE,
+    })
+
+
+@api_view(['GET'])
+@permission_classes([IsAdmin])
+def profile_list(request):
+    """List stored request profiles, newest first (admin only)"""
+    return success_response(data=profile_store.list_profiles())
+
+
+@api_view(['GET'])
+@permission_classes([IsAdmin])
+def profile_detail(request, profile_id):
+    """Get a stored profile: hottest frames, call tree and SQL (admin only)"""
+    report = profile_store.load_profile(profile_id)
+    if report is None:
+        return error_response(message=Messages.NOT_FOUND, status_code=status.HTTP_404_NOT_FOUND)
+    return success_response(data=report)
+
+
+@api_view(['GET'])
+@permission_classes([IsAdmin])
+def profile_download(request, profile_id):
+    """Download the pstats dump of a cProfile profile (admin only)"""
+    if profile_store.load_profile(profile_id) is None or not profile_store.raw_path(profile_id).exists():
+        return error_response(message=Messages.NOT_FOUND, status_code=status.HTTP_404_NOT_FOUND)
+    return FileResponse(
+        profile_store.raw_path(profile_id).open('rb'),
+        as_attachment=True,
+        filename=f'{profile_id}.prof',
+        content_type='application/octet-stream'
+    )
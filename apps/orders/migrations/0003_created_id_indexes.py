@@ -0,0 +1,21 @@
+# Generated by Django 5.2.10 on 2026-10-18 10:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0002_enquiry'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['-created_at', '-id'], name='bookings_created_id'),
+        ),
+        migrations.AddIndex(
+            model_name='enquiry',
+            index=models.Index(fields=['-created_at', '-id'], name='enquiries_created_id'),
+        ),
+    ]
@@ -49,6 +49,10 @@ class Booking(models.Model):
         verbose_name = 'Booking'
         verbose_name_plural = 'Bookings'
         ordering = ['-created_at']
+        indexes = [
+            # Seek index for keyset pagination on (created_at, id)
+            models.Index(fields=['-created_at', '-id'], name='bookings_created_id'),
+        ]
     
     def __str__(self):
         return f"{self.car_name} - {self.customer_name} ({self.date})"
@@ -105,6 +109,10 @@ class Enquiry(models.Model):
         verbose_name = 'Enquiry'
         verbose_name_plural = 'Enquiries'
         ordering = ['-created_at']
+        indexes = [
+            # Seek index for keyset pagination on (created_at, id)
+            models.Index(fields=['-created_at', '-id'], name='enquiries_created_id'),
+        ]
     
     def __str__(self):
         return f"{self.customer_name} - {self.car} ({self.get_status_display()})"
@@ -4,9 +4,10 @@ Booking Serializers
 from rest_framework import serializers
 from .models import Booking, Enquiry
 from apps.cars.serializers import CarListSerializer
+from core.instrumentation import TimedSerializerMixin
 
 
-class BookingSerializer(serializers.ModelSerializer):
+class BookingSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Serializer for Booking model"""
     car_details = CarListSerializer(source='car', read_only=True)
     
@@ -29,7 +30,7 @@ class BookingSerializer(serializers.ModelSerializer):
         return data
 
 
-class EnquirySerializer(serializers.ModelSerializer):
+class EnquirySerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Serializer for Enquiry model"""
     car_details = CarListSerializer(source='car', read_only=True)
     car_name = serializers.SerializerMethodField(read_only=True)
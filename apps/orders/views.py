@@ -1,23 +1,46 @@
 """
 Booking Views
 """
+from django.utils import timezone
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.permissions import AllowAny
 from core.permissions import IsAdmin
+from core.renderers import CSVStreamRenderer, NDJSONStreamRenderer, FormatParamNegotiation, JSONErrorsMixin
 from core.responses import success_response, error_response, created_response
-from common.constants import Messages
-from .models import Booking, Enquiry
+from core.streaming import is_async_request
+from common.constants import Messages, BookingStatus
+from services.export_service import ExportService
+from .models import Booking, Enquiry, EnquiryStatus
 from .serializers import BookingSerializer, BookingCreateSerializer, EnquirySerializer
 
 
-class BookingViewSet(viewsets.ModelViewSet):
+def export_response(request, queryset, columns, status_choices, name):
+    """
+    Stream a filtered lead export in the negotiated format
+    `?format=csv` (default) or `?format=ndjson`
+    """
+    try:
+        queryset = ExportService.filter_leads(queryset, request.query_params, status_choices)
+    except ValueError as e:
+        return error_response(message=str(e), status_code=status.HTTP_400_BAD_REQUEST)
+    
+    filename = f'{name}-{timezone.localdate():%Y%m%d}'
+    return request.accepted_renderer.streaming_response(
+        ExportService.headers(columns),
+        ExportService.iter_rows(queryset, columns),
+        filename,
+        asynchronous=is_async_request(request)
+    )
+
+
+class BookingViewSet(JSONErrorsMixin, viewsets.ModelViewSet):
     """
     ViewSet for Booking model
     List/retrieve bookings require admin auth
     Create booking is public
     """
-    queryset = Booking.objects.all()
+    queryset = Booking.objects.select_related('car', 'car__manufacturer').prefetch_related('car__images')
     serializer_class = BookingSerializer
     
     def get_permissions(self):
@@ -50,6 +73,15 @@ class BookingViewSet(viewsets.ModelViewSet):
             status_code=status.HTTP_400_BAD_REQUEST
         )
     
+    @action(detail=False, methods=['get'], permission_classes=[IsAdmin],
+            renderer_classes=[CSVStreamRenderer, NDJSONStreamRenderer],
+            content_negotiation_class=FormatParamNegotiation)
+    def export(self, request):
+        """Stream bookings as CSV or NDJSON, filtered by created date range and status (admin only)"""
+        return export_response(
+            request, Booking.objects.all(), ExportService.BOOKING_COLUMNS, BookingStatus.CHOICES, 'bookings'
+        )
+    
     @action(detail=True, methods=['patch'], permission_classes=[IsAdmin])
     def update_status(self, request, pk=None):
         """Update booking status (admin only)"""
@@ -72,12 +104,12 @@ class BookingViewSet(viewsets.ModelViewSet):
         )
 
 
-class EnquiryViewSet(viewsets.ModelViewSet):
+class EnquiryViewSet(JSONErrorsMixin, viewsets.ModelViewSet):
     """
     ViewSet for Enquiry model
     Create is public, list/retrieve/update require admin
     """
-    queryset = Enquiry.objects.select_related('car', 'car__manufacturer').all()
+    queryset = Enquiry.objects.select_related('car', 'car__manufacturer').prefetch_related('car__images')
     serializer_class = EnquirySerializer
     
     def get_permissions(self):
@@ -103,6 +135,15 @@ class EnquiryViewSet(viewsets.ModelViewSet):
             status_code=status.HTTP_400_BAD_REQUEST
         )
     
+    @action(detail=False, methods=['get'], permission_classes=[IsAdmin],
+            renderer_classes=[CSVStreamRenderer, NDJSONStreamRenderer],
+            content_negotiation_class=FormatParamNegotiation)
+    def export(self, request):
+        """Stream enquiries as CSV or NDJSON, filtered by created date range and status (admin only)"""
+        return export_response(
+            request, Enquiry.objects.all(), ExportService.ENQUIRY_COLUMNS, EnquiryStatus.CHOICES, 'enquiries'
+        )
+    
     @action(detail=True, methods=['patch'], permission_classes=[IsAdmin])
     def update_status(self, request, pk=None):
         """Update enquiry status (admin only)"""
@@ -89,3 +89,15 @@ class Messages:
     CAR_CREATED = "Car added successfully"
     CAR_UPDATED = "Car updated successfully"
     CAR_DELETED = "Car deleted successfully"
+
+# Cache-Control per read endpoint; shared caches revalidate with ETag / Last-Modified
+class CacheControl:
+    CATALOG = 'public, max-age=60, stale-while-revalidate=30'
+    CAR_DETAIL = 'public, max-age=60, stale-while-revalidate=30'
+    SETTINGS = 'public, max-age=300'
+    RECENTLY_SOLD = 'public, max-age=300'
+    PRIVATE = 'private, no-cache'
+    NO_STORE = 'no-store'
+    # Uploaded files; content-hashed names (renditions) never change
+    MEDIA = 'public, max-age=86400'
+    MEDIA_IMMUTABLE = 'public, max-age=31536000, immutable'
@@ -2,6 +2,7 @@
 Common Utility Functions
 """
 import re
+from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 
@@ -91,10 +92,30 @@ def format_currency(amount):
 def get_client_ip(request):
     """
     Get client IP address from request
+    The address is taken NUM_PROXIES hops from the end of X-Forwarded-For (the
+    entry our own proxy appended), so clients cannot pick their own address by
+    sending the header; with no proxies it is REMOTE_ADDR
     """
     x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-    if x_forwarded_for:
-        ip = x_forwarded_for.split(',')[0]
+    num_proxies = settings.NUM_PROXIES
+    if x_forwarded_for and num_proxies > 0:
+        addresses = x_forwarded_for.split(',')
+        ip = addresses[-min(num_proxies, len(addresses))].strip()
     else:
         ip = request.META.get('REMOTE_ADDR')
     return ip
+
+
+def set_prefetched(instance, relation, objects):
+    """
+    Store already loaded related objects as the prefetched result of a
+    reverse relation, so serializers read them without another query
+    """
+    manager = getattr(instance, relation)
+    queryset = manager.model._default_manager.filter(**{manager.field.name: instance})
+    queryset._result_cache = list(objects)
+    queryset._prefetch_done = True
+    
+    if not hasattr(instance, '_prefetched_objects_cache'):
+        instance._prefetched_objects_cache = {}
+    instance._prefetched_objects_cache[relation] = queryset
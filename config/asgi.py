@@ -9,8 +9,22 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 
 import os
 
+from asgiref.wsgi import WsgiToAsgi
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from config.static import with_static_files  # noqa: E402  (needs the settings loaded)
+
+# Collected static files are answered before Django, so every other request
+# runs through a middleware chain that is async end to end
+static_files = with_static_files(None)
+serve_static_file = WsgiToAsgi(static_files)
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'http' and scope['path'] in static_files.files:
+        return await serve_static_file(scope, receive, send)
+    return await django_application(scope, receive, send)
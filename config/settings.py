@@ -3,7 +3,9 @@ Django settings for Elite Motors Car Reseller Backend
 """
 
 import os
+import tempfile
 import dj_database_url
+from datetime import timedelta
 from pathlib import Path
 from decouple import config
 
@@ -55,12 +57,14 @@ INSTALLED_APPS = [
     'apps.accounts',
     'apps.cars',
     'apps.orders',
+    'apps.monitoring',
 ]
 
 MIDDLEWARE = [
+    'core.instrumentation.RequestMetricsMiddleware',  # Outermost, so its total covers the whole stack
+    'apps.monitoring.middleware.ProfilingMiddleware',
     'corsheaders.middleware.CorsMiddleware',  # Must be at the top
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',  # Added for static files
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -88,11 +92,27 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'config.wsgi.application'
+ASGI_APPLICATION = 'config.asgi.application'
 
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Production PostgreSQL connections come from a psycopg pool shared by the threads of each
+# worker. Under ASGI every request runs its sync code in a new thread, so
+# persistent per-thread connections would never be reused. PostgreSQL must allow
+# WEB_CONCURRENCY x DB_POOL_MAX_SIZE connections; a request waits up to
+# DB_POOL_TIMEOUT seconds for a free one
+DB_POOL = os.getenv('DB_POOL', 'True') == 'True'
+DB_POOL_MIN_SIZE = int(os.getenv('DB_POOL_MIN_SIZE', 2))
+DB_POOL_MAX_SIZE = int(os.getenv('DB_POOL_MAX_SIZE', 10))
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 10))
+# Without the pool (e.g. behind PgBouncer) connections persist this many seconds
+DB_CONN_MAX_AGE = int(os.getenv('DB_CONN_MAX_AGE', 60))
+# Check a reused connection before handing it out, so one dropped by a failover
+# or an idle timeout is replaced instead of failing the request
+DB_HEALTH_CHECKS = os.getenv('DB_HEALTH_CHECKS', 'True') == 'True'
+
 if DEBUG:
     DATABASES = {
         'default': {
@@ -103,9 +123,34 @@ if DEBUG:
 else:
     DATABASES = {
         'default': dj_database_url.config(
-            default=config('DATABASE_URL')
+            default=config('DATABASE_URL'),
+            conn_max_age=0 if DB_POOL else DB_CONN_MAX_AGE,
+            conn_health_checks=DB_HEALTH_CHECKS,
         )
     }
+    if DB_POOL and DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql':
+        DATABASES['default'].setdefault('OPTIONS', {})['pool'] = {
+            'min_size': DB_POOL_MIN_SIZE,
+            'max_size': DB_POOL_MAX_SIZE,
+            'timeout': DB_POOL_TIMEOUT,
+        }
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Use a shared backend (e.g. Redis or Memcached) in production so every worker sees the same
+# entries; gunicorn.conf.py refuses more than one worker on the process-local default
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'elite-motors'),
+    }
+}
+
+# Cache alias and lifetime for public catalog responses (cars, manufacturers)
+CATALOG_CACHE_ALIAS = os.getenv('CATALOG_CACHE_ALIAS', 'default')
+CATALOG_CACHE_TIMEOUT = int(os.getenv('CATALOG_CACHE_TIMEOUT', 60 * 60))
 
 
 # Password validation
@@ -149,6 +194,15 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# How /media/ files are served: "django" streams them from the worker (sendfile,
+# byte ranges), "x-accel" (nginx) and "x-sendfile" (Apache, lighttpd) hand them to
+# the front proxy; nginx needs an internal location at MEDIA_ACCEL_PREFIX aliasing MEDIA_ROOT
+MEDIA_SERVE_MODE = os.getenv('MEDIA_SERVE_MODE', 'django')
+MEDIA_ACCEL_PREFIX = os.getenv('MEDIA_ACCEL_PREFIX', '/protected-media/')
+
+# Background workers resizing uploaded car photos (0 = resize inline after commit)
+IMAGE_RENDITION_WORKERS = int(os.getenv('IMAGE_RENDITION_WORKERS', 2))
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -158,15 +212,102 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 if not DEBUG:
     STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
+# API authentication
+# token: opaque tokens, resolved with one joined query and cached for AUTH_CACHE_TIMEOUT seconds
+# jwt: signed stateless access tokens that need no auth queries; logout goes to a cache deny-list
+# Revocations (logout, token deletion, password changes) are written to AUTH_CACHE_ALIAS and only
+# reach the workers that share it: with a process-local cache a revoked opaque token keeps working
+# in other workers for AUTH_CACHE_TIMEOUT seconds and a logged-out JWT for its whole lifetime, so
+# jwt mode refuses to start (check accounts.E001) without a shared cache when DEBUG is off
+AUTH_TOKEN_MODE = os.getenv('AUTH_TOKEN_MODE', 'token')
+AUTH_CACHE_ALIAS = os.getenv('AUTH_CACHE_ALIAS', 'default')
+AUTH_CACHE_TIMEOUT = int(os.getenv('AUTH_CACHE_TIMEOUT', 60))
+
+SIMPLE_JWT = {
+    'ACCESS_TOKEN_LIFETIME': timedelta(minutes=int(os.getenv('AUTH_JWT_LIFETIME_MINUTES', 12 * 60))),
+    'SIGNING_KEY': SECRET_KEY,
+    # The frontend sends "Token <key>"; both header types are accepted
+    'AUTH_HEADER_TYPES': ('Bearer', 'Token'),
+    'UPDATE_LAST_LOGIN': False,
+}
+
+# Token-bucket throttling of the login and register endpoints ("burst/period", refilled
+# at that rate); AUTH_THROTTLE_BACKEND=cache shares the buckets between workers
+AUTH_THROTTLE_BACKEND = os.getenv('AUTH_THROTTLE_BACKEND', 'memory')
+AUTH_THROTTLE_CACHE_ALIAS = os.getenv('AUTH_THROTTLE_CACHE_ALIAS', 'default')
+AUTH_THROTTLE_RATES = {
+    'auth_ip': os.getenv('AUTH_THROTTLE_IP_RATE', '20/min'),
+    'auth_account': os.getenv('AUTH_THROTTLE_ACCOUNT_RATE', '5/min'),
+}
+
+# Reverse proxies in front of the app; client IPs are read that many hops from the
+# end of X-Forwarded-For, and 0 uses REMOTE_ADDR. Defaults to Railway's one proxy in
+# production and to no proxy under DEBUG; the client-controlled first entry is never used
+NUM_PROXIES = int(os.getenv('NUM_PROXIES', 0 if DEBUG else 1))
+
+# Per-request instrumentation: query count and DB, serializer and render time as
+# Server-Timing headers and one log line per request; requests over either budget
+# are logged as warnings, the others at DEBUG (see REQUEST_LOG_LEVEL below)
+REQUEST_METRICS_ENABLED = os.getenv('REQUEST_METRICS_ENABLED', 'True') == 'True'
+SERVER_TIMING_HEADER = os.getenv('SERVER_TIMING_HEADER', 'True') == 'True'
+REQUEST_QUERY_BUDGET = int(os.getenv('REQUEST_QUERY_BUDGET', 20))
+REQUEST_DB_TIME_BUDGET_MS = float(os.getenv('REQUEST_DB_TIME_BUDGET_MS', 100))
+
+# Bearer token required to scrape /metrics; unset, the endpoint answers 404
+# unless DEBUG is on
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+
+# On-demand profiling of single requests by admins (X-Profile-Token header or
+# ?_profile=cprofile|sample); the newest PROFILE_KEEP profiles are kept in PROFILE_DIR
+PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', 'True') == 'True'
+PROFILE_DIR = os.getenv('PROFILE_DIR', os.path.join(tempfile.gettempdir(), 'elite-motors-profiles'))
+PROFILE_KEEP = int(os.getenv('PROFILE_KEEP', 50))
+PROFILE_TOKEN_MAX_AGE = int(os.getenv('PROFILE_TOKEN_MAX_AGE', 600))
+PROFILE_SAMPLE_INTERVAL_MS = float(os.getenv('PROFILE_SAMPLE_INTERVAL_MS', 1))
+
+# Slow query log: queries over SLOW_QUERY_MS are stored with their EXPLAIN output
+# (EXPLAIN ANALYZE for reads on Postgres when enabled, which runs them again),
+# sampled, at most SLOW_QUERY_MAX_PER_MINUTE per process and once per
+# SLOW_QUERY_REPEAT_INTERVAL seconds for the same statement shape
+SLOW_QUERY_LOG_ENABLED = os.getenv('SLOW_QUERY_LOG_ENABLED', 'True') == 'True'
+SLOW_QUERY_MS = float(os.getenv('SLOW_QUERY_MS', 200))
+SLOW_QUERY_SAMPLE_RATE = float(os.getenv('SLOW_QUERY_SAMPLE_RATE', 1.0))
+SLOW_QUERY_MAX_PER_MINUTE = int(os.getenv('SLOW_QUERY_MAX_PER_MINUTE', 30))
+SLOW_QUERY_REPEAT_INTERVAL = int(os.getenv('SLOW_QUERY_REPEAT_INTERVAL', 300))
+SLOW_QUERY_EXPLAIN_ANALYZE = os.getenv('SLOW_QUERY_EXPLAIN_ANALYZE', 'False') == 'True'
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'plain': {'format': '%(asctime)s %(levelname)s %(name)s %(message)s'},
+    },
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler', 'formatter': 'plain'},
+    },
+    'loggers': {
+        'core.instrumentation': {
+            'handlers': ['console'],
+            'level': os.getenv('REQUEST_LOG_LEVEL', 'INFO'),
+            'propagate': False,
+        },
+    },
+}
+
 # REST Framework Configuration
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'core.authentication.StatelessJWTAuthentication' if AUTH_TOKEN_MODE == 'jwt'
+        else 'core.authentication.CachedTokenAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.JSONRenderer',
+        'core.renderers.BrowsableAPIRenderer',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'core.pagination.StandardResultsSetPagination',
     'PAGE_SIZE': 100,
     'DATETIME_FORMAT': '%Y-%m-%dT%H:%M:%S.%fZ',
@@ -0,0 +1,22 @@
+"""
+Static files for the WSGI and ASGI entry points
+WhiteNoise wraps the Django application instead of sitting in its middleware
+stack: the middleware is sync-only, so under ASGI it would send every request
+through a thread.
+"""
+from django.conf import settings
+from whitenoise import WhiteNoise
+
+# Names written by the manifest storage, e.g. base.1a2b3c4d5e6f.css
+HASHED_STATIC_FILE = r'^.+\.[0-9a-f]{12}\..+$'
+
+
+def with_static_files(application):
+    """Serve collected static files (and their compressed variants) in front of `application`"""
+    return WhiteNoise(
+        application,
+        root=settings.STATIC_ROOT,
+        prefix=settings.STATIC_URL,
+        max_age=0 if settings.DEBUG else 60,
+        immutable_file_test=HASHED_STATIC_FILE,
+    )
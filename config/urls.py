@@ -5,7 +5,8 @@ from django.contrib import admin
 from django.urls import path, include, re_path
 from django.conf import settings
 from django.conf.urls.static import static
-from django.views.static import serve
+from core.media import serve_media
+from apps.monitoring import views as monitoring_views
 
 urlpatterns = [
     # Admin panel
@@ -15,8 +16,14 @@ urlpatterns = [
     path('api/v1/cars/', include('apps.cars.urls')),
     path('api/v1/accounts/', include('apps.accounts.urls')),
     path('api/v1/orders/', include('apps.orders.urls')),
+    
+    path('api/v1/monitoring/', include('apps.monitoring.urls')),
+    
+    # Prometheus scrape endpoint
+    path('metrics', monitoring_views.metrics, name='metrics'),
 
     # Serve media and static files in production
-    re_path(r'^media/(?P<path>.*)$', serve, {'document_root': settings.MEDIA_ROOT}),
-    re_path(r'^static/(?P<path>.*)$', serve, {'document_root': settings.STATIC_ROOT}),
+    re_path(r'^media/(?P<path>.*)$', serve_media, {'document_root': settings.MEDIA_ROOT}),
+    # WhiteNoise (config/static.py) serves collected static files first; this only catches the rest
+    re_path(r'^static/(?P<path>.*)$', serve_media, {'document_root': settings.STATIC_ROOT, 'offload': False}),
 ]
@@ -14,3 +14,7 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
 application = get_wsgi_application()
+
+from config.static import with_static_files  # noqa: E402  (needs the settings loaded)
+
+application = with_static_files(application)
@@ -0,0 +1,121 @@
+"""
+Custom Authentication for Elite Motors
+Token authentication without per-request queries: opaque tokens are resolved in
+one joined query and cached briefly; signed JWTs (AUTH_TOKEN_MODE=jwt) carry the
+admin claims themselves and never touch the database
+"""
+import hashlib
+import time
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.utils.functional import cached_property
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from apps.accounts.models import AdminProfile
+
+
+def get_auth_cache():
+    """Return the Django cache configured for authentication"""
+    return caches[settings.AUTH_CACHE_ALIAS]
+
+
+def token_cache_key(key):
+    """Cache key for an opaque token; the token itself never appears in the cache"""
+    return f"auth:token:{hashlib.sha256(key.encode('utf-8')).hexdigest()}"
+
+
+def revoke_token(key):
+    """Drop a cached opaque token so the next request re-checks the database"""
+    get_auth_cache().delete(token_cache_key(key))
+
+
+def revoke_user(user_id):
+    """
+    Invalidate every credential of a user
+    Cached opaque tokens are dropped; signed tokens issued before now are refused
+    """
+    cache = get_auth_cache()
+    cache.delete_many([token_cache_key(key) for key in Token.objects.filter(user_id=user_id).values_list('key', flat=True)])
+    cache.set(
+        f'auth:user:{user_id}:not_before',
+        int(time.time()),
+        timeout=int(jwt_settings.ACCESS_TOKEN_LIFETIME.total_seconds())
+    )
+
+
+def deny_jwt(token):
+    """Refuse a signed token until it expires (logout)"""
+    remaining = int(token['exp'] - time.time())
+    if remaining > 0:
+        get_auth_cache().set(f"auth:deny:{token['jti']}", True, timeout=remaining)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Token authentication resolving the token, its user and the admin profile in
+    one joined query, cached for AUTH_CACHE_TIMEOUT seconds
+    Logout, token deletion and user or profile changes drop the cached entry
+    """
+    
+    def authenticate_credentials(self, key):
+        cache = get_auth_cache()
+        cache_key = token_cache_key(key)
+        token = cache.get(cache_key)
+        if token is None:
+            try:
+                # A missing admin profile is cached as well, so permission checks never query
+                token = Token.objects.select_related('user__admin_profile').get(key=key)
+            except Token.DoesNotExist:
+                raise exceptions.AuthenticationFailed('Invalid token.')
+            cache.set(cache_key, token, timeout=settings.AUTH_CACHE_TIMEOUT)
+        
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed('User inactive or deleted.')
+        
+        return (token.user, token)
+
+
+class AdminTokenUser(TokenUser):
+    """Stateless user backed by a signed token carrying the admin claims"""
+    
+    @cached_property
+    def email(self):
+        return self.token.get('email', '')
+    
+    @cached_property
+    def admin_profile(self):
+        """Admin profile built from the claims; missing for tokens without a role"""
+        role = self.token.get('role')
+        if role is None:
+            raise AttributeError('admin_profile')
+        user = User(id=self.id, username=self.username, email=self.email)
+        return AdminProfile(user=user, role=role, display_name=self.token.get('display_name', ''))
+
+
+class StatelessJWTAuthentication(JWTStatelessUserAuthentication):
+    """
+    Signed access tokens validated without any database lookup
+    Logged out tokens and tokens issued before a user's credentials changed are
+    refused through short-lived cache entries
+    """
+    
+    def get_validated_token(self, raw_token):
+        token = super().get_validated_token(raw_token)
+        
+        user_id = token.get(jwt_settings.USER_ID_CLAIM)
+        deny_key, not_before_key = f"auth:deny:{token.get('jti')}", f'auth:user:{user_id}:not_before'
+        entries = get_auth_cache().get_many([deny_key, not_before_key])
+        if deny_key in entries or token.get('iat', 0) < entries.get(not_before_key, 0):
+            raise InvalidToken('Token has been revoked')
+        return token
+    
+    def get_user(self, validated_token):
+        if jwt_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken('Token contained no recognizable user identification')
+        return AdminTokenUser(validated_token)
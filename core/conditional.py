@@ -0,0 +1,92 @@
+"""
+Conditional GET Utilities
+ETag / Last-Modified validators that let repeat visits get a 304 before any
+serialization runs
+"""
+import hashlib
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from rest_framework import status
+from rest_framework.response import Response
+from django.utils.http import http_date, parse_etags, parse_http_date_safe, quote_etag
+from common.constants import CacheControl
+
+# Admins see inactive cars, so shared caches must keep responses apart by credentials
+CREDENTIAL_HEADERS = ('Authorization', 'Cookie')
+
+
+def make_etag(*parts):
+    """Build a strong ETag from the values that identify a representation"""
+    raw = '|'.join(str(part) for part in parts)
+    return quote_etag(hashlib.md5(raw.encode('utf-8')).hexdigest())
+
+
+def is_not_modified(request, etag=None, last_modified=None):
+    """
+    Check the request's validators against the current ones
+    If-None-Match wins over If-Modified-Since when both are sent
+    """
+    if request.method not in ('GET', 'HEAD'):
+        return False
+    
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match:
+        if etag is None:
+            return False
+        # Weak comparison, as required for If-None-Match
+        candidates = {candidate.removeprefix('W/') for candidate in parse_etags(if_none_match)}
+        return '*' in candidates or etag in candidates
+    
+    if_modified_since = request.headers.get('If-Modified-Since')
+    if if_modified_since and last_modified is not None:
+        since = parse_http_date_safe(if_modified_since)
+        return since is not None and int(last_modified.timestamp()) <= since
+    
+    return False
+
+
+def has_credentials(request):
+    """Whether the request carries an API token or a session cookie"""
+    return 'HTTP_AUTHORIZATION' in request.META or settings.SESSION_COOKIE_NAME in request.COOKIES
+
+
+def vary_on_credentials(response):
+    """Stop shared caches from serving one caller's cached body to another with other credentials"""
+    patch_vary_headers(response, CREDENTIAL_HEADERS)
+    return response
+
+
+def set_validators(response, etag=None, last_modified=None, cache_control=None):
+    """Attach validator and caching headers to a response"""
+    if etag is not None:
+        response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    if cache_control:
+        response['Cache-Control'] = cache_control
+    return response
+
+
+def conditional_response(request, build, etag=None, last_modified=None, cache_control=None):
+    """
+    Return 304 when the client's copy is current, otherwise build the response
+    Only successful responses carry the validators; requests with credentials
+    are never marked cacheable by shared caches
+    """
+    if cache_control and has_credentials(request):
+        cache_control = CacheControl.PRIVATE
+    
+    if is_not_modified(request, etag, last_modified):
+        response = set_validators(Response(status=status.HTTP_304_NOT_MODIFIED), etag, last_modified, cache_control)
+        return vary_on_credentials(response)
+    
+    response = build()
+    if response.status_code == status.HTTP_200_OK:
+        set_validators(response, etag, last_modified, cache_control)
+    return vary_on_credentials(response)
+
+
+def private_response(response):
+    """Keep shared caches away from per-user responses"""
+    response['Cache-Control'] = CacheControl.PRIVATE
+    return vary_on_credentials(response)
@@ -0,0 +1,234 @@
+"""
+Request Instrumentation
+Per-request SQL, serializer and render timings, sent back as Server-Timing
+headers and logged as one structured line per request (at DEBUG unless the
+request is over budget)
+"""
+import logging
+import time
+from contextvars import ContextVar
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import Signal
+
+logger = logging.getLogger(__name__)
+
+# Metrics of the request being handled; context variables follow the request
+# into sync_to_async threads and back
+_current = ContextVar('request_metrics', default=None)
+
+PHASES = ('db', 'serialize', 'render')
+
+# Sent with (request, response, data) once a request has been measured
+request_measured = Signal()
+
+
+class RequestMetrics:
+    """Counters collected while one request is handled"""
+    
+    __slots__ = ('request', 'started', 'queries', 'durations', 'active')
+    
+    def __init__(self, request=None):
+        self.request = request
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.durations = dict.fromkeys(PHASES, 0.0)
+        # Phases being timed right now, so nested calls are not counted twice
+        self.active = set()
+    
+    def elapsed(self):
+        """Seconds since the request started"""
+        return time.perf_counter() - self.started
+    
+    def as_dict(self):
+        """Millisecond timings and the query count"""
+        data = {f'{phase}_ms': round(seconds * 1000, 2) for phase, seconds in self.durations.items()}
+        data['total_ms'] = round(self.elapsed() * 1000, 2)
+        data['queries'] = self.queries
+        return data
+
+
+def current_metrics():
+    """Metrics of the current request, or None outside one"""
+    return _current.get()
+
+
+def timed(phase, func, *args, **kwargs):
+    """Call `func` and add its duration to `phase` of the current request"""
+    metrics = _current.get()
+    if metrics is None or phase in metrics.active:
+        return func(*args, **kwargs)
+    
+    metrics.active.add(phase)
+    started = time.perf_counter()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        metrics.durations[phase] += time.perf_counter() - started
+        metrics.active.discard(phase)
+
+
+def record_query(execute, sql, params, many, context):
+    """Database execute wrapper counting queries and their time for the current request"""
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.queries += 1
+        metrics.durations['db'] += time.perf_counter() - started
+
+
+def install_query_recorder(connection, **kwargs):
+    """Add the query recorder to a database connection (once)"""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+class TimedSerializerMixin:
+    """Count a serializer's to_representation() towards the request's serialize timing"""
+    
+    def to_representation(self, instance):
+        return timed('serialize', super().to_representation, instance)
+
+
+class TimedRendererMixin:
+    """Count a renderer's render() towards the request's render timing"""
+    
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return timed('render', super().render, data, accepted_media_type, renderer_context)
+
+
+class RequestMetricsMiddleware:
+    """
+    Collect per-request metrics, add a Server-Timing header and log the request
+    Requests over REQUEST_QUERY_BUDGET queries or REQUEST_DB_TIME_BUDGET_MS of
+    SQL are logged as warnings, the others at DEBUG. Streamed bodies (exports,
+    media) are measured until the server closes the response; their headers are
+    sent before the body, so they get no Server-Timing header.
+    """
+    sync_capable = True
+    async_capable = True
+    
+    def __init__(self, get_response):
+        if not settings.REQUEST_METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+        
+        connection_created.connect(install_query_recorder, dispatch_uid='core.instrumentation')
+        for connection in connections.all(initialized_only=True):
+            install_query_recorder(connection)
+    
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        
+        metrics = RequestMetrics(request)
+        token = _current.set(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, metrics)
+    
+    async def __acall__(self, request):
+        metrics = RequestMetrics(request)
+        token = _current.set(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, metrics)
+    
+    def finish(self, request, response, metrics):
+        """Attach the Server-Timing header and report, or defer both until a streamed body closes"""
+        if not response.streaming:
+            if settings.SERVER_TIMING_HEADER:
+                response['Server-Timing'] = server_timing(metrics.as_dict())
+            self.report(request, response, metrics)
+            return response
+        
+        # Files handed to the server's sendfile are not read in Python
+        if getattr(response, 'file_to_stream', None) is None:
+            if response.is_async:
+                response.streaming_content = ameasured(response.streaming_content, metrics)
+            else:
+                response.streaming_content = measured(response.streaming_content, metrics)
+        response._resource_closers.append(lambda: self.report(request, response, metrics))
+        return response
+    
+    def report(self, request, response, metrics):
+        """Log the request and send request_measured"""
+        data = metrics.as_dict()
+        match = request.resolver_match
+        data.update({
+            'method': request.method,
+            'path': request.path,
+            'route': match.view_name if match else '',
+            'status': response.status_code,
+        })
+        
+        over_budget = (
+            data['queries'] > settings.REQUEST_QUERY_BUDGET
+            or data['db_ms'] > settings.REQUEST_DB_TIME_BUDGET_MS
+        )
+        data['over_budget'] = over_budget
+        # The server's access log already has a line per request
+        level = logging.WARNING if over_budget else logging.DEBUG
+        if logger.isEnabledFor(level):
+            logger.log(level, 'request %s', logfmt(data), extra={'request_metrics': data})
+        
+        request_measured.send(sender=self.__class__, request=request, response=response, data=data)
+
+
+def measured(iterator, metrics):
+    """Yield from a streamed body, counting the work of each chunk towards `metrics`"""
+    iterator = iter(iterator)
+    while True:
+        token = _current.set(metrics)
+        try:
+            chunk = next(iterator)
+        except StopIteration:
+            return
+        finally:
+            _current.reset(token)
+        yield chunk
+
+
+async def ameasured(iterator, metrics):
+    """Async counterpart of measured()"""
+    iterator = aiter(iterator)
+    while True:
+        token = _current.set(metrics)
+        try:
+            chunk = await anext(iterator)
+        except StopAsyncIteration:
+            return
+        finally:
+            _current.reset(token)
+        yield chunk
+
+
+def server_timing(data):
+    """Server-Timing header value for a metrics dict"""
+    return ', '.join([
+        f'db;dur={data["db_ms"]};desc="{data["queries"]} queries"',
+        f'serialize;dur={data["serialize_ms"]}',
+        f'render;dur={data["render_ms"]}',
+        f'total;dur={data["total_ms"]}',
+    ])
+
+
+def logfmt(data):
+    """key=value pairs for log processors"""
+    return ' '.join(f'{key}={value}' for key, value in data.items())
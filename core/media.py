@@ -0,0 +1,159 @@
+"""
+Media File Serving
+Serves uploaded files without tying a worker to the transfer: either hands the
+file to the front proxy (X-Accel-Redirect / X-Sendfile) or streams it with
+FileResponse, which gunicorn sends with sendfile(), honouring byte ranges
+"""
+import mimetypes
+import os
+import re
+from datetime import datetime, timezone
+from urllib.parse import quote
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.http import http_date
+from core.conditional import is_not_modified, make_etag, set_validators
+from core.streaming import is_async_request, iterate_in_thread, read_blocks
+from common.constants import CacheControl
+
+# Rendition names carry a content hash: cars/renditions/<stem>-<size>-<12 hex>.<ext>
+HASHED_NAME = re.compile(r'-[0-9a-f]{12}\.[A-Za-z0-9]+$')
+
+RANGE_HEADER = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class RangeFile:
+    """
+    Read-only view of `length` bytes of an open file starting at `start`
+    Exposes fileno() so the WSGI server can still use sendfile() from the
+    current offset for Content-Length bytes
+    """
+    
+    def __init__(self, file, start, length):
+        file.seek(start)
+        self.file = file
+        self.remaining = length
+    
+    def read(self, size=-1):
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+    
+    def fileno(self):
+        return self.file.fileno()
+    
+    def close(self):
+        self.file.close()
+
+
+def parse_range(header, size):
+    """
+    Parse a single-range Range header into (start, end) inclusive
+    Returns None for headers that should be ignored (serve the whole file) and
+    raises ValueError for ranges that cannot be satisfied
+    """
+    match = RANGE_HEADER.match(header.strip())
+    if not match:
+        # Multiple ranges and other units are optional; send the whole file
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            raise ValueError('Empty suffix range')
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError('Range not satisfiable')
+    return start, end
+
+
+def serve_media(request, path, document_root, offload=True):
+    """
+    Serve a file below `document_root`
+    MEDIA_SERVE_MODE picks the transport: "x-accel" (nginx) or "x-sendfile"
+    (Apache, lighttpd) hand the transfer to the proxy; "django" streams it here
+    """
+    try:
+        full_path = safe_join(document_root, path)
+    except SuspiciousFileOperation:
+        raise Http404('File not found')
+    try:
+        stat = os.stat(full_path)
+    except OSError:
+        raise Http404('File not found')
+    if not os.path.isfile(full_path):
+        raise Http404('File not found')
+    
+    last_modified = datetime.fromtimestamp(int(stat.st_mtime), tz=timezone.utc)
+    etag = make_etag(path, stat.st_size, stat.st_mtime_ns)
+    cache_control = CacheControl.MEDIA_IMMUTABLE if HASHED_NAME.search(path) else CacheControl.MEDIA
+    
+    if is_not_modified(request, etag, last_modified):
+        return set_validators(HttpResponse(status=304), etag, last_modified, cache_control)
+    
+    content_type, encoding = mimetypes.guess_type(full_path)
+    content_type = content_type or 'application/octet-stream'
+    
+    mode = settings.MEDIA_SERVE_MODE if offload else 'django'
+    if mode == 'x-accel':
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = quote(settings.MEDIA_ACCEL_PREFIX + path.lstrip('/'))
+    elif mode == 'x-sendfile':
+        response = HttpResponse(content_type=content_type)
+        response['X-Sendfile'] = full_path
+    else:
+        response = file_response(request, full_path, stat.st_size, content_type, etag, last_modified)
+    
+    if encoding:
+        response['Content-Encoding'] = encoding
+    return set_validators(response, etag, last_modified, cache_control)
+
+
+def file_response(request, full_path, size, content_type, etag, last_modified):
+    """Stream the file, or the requested byte range of it, with an exact Content-Length"""
+    byte_range = None
+    range_header = request.headers.get('Range')
+    if range_header and request.method in ('GET', 'HEAD') and if_range_matches(request, etag, last_modified):
+        try:
+            byte_range = parse_range(range_header, size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+    
+    file = open(full_path, 'rb')
+    status, length = 200, size
+    if byte_range is not None:
+        start, end = byte_range
+        status, length = 206, end - start + 1
+        file = RangeFile(file, start, length)
+    
+    if is_async_request(request):
+        # No sendfile under ASGI; stream blocks without buffering the whole file
+        response = StreamingHttpResponse(iterate_in_thread(read_blocks(file)), status=status, content_type=content_type)
+    else:
+        response = FileResponse(file, status=status, content_type=content_type)
+    response['Content-Length'] = length
+    if byte_range is not None:
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    response['Accept-Ranges'] = 'bytes'
+    return response
+
+
+def if_range_matches(request, etag, last_modified):
+    """A Range request with a stale If-Range gets the whole file instead"""
+    if_range = request.headers.get('If-Range')
+    if not if_range:
+        return True
+    if if_range.startswith(('"', 'W/')):
+        return if_range == etag
+    return if_range == http_date(last_modified.timestamp())
@@ -1,10 +1,128 @@
 """
 Custom Pagination Classes
 """
+import base64
+import json
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 
-class StandardResultsSetPagination(PageNumberPagination):
+class KeysetPaginationMixin:
+    """
+    Opt-in keyset (cursor) mode for page number pagination
+    Send `pagination=cursor` for the first page, then follow the `next`/`previous`
+    links. Pages seek on (created_at, pk) newest first, so deep pages cost the
+    same as the first one and no COUNT(*) is run (`count` is null).
+    Without those params the regular page number behaviour is unchanged.
+    """
+    cursor_query_param = 'cursor'
+    mode_query_param = 'pagination'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.use_cursor = (
+            self.cursor_query_param in request.query_params
+            or request.query_params.get(self.mode_query_param) == 'cursor'
+        )
+        if not self.use_cursor:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        page_size = self.get_page_size(request)
+        cursor = self.decode_cursor(request)
+
+        if cursor is not None and cursor['reverse']:
+            queryset = queryset.order_by('created_at', 'pk')
+            queryset = queryset.filter(
+                Q(created_at__gt=cursor['created_at'])
+                | Q(created_at=cursor['created_at'], pk__gt=cursor['pk'])
+            )
+        else:
+            queryset = queryset.order_by('-created_at', '-pk')
+            if cursor is not None:
+                queryset = queryset.filter(
+                    Q(created_at__lt=cursor['created_at'])
+                    | Q(created_at=cursor['created_at'], pk__lt=cursor['pk'])
+                )
+
+        results = list(queryset[:page_size + 1])
+        has_more = len(results) > page_size
+        results = results[:page_size]
+
+        if cursor is not None and cursor['reverse']:
+            results.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = cursor is not None
+
+        self.page_results = results
+        return results
+
+    def get_paginated_response(self, data):
+        if not getattr(self, 'use_cursor', False):
+            return super().get_paginated_response(data)
+
+        return Response({
+            'count': None,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_next_link(self):
+        if not getattr(self, 'use_cursor', False):
+            return super().get_next_link()
+        if not self.has_next or not self.page_results:
+            return None
+        return self.build_cursor_link(self.page_results[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not getattr(self, 'use_cursor', False):
+            return super().get_previous_link()
+        if not self.has_previous or not self.page_results:
+            return None
+        return self.build_cursor_link(self.page_results[0], reverse=True)
+
+    def build_cursor_link(self, item, reverse):
+        """Build a link that seeks past the given item"""
+        payload = {
+            'c': item.created_at.isoformat(),
+            'i': item.pk,
+            'r': 1 if reverse else 0,
+        }
+        token = base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode()
+
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.page_query_param)
+        url = remove_query_param(url, self.mode_query_param)
+        return replace_query_param(url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        """Decode the cursor param; returns None for the first page"""
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token.encode()).decode())
+            created_at = parse_datetime(payload['c'])
+            pk = int(payload['i'])
+            reverse = bool(payload.get('r'))
+        except (TypeError, ValueError, KeyError, UnicodeDecodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if created_at is None:
+            raise NotFound(self.invalid_cursor_message)
+        return {'created_at': created_at, 'pk': pk, 'reverse': reverse}
+
+
+class StandardResultsSetPagination(KeysetPaginationMixin, PageNumberPagination):
     """
     Standard pagination class with customizable page size
     """
@@ -13,7 +131,7 @@ class StandardResultsSetPagination(PageNumberPagination):
     max_page_size = 100
 
 
-class LargeResultsSetPagination(PageNumberPagination):
+class LargeResultsSetPagination(KeysetPaginationMixin, PageNumberPagination):
     """
     Pagination for larger datasets
     """
@@ -22,7 +140,7 @@ class LargeResultsSetPagination(PageNumberPagination):
     max_page_size = 200
 
 
-class SmallResultsSetPagination(PageNumberPagination):
+class SmallResultsSetPagination(KeysetPaginationMixin, PageNumberPagination):
     """
     Pagination for smaller datasets
     """
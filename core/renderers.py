@@ -0,0 +1,145 @@
+"""
+Custom Renderers
+JSON and browsable API renderers counted in the request metrics, and flat CSV
+and NDJSON renderers that can also stream rows straight from a queryset
+"""
+import csv
+import io
+from datetime import date, datetime, time
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from rest_framework.negotiation import DefaultContentNegotiation
+from rest_framework import renderers
+from rest_framework.renderers import BaseRenderer
+from rest_framework.response import Response
+from core.instrumentation import TimedRendererMixin
+from core.streaming import iterate_in_thread
+
+
+class JSONRenderer(TimedRendererMixin, renderers.JSONRenderer):
+    """JSON renderer timed in the request's Server-Timing header"""
+
+
+class BrowsableAPIRenderer(TimedRendererMixin, renderers.BrowsableAPIRenderer):
+    """Browsable API renderer timed in the request's Server-Timing header"""
+
+
+class FormatParamNegotiation(DefaultContentNegotiation):
+    """
+    Pick the renderer from the `format` query parameter only
+    Download links are opened by browsers and API clients with all kinds of
+    Accept headers; without `?format=` the first renderer is used
+    """
+    
+    def select_renderer(self, request, renderers, format_suffix=None):
+        format_query_param = self.settings.URL_FORMAT_OVERRIDE
+        if format_suffix or request.query_params.get(format_query_param):
+            return super().select_renderer(request, renderers, format_suffix)
+        return renderers[0], renderers[0].media_type
+
+
+class StreamRenderer(BaseRenderer):
+    """
+    Base class for renderers of flat rows
+    `stream()` turns an iterator of row tuples into encoded chunks, so exports
+    never hold more than one chunk in memory; `render()` covers regular
+    responses. Errors are sent as JSON (see JSONErrorsMixin)
+    """
+    charset = 'utf-8'
+    rows_per_chunk = 500
+    
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Render a dict or a list of flat dicts in one go"""
+        rows = data if isinstance(data, list) else [data or {}]
+        headers = list(rows[0].keys()) if rows else []
+        return b''.join(self.stream(headers, ([row.get(header) for header in headers] for row in rows)))
+    
+    def stream(self, headers, rows):
+        raise NotImplementedError
+    
+    def streaming_response(self, headers, rows, filename, asynchronous=False):
+        """
+        Wrap a row iterator in a streaming download
+        Under ASGI (`asynchronous`) the chunks are produced in the request thread one at a time
+        """
+        content = self.stream(headers, rows)
+        if asynchronous:
+            content = iterate_in_thread(content)
+        response = StreamingHttpResponse(
+            content,
+            content_type=f'{self.media_type}; charset={self.charset}'
+        )
+        response['Content-Disposition'] = f'attachment; filename="{filename}.{self.format}"'
+        # Let proxies pass chunks through as they are produced
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+
+class JSONErrorsMixin:
+    """
+    View mixin sending error responses as JSON when a stream renderer was picked
+    Clients of an export read the error message instead of a one-row CSV, and
+    errors raised before or during negotiation get the same body
+    """
+    
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if (
+            isinstance(response, Response)
+            and response.status_code >= 400
+            and isinstance(response.accepted_renderer, StreamRenderer)
+        ):
+            response.accepted_renderer = JSONRenderer()
+            response.accepted_media_type = JSONRenderer.media_type
+        return response
+
+
+class CSVStreamRenderer(StreamRenderer):
+    """CSV renderer for flat rows"""
+    media_type = 'text/csv'
+    format = 'csv'
+    
+    # Cells starting with these are treated as formulas by spreadsheet apps
+    FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+    
+    def format_value(self, value):
+        """Format one cell"""
+        if value is None:
+            return ''
+        if isinstance(value, (datetime, date, time)):
+            return value.isoformat()
+        if isinstance(value, str) and value.startswith(self.FORMULA_PREFIXES):
+            return f"'{value}"
+        return value
+    
+    def stream(self, headers, rows):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(headers)
+        
+        for count, row in enumerate(rows, start=1):
+            writer.writerow([self.format_value(value) for value in row])
+            if count % self.rows_per_chunk == 0:
+                yield buffer.getvalue().encode(self.charset)
+                buffer.seek(0)
+                buffer.truncate()
+        
+        yield buffer.getvalue().encode(self.charset)
+
+
+class NDJSONStreamRenderer(StreamRenderer):
+    """Newline-delimited JSON renderer for flat rows (one object per line)"""
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    
+    def stream(self, headers, rows):
+        encoder = DjangoJSONEncoder(ensure_ascii=False, separators=(',', ':'))
+        lines = []
+        for row in rows:
+            lines.append(encoder.encode(dict(zip(headers, row))))
+            if len(lines) == self.rows_per_chunk:
+                yield ('\n'.join(lines) + '\n').encode(self.charset)
+                lines = []
+        
+        if lines:
+            yield ('\n'.join(lines) + '\n').encode(self.charset)
@@ -0,0 +1,48 @@
+"""
+Streaming Utilities
+Under ASGI Django reads a synchronous streaming body into memory in one go
+before sending it; these helpers feed it to the event loop piece by piece
+"""
+import itertools
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+
+
+def is_async_request(request):
+    """True when the request is served by the ASGI handler (DRF requests included)"""
+    return isinstance(getattr(request, '_request', request), ASGIRequest)
+
+
+async def iterate_in_thread(iterator, batch_size=1):
+    """
+    Consume a blocking iterator from the event loop, `batch_size` items per hop
+    Runs in the request's sync thread, so database cursors stay on their connection
+    """
+    iterator = iter(iterator)
+    
+    def next_batch():
+        return list(itertools.islice(iterator, batch_size))
+    
+    try:
+        while True:
+            batch = await sync_to_async(next_batch)()
+            if not batch:
+                break
+            for item in batch:
+                yield item
+    finally:
+        close = getattr(iterator, 'close', None)
+        if close is not None:
+            await sync_to_async(close)()
+
+
+def read_blocks(file, block_size=64 * 1024):
+    """Yield a file's content in blocks, closing it when done"""
+    try:
+        while True:
+            block = file.read(block_size)
+            if not block:
+                break
+            yield block
+    finally:
+        file.close()
@@ -0,0 +1,177 @@
+"""
+Custom Throttling
+Token-bucket throttles for the auth endpoints, checked by DRF before the view
+runs, so rejected attempts never reach password hashing
+"""
+import abc
+import hashlib
+import logging
+import math
+import threading
+import time
+from collections import Counter, OrderedDict
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import BaseThrottle
+from common.utils import get_client_ip
+
+logger = logging.getLogger(__name__)
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def refill(tokens, stamp, capacity, rate, now):
+    """Bucket level at `now` after refilling since `stamp`"""
+    return min(capacity, tokens + max(now - stamp, 0) * rate)
+
+
+class MemoryBucketStore:
+    """
+    Buckets held in this process
+    Bounded: the least recently used buckets are dropped (they would be full again anyway)
+    """
+    
+    MAX_BUCKETS = 100000
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.buckets = OrderedDict()
+        self.rejected = Counter()
+    
+    def consume(self, key, capacity, rate):
+        """Take one token; returns (allowed, seconds until the next token)"""
+        now = time.monotonic()
+        with self.lock:
+            tokens, stamp = self.buckets.pop(key, (capacity, now))
+            tokens = refill(tokens, stamp, capacity, rate, now)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self.buckets[key] = (tokens, now)
+            if len(self.buckets) > self.MAX_BUCKETS:
+                self.buckets.popitem(last=False)
+        return allowed, 0 if allowed else (1 - tokens) / rate
+    
+    def record_rejection(self, scope):
+        with self.lock:
+            self.rejected[scope] += 1
+    
+    def get_rejections(self):
+        with self.lock:
+            return dict(self.rejected)
+
+
+class CacheBucketStore:
+    """
+    Buckets in the shared cache, so every worker draws from the same bucket
+    Read-modify-write is not atomic; concurrent attempts may slip through a
+    token or two, which is fine for flood protection
+    """
+    
+    REJECTED_KEY = 'throttle:rejected:{scope}'
+    
+    def get_cache(self):
+        return caches[settings.AUTH_THROTTLE_CACHE_ALIAS]
+    
+    def consume(self, key, capacity, rate):
+        now = time.time()
+        cache = self.get_cache()
+        tokens, stamp = cache.get(key) or (capacity, now)
+        tokens = refill(tokens, stamp, capacity, rate, now)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        # A bucket left alone until it is full again needs no entry
+        cache.set(key, (tokens, now), timeout=math.ceil((capacity - tokens) / rate) + 1)
+        return allowed, 0 if allowed else (1 - tokens) / rate
+    
+    def record_rejection(self, scope):
+        cache = self.get_cache()
+        key = self.REJECTED_KEY.format(scope=scope)
+        try:
+            cache.incr(key)
+        except ValueError:
+            if not cache.add(key, 1, timeout=None):
+                cache.incr(key)
+    
+    def get_rejections(self):
+        cache = self.get_cache()
+        return {
+            scope: cache.get(self.REJECTED_KEY.format(scope=scope), 0)
+            for scope in settings.AUTH_THROTTLE_RATES
+        }
+
+
+_memory_store = MemoryBucketStore()
+
+
+def get_bucket_store():
+    """Bucket store selected by AUTH_THROTTLE_BACKEND ('memory' or 'cache')"""
+    if settings.AUTH_THROTTLE_BACKEND == 'cache':
+        return CacheBucketStore()
+    return _memory_store
+
+
+def get_throttle_stats():
+    """Rejected attempts per throttle scope"""
+    return {
+        'backend': settings.AUTH_THROTTLE_BACKEND,
+        'rates': settings.AUTH_THROTTLE_RATES,
+        'rejected': get_bucket_store().get_rejections(),
+    }
+
+
+class TokenBucketThrottle(abc.ABC, BaseThrottle):
+    """
+    Token-bucket throttle
+    A rate of "20/min" allows bursts of 20 and refills at 20 per minute
+    """
+    scope = None
+    
+    @abc.abstractmethod
+    def get_ident_key(self, request):
+        """Identity the bucket belongs to; None skips throttling"""
+    
+    def parse_rate(self):
+        rate = settings.AUTH_THROTTLE_RATES.get(self.scope)
+        if not rate:
+            return None
+        num, period = rate.split('/')
+        return int(num), int(num) / PERIODS[period[0]]
+    
+    def allow_request(self, request, view):
+        self.wait_seconds = None
+        rate = self.parse_rate()
+        ident = self.get_ident_key(request)
+        if rate is None or ident is None:
+            return True
+        
+        capacity, refill_rate = rate
+        store = get_bucket_store()
+        allowed, self.wait_seconds = store.consume(f'throttle:{self.scope}:{ident}', capacity, refill_rate)
+        if not allowed:
+            store.record_rejection(self.scope)
+            logger.warning('Throttled %s attempt from %s', self.scope, get_client_ip(request))
+        return allowed
+    
+    def wait(self):
+        return self.wait_seconds
+
+
+class AuthIPThrottle(TokenBucketThrottle):
+    """Auth attempts per client IP"""
+    scope = 'auth_ip'
+    
+    def get_ident_key(self, request):
+        return get_client_ip(request) or 'unknown'
+
+
+class AuthAccountThrottle(TokenBucketThrottle):
+    """Auth attempts per account (email), whatever IPs they come from"""
+    scope = 'auth_account'
+    
+    def get_ident_key(self, request):
+        email = request.data.get('email') if hasattr(request.data, 'get') else None
+        if not isinstance(email, str) or not email.strip():
+            return None
+        return hashlib.sha256(email.strip().lower().encode('utf-8')).hexdigest()
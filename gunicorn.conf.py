@@ -0,0 +1,59 @@
+"""
+Gunicorn configuration
+Runs the ASGI application on uvicorn workers, so each process keeps thousands of
+slow connections open on its event loop instead of pinning a worker per request.
+Set GUNICORN_APP=config.wsgi:application and GUNICORN_WORKER_CLASS=gthread to
+fall back to threaded WSGI workers.
+"""
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+wsgi_app = os.getenv('GUNICORN_APP', 'config.asgi:application')
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'uvicorn_worker.UvicornWorker')
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+
+# Catalog cache versions, the settings stamp and token revocations live in the
+# Django cache. A process-local backend (the default) would keep them per worker,
+# so more than one worker needs a shared CACHE_BACKEND (Redis, Memcached, ...)
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+shared_cache = os.getenv('CACHE_BACKEND', PROCESS_LOCAL_CACHES[0]) not in PROCESS_LOCAL_CACHES
+
+# Event-loop workers are not blocked by slow clients; one per core is enough.
+# Each worker opens its own database pool of up to DB_POOL_MAX_SIZE connections
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count() if shared_cache else 1))
+# Only used by the gthread worker class
+threads = int(os.getenv('GUNICORN_THREADS', 4))
+
+# Long enough for streamed exports; idle keep-alive connections cost next to nothing
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 120))
+graceful_timeout = 30
+keepalive = 5
+
+accesslog = '-'
+errorlog = '-'
+
+# Prometheus samples are written per worker to this directory and added up by
+# /metrics; it is emptied when the server starts so old workers are not counted
+os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', os.path.join(tempfile.gettempdir(), 'elite-motors-metrics'))
+
+
+def on_starting(server):
+    if server.cfg.workers > 1 and not shared_cache:
+        raise RuntimeError(
+            f'{server.cfg.workers} workers need a shared CACHE_BACKEND; the process-local '
+            'cache would leave catalog versions and token revocations per worker'
+        )
+
+    metrics_dir = os.environ['PROMETHEUS_MULTIPROC_DIR']
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir, exist_ok=True)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
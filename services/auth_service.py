@@ -2,15 +2,39 @@
 Authentication Service
 Business logic for user authentication
 """
-from django.contrib.auth import authenticate
+from django.conf import settings
+from django.contrib.auth import user_login_failed
 from django.contrib.auth.models import User
+from django.db.models import Q
 from rest_framework.authtoken.models import Token
+from rest_framework_simplejwt.tokens import AccessToken
 from apps.accounts.models import AdminProfile
+from core.authentication import deny_jwt
 
 
 class AuthService:
     """Service class for authentication operations"""
     
+    @staticmethod
+    def issue_token(user, admin_profile):
+        """
+        Issue an API token for an admin
+        A signed access token carrying the admin claims in jwt mode, the user's
+        opaque token otherwise
+        """
+        if settings.AUTH_TOKEN_MODE == 'jwt':
+            token = AccessToken.for_user(user)
+            token['email'] = user.email
+            token['role'] = admin_profile.role
+            token['display_name'] = admin_profile.display_name
+            return str(token)
+        
+        try:
+            return user.auth_token.key
+        except Token.DoesNotExist:
+            token, _ = Token.objects.get_or_create(user=user)
+            return token.key
+    
     @staticmethod
     def register_admin(email, password, display_name='', role='admin'):
         """Register a new admin user"""
@@ -28,11 +52,8 @@ class AuthService:
             display_name=display_name or email
         )
         
-        # Generate token
-        token, _ = Token.objects.get_or_create(user=user)
-        
         return {
-            'token': token.key,
+            'token': AuthService.issue_token(user, admin_profile),
             'user': {
                 'uid': user.id,
                 'email': user.email,
@@ -43,17 +64,23 @@ class AuthService:
     
     @staticmethod
     def login_admin(email, password):
-        """Login admin user"""
-        # Try to find user by email first
-        try:
-            user_obj = User.objects.get(email=email)
-            username = user_obj.username
-        except User.DoesNotExist:
-            username = email
-            
-        user = authenticate(username=username, password=password)
+        """
+        Login admin user
+        The user (matched by email, then username), its admin profile and its
+        token are loaded in one joined query
+        """
+        candidates = list(
+            User.objects.select_related('admin_profile', 'auth_token')
+            .filter(Q(email=email) | Q(username=email))[:2]
+        )
+        # An email match wins over a username match
+        user = min(candidates, key=lambda candidate: candidate.email != email, default=None)
         
-        if not user:
+        if user is None:
+            # Hash anyway so unknown emails take as long as wrong passwords
+            User().set_password(password)
+        if user is None or not user.check_password(password) or not user.is_active:
+            user_login_failed.send(sender=AuthService, credentials={'username': email})
             raise ValueError("Invalid credentials")
         
         # Check if user has admin profile
@@ -70,11 +97,8 @@ class AuthService:
             else:
                 raise ValueError("User is not an admin")
         
-        # Get or create token
-        token, _ = Token.objects.get_or_create(user=user)
-        
         return {
-            'token': token.key,
+            'token': AuthService.issue_token(user, admin_profile),
             'user': {
                 'uid': user.id,
                 'email': user.email,
@@ -84,15 +108,22 @@ class AuthService:
         }
     
     @staticmethod
-    def logout_admin(user):
-        """Logout admin user by deleting token"""
-        try:
-            token = Token.objects.get(user=user)
-            token.delete()
-        except Token.DoesNotExist:
-            pass
+    def logout_admin(user, auth=None):
+        """
+        Logout admin user
+        Signed tokens are deny-listed until they expire; opaque tokens are deleted,
+        which also drops them from the auth cache
+        """
+        if isinstance(auth, AccessToken):
+            deny_jwt(auth)
+            return
+        
+        Token.objects.filter(user_id=user.pk).delete()
     
     @staticmethod
     def get_admin_profile(user):
         """Get admin profile for user"""
-        return user.admin_profile
+        if isinstance(user, User):
+            return user.admin_profile
+        # Stateless token users only carry the claims
+        return AdminProfile.objects.select_related('user').get(user_id=user.pk)
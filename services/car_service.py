@@ -2,7 +2,10 @@
 Car Service
 Business logic for car operations
 """
-from apps.cars.models import Car, RecentlySold
+from django.db.models import Count, JSONField, Max, OuterRef, Subquery
+from apps.cars.models import Car, CarImage, RecentlySold
+from services.related_car_service import RelatedCarService
+from services.search_service import SearchService
 
 
 class CarService:
@@ -23,15 +26,90 @@ class CarService:
         
         return queryset
     
+    @staticmethod
+    def filter_cars(queryset, params, is_admin=False):
+        """
+        Apply the public car filters from query params
+        Works on Car and CarListing querysets, which share the filtered field names
+        """
+        # Filter by active status
+        is_active = params.get('is_active', None)
+        if is_active is not None:
+            active_bool = is_active.lower() == 'true'
+            queryset = queryset.filter(is_active=active_bool)
+        elif not is_admin:
+            # For non-admin users, only show active cars by default
+            queryset = queryset.filter(is_active=True)
+        
+        # Filter by manufacturer
+        manufacturer_id = params.get('manufacturer', None)
+        if manufacturer_id:
+            queryset = queryset.filter(manufacturer_id=manufacturer_id)
+        
+        # Filter by body type
+        body_type = params.get('body_type', None)
+        if body_type:
+            queryset = queryset.filter(body_type=body_type)
+        
+        # Filter by fuel type
+        fuel_type = params.get('fuel_type', None)
+        if fuel_type:
+            queryset = queryset.filter(fuel_type=fuel_type)
+        
+        # Filter by transmission
+        transmission = params.get('transmission', None)
+        if transmission:
+            queryset = queryset.filter(transmission=transmission)
+        
+        # Filter by condition
+        condition = params.get('condition', None)
+        if condition:
+            queryset = queryset.filter(condition=condition)
+        
+        # Filter by ownership
+        ownership = params.get('ownership', None)
+        if ownership:
+            queryset = queryset.filter(ownership=ownership)
+        
+        # Filter by price range
+        min_price = params.get('min_price', None)
+        max_price = params.get('max_price', None)
+        if min_price:
+            queryset = queryset.filter(price__gte=min_price)
+        if max_price:
+            queryset = queryset.filter(price__lte=max_price)
+        
+        # Full-text search
+        search = params.get('q', None)
+        if search:
+            queryset = SearchService.filter(queryset, search)
+        
+        return queryset
+    
     @staticmethod
     def get_car_by_id(car_id):
         """Get a car by ID"""
         return Car.objects.get(pk=car_id)
     
     @staticmethod
-    def get_featured_cars():
-        """Get all featured cars"""
-        return Car.objects.filter(featured=True, is_available=True)
+    def with_primary_image(queryset):
+        """
+        Annotate cars with the file name and renditions of their primary image
+        Falls back to the first uploaded image, resolved in the same query
+        """
+        primary_image = CarImage.objects.filter(
+            car=OuterRef('pk')
+        ).order_by('-is_primary', 'id')
+        return queryset.annotate(
+            primary_image_name=Subquery(primary_image.values('image')[:1]),
+            primary_image_renditions=Subquery(primary_image.values('renditions')[:1], output_field=JSONField()),
+        )
+    
+    @staticmethod
+    def get_featured_cars(limit=6):
+        """Get featured/latest active cars"""
+        queryset = Car.objects.filter(is_active=True).select_related('manufacturer')
+        return CarService.with_primary_image(queryset).order_by('-created_at')[:limit]
     
     @staticmethod
     def create_car(data):
@@ -58,6 +136,21 @@ class CarService:
         """Get recently sold cars"""
         return RecentlySold.objects.all()[:limit]
     
+    @staticmethod
+    async def aget_recently_sold(limit=10):
+        """Async counterpart of get_recently_sold()"""
+        return [sold async for sold in RecentlySold.objects.all()[:limit]]
+    
+    @staticmethod
+    def get_recently_sold_version():
+        """Row count and latest change of the recently sold table, in one aggregate"""
+        return RecentlySold.objects.aggregate(count=Count('pk'), last_modified=Max('updated_at'))
+    
+    @staticmethod
+    async def aget_recently_sold_version():
+        """Async counterpart of get_recently_sold_version()"""
+        return await RecentlySold.objects.aaggregate(count=Count('pk'), last_modified=Max('updated_at'))
+    
     @staticmethod
     def add_recently_sold(data):
         """Add a recently sold car"""
@@ -92,47 +185,15 @@ class CarService:
     @staticmethod
     def get_related_cars(car, limit=6):
         """
-        Get related cars based on body type, manufacturer, and price range
+        Get related cars from the precomputed related-cars table
+        Entries are written whenever a car's scoring fields change, so a car
+        without entries has no related cars
         """
-        from decimal import Decimal
-        from django.db.models import Q
-        
-        # Calculate price range (±20% of current car price)
-        price = Decimal(str(car.price))
-        price_min = price * Decimal('0.8')
-        price_max = price * Decimal('1.2')
-        
-        # Build query for related cars
-        related_query = Q(is_active=True) & ~Q(id=car.id)  # Exclude current car
-        
-        # Priority 1: Same manufacturer AND same body type
-        same_mfg_body = Car.objects.filter(
-            related_query,
-            manufacturer=car.manufacturer,
-            body_type=car.body_type
-        ).order_by('?')[:limit]
-        
-        # If we have enough, return them
-        if same_mfg_body.count() >= limit:
-            return same_mfg_body
-        
-        # Priority 2: Add cars with same manufacturer OR same body type
-        related_cars = Car.objects.filter(
-            related_query,
-            Q(manufacturer=car.manufacturer) | Q(body_type=car.body_type),
-            price__gte=price_min,
-            price__lte=price_max
-        ).select_related('manufacturer').prefetch_related('images', 'features').order_by('?')[:limit]
-        
-        # If still not enough, add any cars in similar price range
-        if related_cars.count() < limit:
-            additional = Car.objects.filter(
-                related_query,
-                price__gte=price_min,
-                price__lte=price_max
-            ).exclude(id__in=[c.id for c in related_cars]).select_related('manufacturer').prefetch_related('images', 'features').order_by('?')[:limit - related_cars.count()]
-            
-            related_cars = list(related_cars) + list(additional)
-        
-        return related_cars
-
+        limit = max(0, min(limit, RelatedCarService.STORED_LIMIT))
+        queryset = CarService.with_primary_image(
+            Car.objects.filter(
+                related_to_entries__car=car,
+                is_active=True
+            ).select_related('manufacturer').order_by('related_to_entries__rank')
+        )
+        return list(queryset[:limit])
@@ -0,0 +1,156 @@
+"""
+Catalog Cache Service
+Versioned response cache for the public car catalog endpoints
+"""
+import hashlib
+import time
+from datetime import datetime, timezone
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.http import urlencode
+
+
+class CatalogCacheService:
+    """Service class for the catalog response cache"""
+    
+    VERSION_KEY = 'catalog:version'
+    HITS_KEY = 'catalog:stats:hits'
+    MISSES_KEY = 'catalog:stats:misses'
+    
+    # Query params that change a catalog response; anything else is ignored
+    CACHED_PARAMS = [
+        'q',
+        'is_active',
+        'manufacturer',
+        'body_type',
+        'fuel_type',
+        'transmission',
+        'condition',
+        'ownership',
+        'min_price',
+        'max_price',
+        'page',
+        'page_size',
+        'pagination',
+        'cursor',
+    ]
+    
+    @staticmethod
+    def get_cache():
+        """Return the Django cache configured for the catalog"""
+        return caches[settings.CATALOG_CACHE_ALIAS]
+    
+    @staticmethod
+    def get_version():
+        """
+        Get the current catalog version
+        Versions are millisecond timestamps, so a flushed cache never reuses an old one
+        """
+        cache = CatalogCacheService.get_cache()
+        version = cache.get(CatalogCacheService.VERSION_KEY)
+        if version is None:
+            cache.add(CatalogCacheService.VERSION_KEY, int(time.time() * 1000), timeout=None)
+            version = cache.get(CatalogCacheService.VERSION_KEY)
+        return version
+    
+    @staticmethod
+    async def aget_version():
+        """Async counterpart of get_version()"""
+        cache = CatalogCacheService.get_cache()
+        version = await cache.aget(CatalogCacheService.VERSION_KEY)
+        if version is None:
+            await cache.aadd(CatalogCacheService.VERSION_KEY, int(time.time() * 1000), timeout=None)
+            version = await cache.aget(CatalogCacheService.VERSION_KEY)
+        return version
+    
+    @staticmethod
+    def get_last_modified(version=None):
+        """Time of the last catalog change, taken from the version timestamp"""
+        if version is None:
+            version = CatalogCacheService.get_version()
+        return datetime.fromtimestamp(version / 1000, tz=timezone.utc)
+    
+    @staticmethod
+    def bump_version():
+        """Invalidate every cached catalog response"""
+        cache = CatalogCacheService.get_cache()
+        current = cache.get(CatalogCacheService.VERSION_KEY) or 0
+        version = max(int(time.time() * 1000), current + 1)
+        cache.set(CatalogCacheService.VERSION_KEY, version, timeout=None)
+        return version
+    
+    @staticmethod
+    def build_key(scope, params=None, *parts, version=None):
+        """Build a cache key from the scope, normalized query params and the catalog version"""
+        normalized = []
+        if params is not None:
+            for name in CatalogCacheService.CACHED_PARAMS:
+                value = (params.get(name) or '').strip()
+                if value:
+                    normalized.append((name, value))
+        
+        raw_key = urlencode(normalized + [('part', part) for part in parts])
+        digest = hashlib.md5(raw_key.encode('utf-8')).hexdigest()
+        if version is None:
+            version = CatalogCacheService.get_version()
+        return f"catalog:{version}:{scope}:{digest}"
+    
+    @staticmethod
+    def get(key):
+        """Get a cached response payload, counting the hit or miss"""
+        cache = CatalogCacheService.get_cache()
+        data = cache.get(key)
+        CatalogCacheService._increment(
+            CatalogCacheService.MISSES_KEY if data is None else CatalogCacheService.HITS_KEY
+        )
+        return data
+    
+    @staticmethod
+    async def aget(key):
+        """Async counterpart of get()"""
+        cache = CatalogCacheService.get_cache()
+        data = await cache.aget(key)
+        await CatalogCacheService._aincrement(
+            CatalogCacheService.MISSES_KEY if data is None else CatalogCacheService.HITS_KEY
+        )
+        return data
+    
+    @staticmethod
+    def set(key, data):
+        """Store a response payload"""
+        CatalogCacheService.get_cache().set(key, data, timeout=settings.CATALOG_CACHE_TIMEOUT)
+    
+    @staticmethod
+    def get_stats():
+        """Return hit/miss counters and the current version"""
+        cache = CatalogCacheService.get_cache()
+        hits = cache.get(CatalogCacheService.HITS_KEY, 0)
+        misses = cache.get(CatalogCacheService.MISSES_KEY, 0)
+        total = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': round(hits / total, 4) if total else None,
+            'version': CatalogCacheService.get_version(),
+            'cache_alias': settings.CATALOG_CACHE_ALIAS,
+        }
+    
+    @staticmethod
+    def _increment(key):
+        """Increment a shared counter, creating it on first use"""
+        cache = CatalogCacheService.get_cache()
+        try:
+            cache.incr(key)
+        except ValueError:
+            if not cache.add(key, 1, timeout=None):
+                cache.incr(key)
+    
+    @staticmethod
+    async def _aincrement(key):
+        """Async counterpart of _increment()"""
+        cache = CatalogCacheService.get_cache()
+        try:
+            await cache.aincr(key)
+        except ValueError:
+            if not await cache.aadd(key, 1, timeout=None):
+                await cache.aincr(key)
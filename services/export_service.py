@@ -0,0 +1,109 @@
+"""
+Export Service
+Builds flat, filtered row iterators for the booking and enquiry exports
+"""
+from datetime import datetime, time, timedelta
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+
+class ExportService:
+    """Service class for lead exports"""
+    
+    # Rows fetched per round trip; Postgres reads them through a server-side cursor
+    CHUNK_SIZE = 2000
+    
+    # (column header, values() lookup) per export
+    BOOKING_COLUMNS = [
+        ('id', 'id'),
+        ('created_at', 'created_at'),
+        ('status', 'status'),
+        ('package_type', 'package_type'),
+        ('date', 'date'),
+        ('time', 'time'),
+        ('customer_name', 'customer_name'),
+        ('email', 'email'),
+        ('phone', 'phone'),
+        ('message', 'message'),
+        ('car_id', 'car_id'),
+        ('car_name', 'car_name'),
+        ('manufacturer', 'car__manufacturer__name'),
+        ('model_name', 'car__model_name'),
+        ('price', 'car__price'),
+        ('updated_at', 'updated_at'),
+    ]
+    ENQUIRY_COLUMNS = [
+        ('id', 'id'),
+        ('created_at', 'created_at'),
+        ('status', 'status'),
+        ('customer_name', 'customer_name'),
+        ('email', 'email'),
+        ('phone', 'phone'),
+        ('message', 'message'),
+        ('admin_notes', 'admin_notes'),
+        ('car_id', 'car_id'),
+        ('manufacturer', 'car__manufacturer__name'),
+        ('model_name', 'car__model_name'),
+        ('model_year', 'car__model_year'),
+        ('price', 'car__price'),
+        ('updated_at', 'updated_at'),
+    ]
+    
+    @staticmethod
+    def filter_leads(queryset, params, status_choices):
+        """
+        Apply the export filters
+        created_from / created_to: inclusive dates (YYYY-MM-DD) in the site time zone
+        status: one status or a comma separated list
+        Raises ValueError with a message for invalid values
+        """
+        created_from = ExportService.parse_day(params, 'created_from')
+        created_to = ExportService.parse_day(params, 'created_to')
+        if created_from:
+            queryset = queryset.filter(created_at__gte=created_from)
+        if created_to:
+            queryset = queryset.filter(created_at__lt=created_to + timedelta(days=1))
+        
+        status = params.get('status')
+        if status:
+            statuses = [value.strip() for value in status.split(',') if value.strip()]
+            valid = {value for value, _ in status_choices}
+            invalid = [value for value in statuses if value not in valid]
+            if invalid:
+                raise ValueError(f'Invalid status: {", ".join(invalid)}')
+            queryset = queryset.filter(status__in=statuses)
+        
+        return queryset
+    
+    @staticmethod
+    def parse_day(params, name):
+        """Parse a date parameter into an aware datetime at the start of that day"""
+        value = params.get(name)
+        if not value:
+            return None
+        try:
+            day = parse_date(value)
+        except ValueError:
+            day = None
+        if day is None:
+            raise ValueError(f'{name} must be a date (YYYY-MM-DD)')
+        return timezone.make_aware(datetime.combine(day, time.min))
+    
+    @staticmethod
+    def iter_rows(queryset, columns):
+        """
+        Yield the export rows as tuples, newest first
+        A flat values_list() projection (joins included) streamed in chunks keeps
+        memory flat no matter how many rows match
+        """
+        lookups = [lookup for _, lookup in columns]
+        return (
+            queryset.order_by('-created_at', '-id')
+            .values_list(*lookups)
+            .iterator(chunk_size=ExportService.CHUNK_SIZE)
+        )
+    
+    @staticmethod
+    def headers(columns):
+        """Column headers of an export"""
+        return [header for header, _ in columns]
@@ -0,0 +1,119 @@
+"""
+Facet Service
+Filter sidebar counts and histograms for the car catalog
+"""
+import math
+from django.db.models import Count, Max, Min, Q
+from apps.cars.models import CarListing
+from services.car_service import CarService
+
+
+class FacetService:
+    """Service class for catalog facet counts"""
+    
+    # Facet name -> (grouped listing field, query params of its own filter)
+    VALUE_FACETS = {
+        'body_type': ('body_type', ['body_type']),
+        'fuel_type': ('fuel_type', ['fuel_type']),
+        'transmission': ('transmission', ['transmission']),
+        'condition': ('condition', ['condition']),
+        'ownership': ('ownership', ['ownership']),
+    }
+    
+    # Histogram name -> (listing field, query params of its own filter, bucket width rounding)
+    HISTOGRAMS = {
+        'price': ('price', ['min_price', 'max_price'], 1000),
+        'kilometers_driven': ('kilometers_driven', [], 5000),
+    }
+    
+    HISTOGRAM_BUCKETS = 10
+    
+    @staticmethod
+    def filtered_listings(params, is_admin=False, exclude=()):
+        """Listing queryset with the applied filters, minus the facet's own filter"""
+        if exclude:
+            params = {key: value for key, value in params.items() if key not in exclude}
+        return CarService.filter_cars(CarListing.objects.all(), params, is_admin).order_by()
+    
+    @staticmethod
+    def value_counts_query(queryset, field):
+        """GROUP BY query counting listings per distinct value"""
+        return queryset.values(field).annotate(count=Count('pk')).order_by(field)
+    
+    @staticmethod
+    def value_counts(queryset, field):
+        """Count listings per distinct value with one GROUP BY"""
+        rows = FacetService.value_counts_query(queryset, field)
+        return [{'value': row[field], 'count': row['count']} for row in rows if row[field]]
+    
+    @staticmethod
+    def manufacturer_counts_query(queryset):
+        """
+        GROUP BY query counting listings per manufacturer
+        Grouped on the id alone so the manufacturer index feeds the grouping;
+        the name is a copy of the manufacturer's, the same on every row
+        """
+        return (
+            queryset.values('manufacturer_id')
+            .annotate(name=Max('manufacturer_name'), count=Count('pk'))
+            .order_by('name', 'manufacturer_id')
+        )
+    
+    @staticmethod
+    def manufacturer_counts(queryset):
+        """Count listings per manufacturer with one GROUP BY"""
+        rows = FacetService.manufacturer_counts_query(queryset)
+        return [
+            {'id': row['manufacturer_id'], 'name': row['name'], 'count': row['count']}
+            for row in rows
+        ]
+    
+    @staticmethod
+    def histogram(queryset, field, rounding):
+        """
+        Bucket a numeric field into evenly sized ranges
+        One query for the bounds, one conditional-count query for every bucket
+        """
+        bounds = queryset.aggregate(low=Min(field), high=Max(field))
+        if bounds['low'] is None:
+            return []
+        
+        low = int(bounds['low']) // rounding * rounding
+        high = int(math.ceil(bounds['high']))
+        span = max(high - low + 1, 1)
+        width = max(int(math.ceil(span / FacetService.HISTOGRAM_BUCKETS / rounding)) * rounding, rounding)
+        starts = list(range(low, high + 1, width))
+        
+        counts = queryset.aggregate(**{
+            f'bucket_{index}': Count('pk', filter=Q(**{f'{field}__gte': start, f'{field}__lt': start + width}))
+            for index, start in enumerate(starts)
+        })
+        return [
+            {'min': start, 'max': start + width, 'count': counts[f'bucket_{index}']}
+            for index, start in enumerate(starts)
+        ]
+    
+    @staticmethod
+    def get_facets(params, is_admin=False):
+        """
+        Build every facet for the given filters
+        Each facet ignores its own filter so the sidebar can offer alternatives
+        """
+        facets = {}
+        for name, (field, own_params) in FacetService.VALUE_FACETS.items():
+            queryset = FacetService.filtered_listings(params, is_admin, exclude=own_params)
+            facets[name] = FacetService.value_counts(queryset, field)
+        
+        queryset = FacetService.filtered_listings(params, is_admin, exclude=['manufacturer'])
+        facets['manufacturer'] = FacetService.manufacturer_counts(queryset)
+        
+        histograms = {}
+        for name, (field, own_params, rounding) in FacetService.HISTOGRAMS.items():
+            queryset = FacetService.filtered_listings(params, is_admin, exclude=own_params)
+            histograms[name] = FacetService.histogram(queryset, field, rounding)
+        
+        return {
+            'total': FacetService.filtered_listings(params, is_admin).count(),
+            'facets': facets,
+            'histograms': histograms,
+        }
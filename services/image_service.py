@@ -0,0 +1,156 @@
+"""
+Image Service
+Generates resized WebP and JPEG renditions of car photos in a background worker pool
+"""
+import hashlib
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, transaction
+from PIL import Image, ImageOps
+from apps.cars.models import CarImage
+from services.sync_service import SyncService
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+class ImageService:
+    """Service class for car image renditions"""
+    
+    RENDITION_DIR = 'cars/renditions'
+    
+    # Pillow format name and save options per rendition format
+    FORMAT_OPTIONS = {
+        'webp': ('WEBP', {'quality': 80, 'method': 4}),
+        'jpeg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+    }
+    
+    @staticmethod
+    def get_executor():
+        """Return the shared worker pool, created on first use"""
+        global _executor
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.IMAGE_RENDITION_WORKERS,
+                    thread_name_prefix='car-image'
+                )
+        return _executor
+    
+    @staticmethod
+    def schedule(image_ids):
+        """
+        Generate renditions once the current transaction commits
+        Runs in the worker pool, or inline when IMAGE_RENDITION_WORKERS is 0
+        """
+        image_ids = list(image_ids)
+        if not image_ids:
+            return
+        
+        def submit():
+            if settings.IMAGE_RENDITION_WORKERS > 0:
+                ImageService.get_executor().submit(ImageService.process_in_worker, image_ids)
+            else:
+                ImageService.process_images(image_ids)
+        
+        transaction.on_commit(submit)
+    
+    @staticmethod
+    def process_in_worker(image_ids):
+        """Worker entry point; worker threads own their database connections"""
+        close_old_connections()
+        try:
+            ImageService.process_images(image_ids)
+        finally:
+            close_old_connections()
+    
+    @staticmethod
+    def process_images(image_ids):
+        """Generate renditions for the given images and refresh their cars"""
+        car_ids = set()
+        for car_image in CarImage.objects.filter(pk__in=image_ids):
+            try:
+                ImageService.process_image(car_image)
+            except Exception:
+                logger.exception('Could not generate renditions for car image %s', car_image.pk)
+                continue
+            car_ids.add(car_image.car_id)
+        
+        if car_ids:
+            SyncService.schedule_cars(car_ids)
+    
+    @staticmethod
+    def process_image(car_image):
+        """Resize one image into every rendition and store the results on the row"""
+        source_name = car_image.image.name
+        with car_image.image.open('rb') as source:
+            size_bytes = car_image.image.size
+            original = Image.open(source)
+            original = ImageOps.exif_transpose(original)
+            original.load()
+        
+        if original.mode not in ('RGB', 'RGBA'):
+            original = original.convert('RGBA' if 'transparency' in original.info else 'RGB')
+        
+        renditions = {'source': source_name}
+        for size, longest_edge in CarImage.RENDITION_SIZES.items():
+            resized = original.copy()
+            # thumbnail() keeps the aspect ratio and never upscales
+            resized.thumbnail((longest_edge, longest_edge), Image.Resampling.LANCZOS)
+            renditions[size] = {
+                image_format: ImageService.save_rendition(resized, source_name, size, image_format)
+                for image_format in CarImage.RENDITION_FORMATS
+            }
+        
+        # update() rather than save(): no signals, so no second round of processing
+        updated = CarImage.objects.filter(pk=car_image.pk, image=source_name).update(
+            width=original.width,
+            height=original.height,
+            size_bytes=size_bytes,
+            renditions=renditions,
+        )
+        if updated:
+            car_image.width, car_image.height = original.width, original.height
+            car_image.size_bytes = size_bytes
+            car_image.renditions = renditions
+        return car_image
+    
+    @staticmethod
+    def save_rendition(image, source_name, size, image_format):
+        """
+        Encode and store one rendition under a content-hashed name
+        Identical output maps to the same file, so reprocessing never duplicates files
+        """
+        pillow_format, options = ImageService.FORMAT_OPTIONS[image_format]
+        if pillow_format == 'JPEG' and image.mode != 'RGB':
+            image = image.convert('RGB')
+        
+        buffer = BytesIO()
+        image.save(buffer, pillow_format, **options)
+        content = buffer.getvalue()
+        
+        stem = os.path.splitext(os.path.basename(source_name))[0]
+        digest = hashlib.sha256(content).hexdigest()[:12]
+        name = f'{ImageService.RENDITION_DIR}/{stem}-{size}-{digest}.{image_format}'
+        
+        storage = CarImage._meta.get_field('image').storage
+        if not storage.exists(name):
+            name = storage.save(name, ContentFile(content))
+        
+        return {'name': name, 'width': image.width, 'height': image.height, 'size': len(content)}
+    
+    @staticmethod
+    def pending_images():
+        """Images without renditions for their current file"""
+        return [
+            car_image.pk
+            for car_image in CarImage.objects.only('pk', 'image', 'renditions')
+            if not car_image.renditions_ready
+        ]
@@ -0,0 +1,322 @@
+"""
+Import Service
+Streams bulk inventory imports (CSV or JSON Lines, with an optional zip of images)
+into the car tables in chunked bulk inserts
+"""
+import csv
+import json
+import os
+import zipfile
+import zlib
+from django.db import transaction
+from rest_framework.exceptions import ValidationError
+from apps.cars.models import Manufacturer, Car, CarFeature, CarImage
+from apps.cars.serializers import CarImportRowSerializer
+from apps.monitoring.metrics import record_image_uploads
+from services.catalog_cache_service import CatalogCacheService
+from services.image_service import ImageService
+from services.listing_service import ListingService
+from services.related_car_service import RelatedCarService
+from services.search_service import SearchService
+
+
+class ImportService:
+    """Service class for bulk car imports"""
+    
+    CHUNK_SIZE = 1000
+    FORMATS = ['csv', 'jsonl']
+    
+    # Separator for list columns (features, images) in CSV files
+    LIST_SEPARATOR = '|'
+    LIST_COLUMNS = ['features', 'images']
+    
+    # Only the first errors are kept in the report; the failed count covers all of them
+    MAX_REPORTED_ERRORS = 1000
+    
+    # Above this many new cars the related-cars table is rebuilt in one pass
+    # instead of being refreshed car by car
+    RELATED_REFRESH_LIMIT = 500
+    
+    @staticmethod
+    def detect_format(filename):
+        """Guess the import format from a file name"""
+        extension = os.path.splitext(filename or '')[1].lower().lstrip('.')
+        if extension in ('jsonl', 'ndjson'):
+            return 'jsonl'
+        if extension == 'csv':
+            return 'csv'
+        return None
+    
+    @staticmethod
+    def decode_lines(stream):
+        """
+        Yield (line number, text) for each line of a binary stream
+        Lines that are not valid UTF-8 are yielded as (line number, None)
+        """
+        for line_number, raw in enumerate(stream, start=1):
+            try:
+                yield line_number, raw.decode('utf-8-sig' if line_number == 1 else 'utf-8')
+            except UnicodeDecodeError:
+                yield line_number, None
+    
+    @staticmethod
+    def iter_rows(stream, file_format):
+        """
+        Yield (line number, row dict) from a binary stream without loading it whole
+        Lines that cannot be decoded or parsed are yielded as (line number, None)
+        """
+        if file_format == 'csv':
+            yield from ImportService.iter_csv_rows(stream)
+            return
+        
+        for line_number, line in ImportService.decode_lines(stream):
+            if line is None:
+                yield line_number, None
+                continue
+            if not line.strip():
+                continue
+            try:
+                data = json.loads(line)
+            except ValueError:
+                data = None
+            yield line_number, data if isinstance(data, dict) else None
+    
+    @staticmethod
+    def iter_csv_rows(stream):
+        """
+        Yield (line number, row dict) from a CSV stream; the first row holds the headers
+        Undecodable lines reach the reader as blank lines and fail the record they belong to
+        """
+        bad_lines = set()
+        
+        def lines():
+            for line_number, line in ImportService.decode_lines(stream):
+                if line is None:
+                    bad_lines.add(line_number)
+                    line = '\n'
+                yield line
+        
+        reader = csv.reader(lines())
+        headers = None
+        while True:
+            first_line = reader.line_num + 1
+            try:
+                row = next(reader)
+            except StopIteration:
+                return
+            except csv.Error:
+                yield reader.line_num, None
+                continue
+            
+            consumed = {line_number for line_number in bad_lines if line_number <= reader.line_num}
+            bad_lines -= consumed
+            if any(line_number >= first_line for line_number in consumed):
+                yield reader.line_num, None
+                continue
+            if not row:
+                continue
+            if headers is None:
+                headers = row
+                continue
+            
+            # Empty cells fall back to model defaults
+            data = {key: value for key, value in zip(headers, row) if key and value != ''}
+            for column in ImportService.LIST_COLUMNS:
+                if column in data:
+                    data[column] = [
+                        item.strip() for item in data[column].split(ImportService.LIST_SEPARATOR) if item.strip()
+                    ]
+            yield reader.line_num, data
+    
+    @staticmethod
+    def import_cars(stream, file_format, images_zip=None, create_manufacturers=False,
+                    dry_run=False, chunk_size=None):
+        """
+        Import cars with their features and images
+        Each chunk is validated, then inserted in one transaction; rows with errors
+        are skipped and reported without failing the rest of the import
+        """
+        if file_format not in ImportService.FORMATS:
+            raise ValueError(f'Unsupported import format: {file_format}')
+        
+        chunk_size = chunk_size or ImportService.CHUNK_SIZE
+        report = {
+            'rows': 0,
+            'imported': 0,
+            'failed': 0,
+            'features': 0,
+            'images': 0,
+            'dry_run': dry_run,
+            'errors': [],
+        }
+        archive = zipfile.ZipFile(images_zip) if images_zip is not None else None
+        archive_names = ImportService.index_archive(archive)
+        manufacturers = {}
+        row_serializer = CarImportRowSerializer()
+        created_ids = []
+        
+        try:
+            chunk = []
+            for line_number, data in ImportService.iter_rows(stream, file_format):
+                report['rows'] += 1
+                chunk.append((line_number, data))
+                if len(chunk) >= chunk_size:
+                    created_ids.extend(ImportService.import_chunk(
+                        chunk, row_serializer, manufacturers, archive, archive_names,
+                        create_manufacturers, dry_run, report
+                    ))
+                    chunk = []
+            if chunk:
+                created_ids.extend(ImportService.import_chunk(
+                    chunk, row_serializer, manufacturers, archive, archive_names,
+                    create_manufacturers, dry_run, report
+                ))
+        finally:
+            if archive is not None:
+                archive.close()
+            if created_ids:
+                ImportService.refresh_derived_data(created_ids)
+        
+        return report
+    
+    @staticmethod
+    def index_archive(archive):
+        """Map base file names to their paths inside the image archive"""
+        if archive is None:
+            return {}
+        return {
+            os.path.basename(info.filename): info.filename
+            for info in archive.infolist()
+            if not info.is_dir()
+        }
+    
+    @staticmethod
+    def import_chunk(chunk, row_serializer, manufacturers, archive, archive_names,
+                     create_manufacturers, dry_run, report):
+        """Validate and insert one chunk of rows; returns the new car ids"""
+        valid_rows = []
+        for line_number, data in chunk:
+            if data is None:
+                ImportService.add_error(report, line_number, {'row': ['Could not decode or parse this line']})
+                continue
+            try:
+                validated = row_serializer.run_validation(data)
+            except ValidationError as exc:
+                ImportService.add_error(report, line_number, exc.detail)
+                continue
+            
+            missing = [name for name in validated['images'] if name not in archive_names]
+            if missing:
+                ImportService.add_error(report, line_number, {'images': [f'Not found in the image archive: {", ".join(missing)}']})
+                continue
+            valid_rows.append((line_number, validated))
+        
+        ImportService.resolve_manufacturers(
+            {validated['manufacturer'] for _, validated in valid_rows},
+            manufacturers, create_manufacturers and not dry_run
+        )
+        
+        rows = []
+        line_numbers = []
+        for line_number, validated in valid_rows:
+            manufacturer_id = manufacturers.get(validated['manufacturer'])
+            if manufacturer_id is None and not (dry_run and create_manufacturers):
+                ImportService.add_error(report, line_number, {'manufacturer': [f'Unknown manufacturer: {validated["manufacturer"]}']})
+                continue
+            rows.append((manufacturer_id, validated))
+            line_numbers.append(line_number)
+        
+        if dry_run:
+            report['imported'] += len(rows)
+            return []
+        if not rows:
+            return []
+        
+        storage = CarImage._meta.get_field('image').storage
+        saved_files = []
+        try:
+            with transaction.atomic():
+                cars = Car.objects.bulk_create([
+                    Car(
+                        manufacturer_id=manufacturer_id,
+                        **{key: value for key, value in validated.items() if key not in ('manufacturer', 'features', 'images')}
+                    )
+                    for manufacturer_id, validated in rows
+                ])
+                
+                features = [
+                    CarFeature(car=car, name=name)
+                    for car, (_, validated) in zip(cars, rows)
+                    for name in dict.fromkeys(validated['features'])
+                ]
+                CarFeature.objects.bulk_create(features)
+                
+                images = []
+                sizes = []
+                for car, (_, validated) in zip(cars, rows):
+                    for position, name in enumerate(validated['images']):
+                        with archive.open(archive_names[name]) as source:
+                            stored_name = storage.save(f'cars/{name}', source)
+                        saved_files.append(stored_name)
+                        images.append(CarImage(car=car, image=stored_name, is_primary=(position == 0)))
+                        sizes.append(archive.getinfo(archive_names[name]).file_size)
+                images = CarImage.objects.bulk_create(images)
+                
+                car_ids = [car.pk for car in cars]
+                # bulk_create sends no signals, so derived rows are written here
+                ListingService.sync_cars(car_ids)
+                SearchService.sync_cars(car_ids)
+                ImageService.schedule([image.pk for image in images])
+                transaction.on_commit(lambda: record_image_uploads(sizes, 'import'))
+        except (zipfile.BadZipFile, zlib.error) as exc:
+            # A damaged archive member fails this chunk; earlier chunks are already committed
+            for stored_name in saved_files:
+                storage.delete(stored_name)
+            for line_number in line_numbers:
+                ImportService.add_error(report, line_number, {'images': [f'Could not read the image archive: {exc}']})
+            return []
+        except Exception:
+            for stored_name in saved_files:
+                storage.delete(stored_name)
+            raise
+        
+        report['imported'] += len(cars)
+        report['features'] += len(features)
+        report['images'] += len(images)
+        return car_ids
+    
+    @staticmethod
+    def resolve_manufacturers(names, manufacturers, create_missing):
+        """Fill the name -> id map for a chunk with one query (plus one insert for new names)"""
+        missing = [name for name in names if name not in manufacturers]
+        if not missing:
+            return
+        
+        found = dict(Manufacturer.objects.filter(name__in=missing).values_list('name', 'pk'))
+        new_names = [name for name in missing if name not in found]
+        if new_names and create_missing:
+            Manufacturer.objects.bulk_create(
+                [Manufacturer(name=name) for name in new_names],
+                ignore_conflicts=True
+            )
+            found.update(Manufacturer.objects.filter(name__in=new_names).values_list('name', 'pk'))
+        manufacturers.update(found)
+    
+    @staticmethod
+    def add_error(report, line_number, errors):
+        """Count a failed row and keep its errors while the report has room"""
+        report['failed'] += 1
+        if len(report['errors']) < ImportService.MAX_REPORTED_ERRORS:
+            report['errors'].append({'line': line_number, 'errors': errors})
+    
+    @staticmethod
+    def refresh_derived_data(car_ids):
+        """
+        Update related cars and invalidate cached responses after an import
+        Small imports refresh incrementally; large ones rebuild the related table
+        """
+        if len(car_ids) <= ImportService.RELATED_REFRESH_LIMIT:
+            RelatedCarService.refresh(car_ids)
+        else:
+            RelatedCarService.rebuild()
+        CatalogCacheService.bump_version()
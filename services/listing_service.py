@@ -0,0 +1,95 @@
+"""
+Listing Service
+Maintains the flattened car listing read model
+"""
+from apps.cars.models import Car, CarImage, CarListing
+from services.car_service import CarService
+
+
+class ListingService:
+    """Service class for the car listing read model"""
+    
+    SYNC_BATCH_SIZE = 500
+    
+    LISTING_FIELDS = [
+        'manufacturer',
+        'manufacturer_name',
+        'model_name',
+        'model_year',
+        'price',
+        'body_type',
+        'fuel_type',
+        'transmission',
+        'kilometers_driven',
+        'condition',
+        'ownership',
+        'primary_image',
+        'primary_image_webp',
+        'is_active',
+        'created_at',
+    ]
+    
+    @staticmethod
+    def build_listing(car):
+        """Build an unsaved listing row from a car annotated with its primary image"""
+        return CarListing(
+            car_id=car.pk,
+            manufacturer_id=car.manufacturer_id,
+            manufacturer_name=car.manufacturer.name,
+            model_name=car.model_name,
+            model_year=car.model_year,
+            price=car.price,
+            body_type=car.body_type,
+            fuel_type=car.fuel_type,
+            transmission=car.transmission,
+            kilometers_driven=car.kilometers_driven,
+            condition=car.condition,
+            ownership=car.ownership,
+            primary_image=CarImage.pick_rendition(car.primary_image_renditions, 'card') or car.primary_image_name or '',
+            primary_image_webp=CarImage.pick_rendition(car.primary_image_renditions, 'card', 'webp') or '',
+            is_active=car.is_active,
+            created_at=car.created_at,
+        )
+    
+    @staticmethod
+    def sync_cars(car_ids):
+        """Upsert listing rows for the given cars and drop rows of deleted cars"""
+        car_ids = list(car_ids)
+        for start in range(0, len(car_ids), ListingService.SYNC_BATCH_SIZE):
+            batch = car_ids[start:start + ListingService.SYNC_BATCH_SIZE]
+            cars = CarService.with_primary_image(
+                Car.objects.filter(pk__in=batch).select_related('manufacturer')
+            )
+            listings = [ListingService.build_listing(car) for car in cars]
+            
+            CarListing.objects.bulk_create(
+                listings,
+                update_conflicts=True,
+                unique_fields=['car'],
+                update_fields=ListingService.LISTING_FIELDS
+            )
+            
+            found_ids = {listing.car_id for listing in listings}
+            missing_ids = [car_id for car_id in batch if car_id not in found_ids]
+            if missing_ids:
+                CarListing.objects.filter(car_id__in=missing_ids).delete()
+    
+    @staticmethod
+    def rebuild():
+        """Rebuild the whole listing table from the source tables"""
+        CarListing.objects.exclude(car_id__in=Car.objects.values('pk')).delete()
+        
+        car_ids = Car.objects.order_by('pk').values_list('pk', flat=True)
+        total = 0
+        batch = []
+        for car_id in car_ids.iterator(chunk_size=ListingService.SYNC_BATCH_SIZE):
+            batch.append(car_id)
+            if len(batch) == ListingService.SYNC_BATCH_SIZE:
+                ListingService.sync_cars(batch)
+                total += len(batch)
+                batch = []
+        if batch:
+            ListingService.sync_cars(batch)
+            total += len(batch)
+        
+        return total
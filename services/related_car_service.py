@@ -0,0 +1,237 @@
+"""
+Related Car Service
+Scores and stores the related cars shown on car detail pages
+"""
+import heapq
+from collections import namedtuple
+from django.db import transaction
+from django.db.models import Case, Count, F, FloatField, Min, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Abs, Cast, Coalesce
+from apps.cars.models import Car, RelatedCar
+
+CarProfile = namedtuple('CarProfile', ['pk', 'manufacturer_id', 'body_type', 'price', 'fuel_type', 'model_year', 'created_at'])
+
+# Car fields whose changes can move a car in or out of related lists
+SCORING_FIELDS = ('manufacturer_id', 'body_type', 'price', 'fuel_type', 'model_year', 'is_active')
+
+
+class RelatedCarService:
+    """Service class for the precomputed related-cars table"""
+    
+    # Entries stored per car; the detail page shows the first few
+    STORED_LIMIT = 12
+    
+    # Scoring weights
+    MANUFACTURER_WEIGHT = 4.0
+    BODY_TYPE_WEIGHT = 3.0
+    PRICE_WEIGHT = 2.0
+    FUEL_WEIGHT = 1.0
+    YEAR_WEIGHT = 1.0
+    
+    # Price band (±20%) and year window that still earn partial credit
+    PRICE_BAND = 0.2
+    YEAR_WINDOW = 3
+    
+    # Candidates pre-ranked in SQL per stored entry, re-scored exactly in Python
+    CANDIDATE_FACTOR = 2
+    
+    @staticmethod
+    def scoring_state(car):
+        """Values of the scoring fields on a car instance (deferred fields are left out, not loaded)"""
+        return tuple(car.__dict__.get(field) for field in SCORING_FIELDS)
+    
+    @staticmethod
+    def score(car, candidate):
+        """Score how related `candidate` is to `car`"""
+        score = 0.0
+        if candidate.manufacturer_id == car.manufacturer_id:
+            score += RelatedCarService.MANUFACTURER_WEIGHT
+        if candidate.body_type == car.body_type:
+            score += RelatedCarService.BODY_TYPE_WEIGHT
+        if candidate.fuel_type == car.fuel_type:
+            score += RelatedCarService.FUEL_WEIGHT
+        
+        if car.price > 0:
+            price_gap = abs(candidate.price - car.price) / car.price
+            if price_gap <= RelatedCarService.PRICE_BAND:
+                score += RelatedCarService.PRICE_WEIGHT * (1 - price_gap / RelatedCarService.PRICE_BAND)
+        
+        year_gap = abs(candidate.model_year - car.model_year)
+        if year_gap < RelatedCarService.YEAR_WINDOW:
+            score += RelatedCarService.YEAR_WEIGHT * (1 - year_gap / RelatedCarService.YEAR_WINDOW)
+        
+        return score
+    
+    @staticmethod
+    def load_profiles(car_ids=None):
+        """Load the scoring fields of every active car (or of the given ones) in one query"""
+        queryset = Car.objects.filter(is_active=True)
+        if car_ids is not None:
+            queryset = queryset.filter(pk__in=car_ids)
+        return [RelatedCarService.to_profile(row) for row in queryset.values_list(*CarProfile._fields)]
+    
+    @staticmethod
+    def to_profile(row):
+        """CarProfile from a values_list() row that starts with CarProfile's fields"""
+        pk, manufacturer_id, body_type, price, fuel_type, model_year, created_at = row[:len(CarProfile._fields)]
+        return CarProfile(pk, manufacturer_id, body_type, float(price), fuel_type, model_year, created_at)
+    
+    @staticmethod
+    def score_expression(car, reverse=False):
+        """
+        score() as a SQL expression over the cars table
+        Scores every row as a candidate for `car`, or with reverse=True scores `car`
+        as a candidate for every row (the price band is relative to the listing car)
+        """
+        price = Cast('price', FloatField())
+        band = RelatedCarService.PRICE_BAND
+        terms = [
+            Case(When(manufacturer_id=car.manufacturer_id, then=Value(RelatedCarService.MANUFACTURER_WEIGHT)), default=Value(0.0)),
+            Case(When(body_type=car.body_type, then=Value(RelatedCarService.BODY_TYPE_WEIGHT)), default=Value(0.0)),
+            Case(When(fuel_type=car.fuel_type, then=Value(RelatedCarService.FUEL_WEIGHT)), default=Value(0.0)),
+        ]
+        
+        if reverse:
+            in_band = Q(price__gt=0, price__gte=car.price / (1 + band), price__lte=car.price / (1 - band))
+            gap = Abs(Value(car.price) - price) / price
+        elif car.price > 0:
+            in_band = Q(price__gte=car.price * (1 - band), price__lte=car.price * (1 + band))
+            gap = Abs(price - Value(car.price)) / Value(car.price)
+        else:
+            in_band = None
+        if in_band is not None:
+            credit = Value(RelatedCarService.PRICE_WEIGHT) * (Value(1.0) - gap / Value(band))
+            terms.append(Case(When(in_band, then=credit), default=Value(0.0), output_field=FloatField()))
+        
+        window = RelatedCarService.YEAR_WINDOW
+        year_credit = Value(RelatedCarService.YEAR_WEIGHT) * (
+            Value(1.0) - Cast(Abs(F('model_year') - car.model_year), FloatField()) / Value(float(window))
+        )
+        terms.append(Case(
+            When(model_year__gt=car.model_year - window, model_year__lt=car.model_year + window, then=year_credit),
+            default=Value(0.0),
+            output_field=FloatField()
+        ))
+        
+        expression = terms[0]
+        for term in terms[1:]:
+            expression = expression + term
+        return expression
+    
+    @staticmethod
+    def candidates(car):
+        """Best-scoring active cars for `car`, pre-ranked in SQL without loading the catalog"""
+        limit = RelatedCarService.STORED_LIMIT * RelatedCarService.CANDIDATE_FACTOR
+        rows = (
+            Car.objects.filter(is_active=True)
+            .exclude(pk=car.pk)
+            .annotate(related_score=RelatedCarService.score_expression(car))
+            .filter(related_score__gt=0)
+            .order_by('-related_score', '-created_at', '-pk')
+            .values_list(*CarProfile._fields)[:limit]
+        )
+        return [RelatedCarService.to_profile(row) for row in rows]
+    
+    @staticmethod
+    def entered_by(candidate, exclude):
+        """
+        Ids of cars whose stored list `candidate` now belongs in: it outranks their
+        last entry (ties go to the newer car), or they have free slots
+        """
+        entries = RelatedCar.objects.filter(car_id=OuterRef('pk')).order_by()
+        last = entries.order_by('-rank')
+        rows = (
+            Car.objects.filter(is_active=True)
+            .exclude(pk__in=exclude | {candidate.pk})
+            .annotate(candidate_score=RelatedCarService.score_expression(candidate, reverse=True))
+            .filter(candidate_score__gt=0)
+            .annotate(
+                entries=Coalesce(Subquery(entries.values('car_id').annotate(entries=Count('pk')).values('entries')), 0),
+                last_score=Subquery(last.values('score')[:1]),
+                last_created_at=Subquery(last.values('related__created_at')[:1]),
+                last_pk=Subquery(last.values('related_id')[:1]),
+            )
+            .filter(Q(entries__lt=RelatedCarService.STORED_LIMIT) | Q(candidate_score__gte=F('last_score')))
+            .values_list(*CarProfile._fields, 'entries', 'last_score', 'last_created_at', 'last_pk')
+        )
+        entered = set()
+        for row in rows:
+            car = RelatedCarService.to_profile(row)
+            count, last_key = row[-4], row[-3:]
+            # The SQL filter is only a pre-selection; decide with the exact ranking key
+            score = RelatedCarService.score(car, candidate)
+            if score > 0 and (count < RelatedCarService.STORED_LIMIT
+                              or (score, candidate.created_at, candidate.pk) > tuple(last_key)):
+                entered.add(car.pk)
+        return entered
+    
+    @staticmethod
+    def rank(car, profiles):
+        """Return the best (score, candidate) pairs for `car`, ties broken by recency"""
+        scored = (
+            (RelatedCarService.score(car, candidate), candidate)
+            for candidate in profiles
+            if candidate.pk != car.pk
+        )
+        best = heapq.nlargest(
+            RelatedCarService.STORED_LIMIT,
+            (item for item in scored if item[0] > 0),
+            key=lambda item: (item[0], item[1].created_at, item[1].pk)
+        )
+        return best
+    
+    @staticmethod
+    def store(car_ids, profiles=None):
+        """
+        Recompute and replace the stored entries of the given cars
+        With `profiles` (every active car) candidates are ranked in memory; without,
+        each car's candidates are pre-ranked in SQL
+        """
+        if profiles is None:
+            cars = RelatedCarService.load_profiles(car_ids)
+        else:
+            by_pk = {profile.pk: profile for profile in profiles}
+            # Inactive or deleted cars keep no entries
+            cars = [by_pk[car_id] for car_id in car_ids if car_id in by_pk]
+        
+        entries = []
+        for car in cars:
+            pool = profiles if profiles is not None else RelatedCarService.candidates(car)
+            for position, (score, candidate) in enumerate(RelatedCarService.rank(car, pool), start=1):
+                entries.append(RelatedCar(car_id=car.pk, related_id=candidate.pk, score=score, rank=position))
+        
+        with transaction.atomic():
+            RelatedCar.objects.filter(car_id__in=car_ids).delete()
+            RelatedCar.objects.bulk_create(entries, batch_size=1000)
+    
+    @staticmethod
+    def refresh(car_ids):
+        """
+        Incrementally update the table after the scoring fields of the given cars changed
+        Recomputes the changed cars plus every car whose list they enter or leave,
+        and returns the ids of the recomputed cars
+        """
+        car_ids = set(car_ids)
+        changed = RelatedCarService.load_profiles(car_ids)
+        
+        # Cars currently listing a changed car may need to drop or reorder it
+        affected = set(car_ids)
+        affected.update(
+            RelatedCar.objects.filter(related_id__in=car_ids).values_list('car_id', flat=True)
+        )
+        
+        # Cars whose list a changed car now beats (or that still have free slots)
+        for candidate in changed:
+            affected |= RelatedCarService.entered_by(candidate, affected)
+        
+        RelatedCarService.store(list(affected))
+        return affected
+    
+    @staticmethod
+    def rebuild():
+        """Recompute the whole table from scratch"""
+        profiles = RelatedCarService.load_profiles()
+        with transaction.atomic():
+            RelatedCar.objects.all().delete()
+            RelatedCarService.store([profile.pk for profile in profiles], profiles)
+        return len(profiles)
@@ -0,0 +1,143 @@
+"""
+Search Service
+Full-text search over the car inventory
+Postgres keeps a weighted tsvector per car behind a GIN index, SQLite an FTS5
+virtual table. Both live in the car_search table created by the cars migrations.
+"""
+import re
+from django.db import connection, transaction
+from django.db.models import FloatField, Q
+from django.db.models.expressions import RawSQL
+from apps.cars.models import Car
+
+SEARCH_TABLE = 'car_search'
+
+# Rebuild one batch of search rows from the source tables, per vendor
+INDEX_SQL = {
+    'sqlite': [
+        'DELETE FROM car_search WHERE rowid IN ({ids})',
+        """
+        INSERT INTO car_search (rowid, model_name, manufacturer, variant, features, description)
+        SELECT c.id, c.model_name, m.name, c.variant,
+               COALESCE((SELECT group_concat(f.name, ' ') FROM car_features f WHERE f.car_id = c.id), ''),
+               c.description
+        FROM cars c JOIN manufacturers m ON m.id = c.manufacturer_id
+        WHERE c.id IN ({ids})
+        """,
+    ],
+    'postgresql': [
+        'DELETE FROM car_search WHERE car_id IN ({ids})',
+        """
+        INSERT INTO car_search (car_id, document)
+        SELECT c.id,
+               setweight(to_tsvector('english', c.model_name || ' ' || m.name), 'A')
+               || setweight(to_tsvector('english', c.variant), 'B')
+               || setweight(to_tsvector('english', COALESCE(
+                      (SELECT string_agg(f.name, ' ') FROM car_features f WHERE f.car_id = c.id), '')), 'C')
+               || setweight(to_tsvector('english', c.description), 'D')
+        FROM cars c JOIN manufacturers m ON m.id = c.manufacturer_id
+        WHERE c.id IN ({ids})
+        """,
+    ],
+}
+
+# Ids of the matching cars, and the relevance of one car (higher is better)
+MATCH_SQL = {
+    'sqlite': 'SELECT rowid FROM car_search WHERE car_search MATCH %s',
+    'postgresql': "SELECT car_id FROM car_search WHERE document @@ to_tsquery('english', %s)",
+}
+RANK_SQL = {
+    # bm25 column weights follow the column order: model, manufacturer, variant, features, description
+    'sqlite': (
+        'SELECT -bm25(car_search, 10.0, 8.0, 5.0, 3.0, 1.0) FROM car_search '
+        'WHERE car_search MATCH %s AND rowid = {outer}'
+    ),
+    'postgresql': (
+        "SELECT ts_rank_cd(document, to_tsquery('english', %s)) FROM car_search "
+        'WHERE car_id = {outer}'
+    ),
+}
+
+
+class SearchService:
+    """Service class for car full-text search"""
+    
+    INDEX_BATCH_SIZE = 500
+    MAX_TERMS = 10
+    
+    @staticmethod
+    def is_supported():
+        """Whether the database has a search index (Postgres or SQLite)"""
+        return connection.vendor in INDEX_SQL
+    
+    @staticmethod
+    def build_query(text):
+        """
+        Turn free text into a prefix query for the vendor's search syntax
+        Only word characters are kept, so user input never reaches the query parser as syntax
+        """
+        terms = re.findall(r'\w+', (text or '').lower())[:SearchService.MAX_TERMS]
+        if not terms:
+            return None
+        if connection.vendor == 'postgresql':
+            return ' & '.join(f'{term}:*' for term in terms)
+        return ' '.join(f'"{term}"*' for term in terms)
+    
+    @staticmethod
+    def sync_cars(car_ids):
+        """Re-index the given cars; deleted cars drop out of the index"""
+        if not SearchService.is_supported():
+            return
+        
+        car_ids = sorted(set(car_ids))
+        statements = INDEX_SQL[connection.vendor]
+        with transaction.atomic(), connection.cursor() as cursor:
+            for start in range(0, len(car_ids), SearchService.INDEX_BATCH_SIZE):
+                batch = car_ids[start:start + SearchService.INDEX_BATCH_SIZE]
+                placeholders = ', '.join(['%s'] * len(batch))
+                for statement in statements:
+                    cursor.execute(statement.format(ids=placeholders), batch)
+    
+    @staticmethod
+    def rebuild():
+        """Re-index every car"""
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {SEARCH_TABLE}')
+        car_ids = list(Car.objects.values_list('pk', flat=True))
+        SearchService.sync_cars(car_ids)
+        return len(car_ids)
+    
+    @staticmethod
+    def filter(queryset, text):
+        """Keep the cars (or listings) matching the search text"""
+        query = SearchService.build_query(text)
+        if query is None:
+            return queryset.none()
+        
+        if not SearchService.is_supported():
+            # No index on this vendor: fall back to substring matching
+            condition = Q()
+            for term in re.findall(r'\w+', text)[:SearchService.MAX_TERMS]:
+                condition &= (
+                    Q(model_name__icontains=term) | Q(variant__icontains=term)
+                    | Q(description__icontains=term) | Q(manufacturer__name__icontains=term)
+                    | Q(features__name__icontains=term)
+                )
+            matches = Car.objects.filter(condition).values('pk')
+            return queryset.filter(pk__in=matches)
+        
+        return queryset.filter(pk__in=RawSQL(MATCH_SQL[connection.vendor], [query]))
+    
+    @staticmethod
+    def rank(queryset, text):
+        """Annotate `search_rank` and order the best matches first"""
+        query = SearchService.build_query(text)
+        if query is None or not SearchService.is_supported():
+            return queryset
+        
+        opts = queryset.model._meta
+        outer = f'{connection.ops.quote_name(opts.db_table)}.{connection.ops.quote_name(opts.pk.column)}'
+        rank_sql = RANK_SQL[connection.vendor].format(outer=outer)
+        return queryset.annotate(
+            search_rank=RawSQL(rank_sql, [query], output_field=FloatField())
+        ).order_by('-search_rank', '-created_at', '-pk')
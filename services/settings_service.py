@@ -2,16 +2,100 @@
 Settings Service
 Business logic for dealership settings
 """
+import copy
+import time
 from apps.cars.models import DealershipSettings
+from services.catalog_cache_service import CatalogCacheService
+
+# (version, settings) of the last load in this process
+_local = None
 
 
 class SettingsService:
     """Service class for dealership settings"""
     
+    VERSION_KEY = 'settings:version'
+    DATA_KEY = 'settings:data'
+    
+    @staticmethod
+    def get_settings(cached=True):
+        """
+        Get dealership settings (singleton)
+        Cached reads check the shared version stamp and reuse the copy held in this
+        process, then the one in the shared cache, before touching the database.
+        Pass cached=False to load the row for a write
+        """
+        if not cached:
+            return DealershipSettings.load()
+        
+        global _local
+        cache = CatalogCacheService.get_cache()
+        version = SettingsService.get_version()
+        
+        local = _local
+        if local is None or local[0] != version:
+            shared = cache.get(SettingsService.DATA_KEY)
+            if shared is not None and shared[0] == version:
+                local = shared
+            else:
+                # The version is read before the row, so a concurrent write
+                # always leaves this copy behind the stamp it bumps to
+                local = (version, DealershipSettings.load())
+                cache.set(SettingsService.DATA_KEY, local, timeout=None)
+            _local = local
+        
+        # Callers get their own instance; the cached one is shared between threads
+        return copy.copy(local[1])
+    
+    @staticmethod
+    async def aget_settings():
+        """Async counterpart of get_settings() for the event loop"""
+        global _local
+        cache = CatalogCacheService.get_cache()
+        version = await SettingsService.aget_version()
+        
+        local = _local
+        if local is None or local[0] != version:
+            shared = await cache.aget(SettingsService.DATA_KEY)
+            if shared is not None and shared[0] == version:
+                local = shared
+            else:
+                local = (version, await DealershipSettings.aload())
+                await cache.aset(SettingsService.DATA_KEY, local, timeout=None)
+            _local = local
+        
+        return copy.copy(local[1])
+    
+    @staticmethod
+    def get_version():
+        """Current settings version (a millisecond timestamp) from the shared cache"""
+        cache = CatalogCacheService.get_cache()
+        version = cache.get(SettingsService.VERSION_KEY)
+        if version is None:
+            cache.add(SettingsService.VERSION_KEY, int(time.time() * 1000), timeout=None)
+            version = cache.get(SettingsService.VERSION_KEY)
+        return version
+    
+    @staticmethod
+    async def aget_version():
+        """Async counterpart of get_version()"""
+        cache = CatalogCacheService.get_cache()
+        version = await cache.aget(SettingsService.VERSION_KEY)
+        if version is None:
+            await cache.aadd(SettingsService.VERSION_KEY, int(time.time() * 1000), timeout=None)
+            version = await cache.aget(SettingsService.VERSION_KEY)
+        return version
+    
     @staticmethod
-    def get_settings():
-        """Get dealership settings (singleton)"""
-        return DealershipSettings.load()
+    def bump_version():
+        """Invalidate the cached settings in every process"""
+        global _local
+        _local = None
+        cache = CatalogCacheService.get_cache()
+        current = cache.get(SettingsService.VERSION_KEY) or 0
+        version = max(int(time.time() * 1000), current + 1)
+        cache.set(SettingsService.VERSION_KEY, version, timeout=None)
+        return version
     
     @staticmethod
     def update_settings(data):
@@ -22,5 +106,6 @@ class SettingsService:
             if hasattr(settings, key):
                 setattr(settings, key, value)
         
+        # save() bumps the settings version through the post_save signal
         settings.save()
         return settings
@@ -0,0 +1,58 @@
+"""
+Sync Service
+Coalesces writes to the car tables into one refresh of derived data per transaction
+"""
+import threading
+from django.db import transaction
+from django.utils import timezone
+from apps.cars.models import Car
+from services.catalog_cache_service import CatalogCacheService
+from services.listing_service import ListingService
+from services.related_car_service import RelatedCarService
+from services.search_service import SearchService
+
+_pending = threading.local()
+
+
+class SyncService:
+    """Service class for keeping derived car data in step with writes"""
+    
+    @staticmethod
+    def schedule_cars(car_ids, rescore=False):
+        """
+        Queue cars for a refresh once the current transaction commits
+        Outside a transaction the refresh runs immediately
+        An empty list still marks the catalog as changed; `rescore` is set when
+        fields used by the related-cars scoring changed
+        """
+        car_ids = set(car_ids)
+        pending = getattr(_pending, 'car_ids', None)
+        if pending is None:
+            pending = _pending.car_ids = set()
+            _pending.rescore_ids = set()
+        pending.update(car_ids)
+        if rescore:
+            _pending.rescore_ids.update(car_ids)
+        _pending.dirty = True
+        
+        # Every caller registers the flush; only the first one to run finds work.
+        # Ids left behind by a rolled back transaction are picked up by the next flush.
+        transaction.on_commit(SyncService.flush)
+    
+    @staticmethod
+    def flush():
+        """Refresh derived data for every queued car and invalidate cached responses"""
+        if not getattr(_pending, 'dirty', False):
+            return
+        car_ids, rescore_ids = _pending.car_ids, _pending.rescore_ids
+        _pending.car_ids, _pending.rescore_ids = set(), set()
+        _pending.dirty = False
+        
+        if car_ids:
+            ListingService.sync_cars(car_ids)
+            SearchService.sync_cars(car_ids)
+            # Image, feature and manufacturer name changes cannot move any score
+            affected = RelatedCarService.refresh(rescore_ids) if rescore_ids else set()
+            # Bump the row version of every car whose detail page changed
+            Car.objects.filter(pk__in=car_ids | affected).update(updated_at=timezone.now())
+        CatalogCacheService.bump_version()